@@ -0,0 +1,59 @@
+from core import chunk_markdown, approximate_tokens, ChunkingConfig
+
+
+def words(n, word="word"):
+    return " ".join([word] * n)
+
+def test_chunks_follow_heading_path():
+    text = "# Install\n\n## With Docker\n\nRun the container.\n\n## With pip\n\nInstall the package.\n"
+
+    chunks = chunk_markdown(text, max_tokens=100)
+
+    assert [c.heading_path for c in chunks] == ["Install > With Docker", "Install > With pip"]
+    assert chunks[0].text == "## With Docker\n\nRun the container."
+
+def test_hash_lines_in_code_fences_are_not_headings():
+    text = "# Setup\n\nEdit the config:\n\n```bash\n# comment line\nexport A=1\n```\n"
+
+    chunks = chunk_markdown(text, max_tokens=100)
+
+    assert len(chunks) == 1
+    assert chunks[0].headings == ["Setup"]
+    assert "# comment line\nexport A=1\n```" in chunks[0].text
+
+def test_chunks_stay_within_max_tokens():
+    text = "# Long\n\n" + "\n\n".join(words(30) + "." for _ in range(20))
+
+    chunks = chunk_markdown(text, max_tokens=64, overlap_tokens=0)
+
+    assert len(chunks) > 1
+    assert all(approximate_tokens(c.text) <= 64 for c in chunks)
+    assert sum(c.text.count("word") for c in chunks) == 600
+
+def test_consecutive_chunks_overlap():
+    sentences = " ".join(f"Sentence {i} {words(8)}." for i in range(12))
+
+    chunks = chunk_markdown("# Section\n\n" + sentences, max_tokens=40, overlap_tokens=15)
+
+    assert len(chunks) > 1
+    for previous, chunk in zip(chunks, chunks[1:]):
+        last_sentence = previous.text.rsplit(". ", 1)[-1]
+        assert chunk.text.startswith(last_sentence)
+
+def test_front_matter_and_heading_only_sections_are_skipped():
+    text = "---\ntitle: Page\nid: page.md\n---\n\n# Page\n\n## Details\n\nSome body text here.\n"
+
+    chunks = chunk_markdown(text, config=ChunkingConfig(max_tokens=100))
+
+    assert len(chunks) == 1
+    assert chunks[0].heading_path == "Page > Details"
+    assert "title" not in chunks[0].text
+
+def test_heading_is_not_a_chunk_of_its_own():
+    text = "### Deep\n\n" + words(100) + "."
+
+    chunks = chunk_markdown(text, max_tokens=32, overlap_tokens=0, min_tokens=1)
+
+    assert chunks[0].text.startswith("### Deep\n\nword word")
+    assert all(approximate_tokens(c.text) <= 32 for c in chunks)
+    assert sum(c.text.count("word") for c in chunks) == 100
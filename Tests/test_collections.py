@@ -0,0 +1,345 @@
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+from pymilvus import DataType, MilvusException
+
+from core import (insert_data, upsert_data, bulk_load, ensure_collection, vectorize_documents, make_chunk_id,
+                  create_collection, CollectionDeploymentConfig)
+from core.collections import (_split_batches, _read_bulk_files, write_bulk_files, wait_for_import, LocalBulkImporter,
+                              LoadedCollectionManager, estimate_collection_memory)
+from core.config import BulkStorageConfig
+from core.exceptions import CollectionError, MilvusConnectionError, UnsupportedFeatureError
+
+
+def make_rows(count, dim=4, text="x"):
+    return [{"id": i, "vector": [0.1] * dim, "text": text} for i in range(count)]
+
+# describe_collection() output for a quick-setup collection with a dynamic field
+QUICK_SCHEMA = {
+    "auto_id": False,
+    "enable_dynamic_field": True,
+    "fields": [
+        {"name": "id", "type": DataType.INT64, "is_primary": True},
+        {"name": "vector", "type": DataType.FLOAT_VECTOR, "params": {"dim": 4}},
+    ],
+}
+
+def test_split_batches_by_rows_and_bytes():
+    assert [len(b) for b in _split_batches(make_rows(5), batch_size=2, max_batch_bytes=10**6)] == [2, 2, 1]
+    # Each row is roughly 1 KB of text, so only two fit under a 2.5 KB limit
+    rows = make_rows(5, text="x" * 1024)
+    assert [len(b) for b in _split_batches(rows, batch_size=100, max_batch_bytes=2500)] == [2, 2, 1]
+
+@patch('core.collections.get_writer_client')
+def test_insert_data_batches(mock_get_writer, mock_milvus_client):
+    mock_milvus_client.insert.side_effect = lambda collection_name, data: {
+        'insert_count': len(data), 'ids': [row['id'] for row in data]}
+    mock_get_writer.return_value = mock_milvus_client
+
+    result = insert_data("test_collection", make_rows(7), batch_size=3, max_workers=2)
+
+    assert result["insert_count"] == 7
+    assert sorted(result["ids"]) == list(range(7))
+    assert [b["rows"] for b in result["batches"]] == [3, 3, 1]
+    assert all(b["attempts"] == 1 and b["seconds"] >= 0 for b in result["batches"])
+    assert mock_milvus_client.insert.call_count == 3
+
+@patch('core.collections.time.sleep')
+@patch('core.collections.get_writer_client')
+def test_insert_data_retries_with_upsert(mock_get_writer, mock_sleep, mock_milvus_client):
+    mock_milvus_client.insert.side_effect = MilvusException(1, 'timeout')
+    mock_milvus_client.upsert.return_value = {'upsert_count': 2}
+    mock_get_writer.return_value = mock_milvus_client
+
+    result = insert_data("test_collection", make_rows(2))
+
+    assert result["insert_count"] == 2
+    assert result["batches"][0]["attempts"] == 2
+    mock_milvus_client.upsert.assert_called_once()
+
+@patch('core.collections.time.sleep')
+@patch('core.collections.get_writer_client')
+def test_upsert_data_gives_up(mock_get_writer, mock_sleep, mock_milvus_client):
+    mock_milvus_client.upsert.side_effect = MilvusException(1, 'unavailable')
+    mock_get_writer.return_value = mock_milvus_client
+
+    with pytest.raises(CollectionError, match="after 2 attempts"):
+        upsert_data("test_collection", make_rows(2), max_retries=1)
+
+@pytest.mark.parametrize("file_type", ["parquet", "numpy"])
+@patch('core.collections.get_client')
+def test_bulk_files_round_trip(mock_get_client, file_type, tmp_path, mock_milvus_client):
+    mock_milvus_client.describe_collection.return_value = QUICK_SCHEMA
+    mock_get_client.return_value = mock_milvus_client
+
+    files = write_bulk_files("test_collection", make_rows(3, text="doc"), local_path=str(tmp_path), file_type=file_type)
+    rows = _read_bulk_files(files)
+
+    assert [row["id"] for row in rows] == [0, 1, 2]
+    assert rows[0]["text"] == "doc"
+    assert rows[0]["vector"] == pytest.approx([0.1] * 4)
+
+@patch('core.collections.get_writer_client')
+@patch('core.collections.get_client')
+def test_bulk_load_with_local_importer(mock_get_client, mock_get_writer, tmp_path, mock_milvus_client):
+    mock_milvus_client.describe_collection.return_value = QUICK_SCHEMA
+    mock_milvus_client.insert.side_effect = lambda collection_name, data: {'insert_count': len(data)}
+    mock_get_client.return_value = mock_milvus_client
+    mock_get_writer.return_value = mock_milvus_client
+
+    result = bulk_load("test_collection", make_rows(5), local_path=str(tmp_path), importer=LocalBulkImporter())
+
+    assert result["imported_rows"] == 5
+    assert result["files"][0][0].endswith(".parquet")
+
+@patch('core.collections.get_writer_client')
+@patch('core.collections.get_client')
+def test_bulk_load_without_bucket_inserts_rows(mock_get_client, mock_get_writer, tmp_path, mock_milvus_client):
+    mock_milvus_client.describe_collection.return_value = QUICK_SCHEMA
+    mock_milvus_client.insert.side_effect = lambda collection_name, data: {'insert_count': len(data)}
+    mock_get_client.return_value = mock_milvus_client
+    mock_get_writer.return_value = mock_milvus_client
+
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': '', 'MILVUS_BULK_BUCKET': '', 'MILVUS_BULK_ENDPOINT': ''}):
+        with patch('core.collections.RestBulkImporter') as rest_importer:
+            result = bulk_load("test_collection", make_rows(3), local_path=str(tmp_path))
+
+    rest_importer.assert_not_called()
+    assert result["imported_rows"] == 3
+
+@patch('core.collections.get_client')
+def test_bulk_load_uploads_files_to_bucket(mock_get_client, tmp_path, mock_milvus_client):
+    mock_milvus_client.describe_collection.return_value = QUICK_SCHEMA
+    mock_get_client.return_value = mock_milvus_client
+    importer = MagicMock()
+    importer.submit.return_value = "job-1"
+    importer.progress.return_value = {"state": "Completed", "progress": 100, "imported_rows": 3, "reason": ""}
+    storage = BulkStorageConfig(bucket="a-bucket", endpoint="minio:9000", remote_path="imports")
+
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': ''}), patch('minio.Minio') as minio:
+        bulk_load("test_collection", make_rows(3), local_path=str(tmp_path), importer=importer, storage=storage)
+
+    local_file = minio.return_value.fput_object.call_args.args[2]
+    key = minio.return_value.fput_object.call_args.args[1]
+    assert key == "imports/" + os.path.relpath(local_file, tmp_path).replace(os.sep, "/")
+    importer.submit.assert_called_once_with("test_collection", [[key]])
+
+def test_wait_for_import_failure():
+    importer = MagicMock()
+    importer.progress.return_value = {"state": "Failed", "progress": 0, "imported_rows": 0, "reason": "bad file"}
+    with pytest.raises(CollectionError, match="bad file"):
+        wait_for_import(importer, "job-1", poll_interval=0)
+
+QUICK_DESCRIPTION = {
+    "enable_dynamic_field": True,
+    "fields": [
+        {"name": "id", "type": DataType.INT64, "params": {}, "is_primary": True},
+        {"name": "vector", "type": DataType.FLOAT_VECTOR, "params": {"dim": 4}},
+    ],
+}
+
+@patch('core.collections.get_client')
+def test_ensure_collection_unchanged(mock_get_client, mock_milvus_client):
+    mock_milvus_client.has_collection.return_value = True
+    mock_milvus_client.describe_collection.return_value = QUICK_DESCRIPTION
+    mock_milvus_client.list_indexes.return_value = ["vector"]
+    mock_milvus_client.describe_index.return_value = {"index_type": "AUTOINDEX", "metric_type": "COSINE"}
+    mock_get_client.return_value = mock_milvus_client
+
+    result = ensure_collection("test_collection", dimension=4)
+
+    assert result == {"action": "unchanged", "changes": []}
+    mock_milvus_client.drop_collection.assert_not_called()
+    mock_milvus_client.create_index.assert_not_called()
+
+@patch('core.indexes.get_client')
+@patch('core.collections.get_client')
+def test_ensure_collection_rebuilds_index_in_place(mock_get_client, mock_get_index_client, mock_milvus_client):
+    mock_milvus_client.has_collection.return_value = True
+    mock_milvus_client.describe_collection.return_value = QUICK_DESCRIPTION
+    mock_milvus_client.list_indexes.return_value = ["vector"]
+    mock_milvus_client.describe_index.return_value = {"index_type": "AUTOINDEX", "metric_type": "COSINE",
+                                                      "state": "Finished"}
+    mock_get_client.return_value = mock_milvus_client
+    mock_get_index_client.return_value = mock_milvus_client
+
+    result = ensure_collection("test_collection", dimension=4, metric_type="L2")
+
+    assert result["action"] == "updated"
+    mock_milvus_client.drop_index.assert_called_once_with(collection_name="test_collection", index_name="vector")
+    mock_milvus_client.create_index.assert_called_once()
+    mock_milvus_client.drop_collection.assert_not_called()
+
+@patch('core.indexes.get_client')
+@patch('core.collections.get_client')
+def test_ensure_collection_rebuilds_index_of_other_type(mock_get_client, mock_get_index_client, mock_milvus_client):
+    mock_milvus_client.has_collection.return_value = True
+    mock_milvus_client.describe_collection.return_value = QUICK_DESCRIPTION
+    mock_milvus_client.list_indexes.return_value = ["vector"]
+    mock_milvus_client.describe_index.return_value = {"index_type": "IVF_FLAT", "metric_type": "COSINE", "nlist": "128",
+                                                      "state": "Finished"}
+    mock_get_client.return_value = mock_milvus_client
+    mock_get_index_client.return_value = mock_milvus_client
+
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': ''}):
+        same = ensure_collection("test_collection", dimension=4, index_type="IVF_FLAT", index_params={"nlist": 128})
+        other_params = ensure_collection("test_collection", dimension=4, index_type="IVF_FLAT",
+                                         index_params={"nlist": 1024})
+        other_type = ensure_collection("test_collection", dimension=4, index_type="HNSW")
+
+    assert same["action"] == "unchanged"
+    assert other_params["changes"] == ["rebuilt vector index (nlist 128 -> 1024)"]
+    assert other_type["changes"] == ["rebuilt vector index (type IVF_FLAT -> HNSW)"]
+    assert mock_milvus_client.drop_index.call_count == 2
+
+@patch('core.collections.get_client')
+def test_ensure_collection_keeps_index_of_other_type_by_default(mock_get_client, mock_milvus_client):
+    mock_milvus_client.has_collection.return_value = True
+    mock_milvus_client.describe_collection.return_value = QUICK_DESCRIPTION
+    mock_milvus_client.list_indexes.return_value = ["vector"]
+    mock_milvus_client.describe_index.return_value = {"index_type": "HNSW", "metric_type": "COSINE", "M": "16",
+                                                      "state": "Finished"}
+    mock_get_client.return_value = mock_milvus_client
+
+    assert ensure_collection("test_collection", dimension=4)["action"] == "unchanged"
+    assert ensure_collection("test_collection", dimension=4, auto_index=False)["action"] == "unchanged"
+    mock_milvus_client.drop_index.assert_not_called()
+    mock_milvus_client.create_index.assert_not_called()
+
+@patch('core.indexes.get_client')
+@patch('core.collections.get_client')
+def test_ensure_collection_metric_change_keeps_index_type(mock_get_client, mock_get_index_client, mock_milvus_client):
+    mock_milvus_client.has_collection.return_value = True
+    mock_milvus_client.describe_collection.return_value = QUICK_DESCRIPTION
+    mock_milvus_client.list_indexes.return_value = ["vector"]
+    mock_milvus_client.describe_index.return_value = {"index_type": "IVF_FLAT", "metric_type": "COSINE", "nlist": "128",
+                                                      "state": "Finished"}
+    mock_get_client.return_value = mock_milvus_client
+    mock_get_index_client.return_value = mock_milvus_client
+
+    result = ensure_collection("test_collection", dimension=4, metric_type="L2")
+
+    assert result["changes"] == ["rebuilt vector index (metric COSINE -> L2)"]
+    add_index = mock_milvus_client.prepare_index_params.return_value.add_index.call_args.kwargs
+    assert add_index["index_type"] == "IVF_FLAT" and add_index["params"] == {"nlist": "128"}
+
+@patch('core.collections.get_client')
+def test_ensure_collection_rebuilds_on_dimension_change(mock_get_client, mock_milvus_client):
+    mock_milvus_client.has_collection.return_value = True
+    mock_milvus_client.describe_collection.return_value = QUICK_DESCRIPTION
+    mock_get_client.return_value = mock_milvus_client
+
+    result = ensure_collection("test_collection", dimension=8)
+
+    assert result["action"] == "rebuilt"
+    assert "expected 8" in result["changes"][0]
+    mock_milvus_client.drop_collection.assert_called_once_with(collection_name="test_collection")
+
+@patch('core.collections.get_writer_client')
+@patch('core.collections.get_client')
+@patch('core.collections.model.DefaultEmbeddingFunction')
+def test_vectorize_documents_pipeline(mock_embedding_fn, mock_get_client, mock_get_writer, mock_milvus_client):
+    embedding = MagicMock()
+    embedding.dim = 4
+    embedding.encode_documents.side_effect = lambda batch: [[0.1] * 4 for _ in batch]
+    mock_embedding_fn.return_value = embedding
+    inserted = []
+    mock_milvus_client.insert.side_effect = lambda collection_name, data: (
+        inserted.extend(data) or {'insert_count': len(data), 'ids': [row['id'] for row in data]})
+    mock_get_client.return_value = mock_milvus_client
+    mock_get_writer.return_value = mock_milvus_client
+
+    docs = [f"doc {i}" for i in range(10)]
+    result, dimension = vectorize_documents("test_collection", docs, subject="science", id_start=100,
+                                            embed_batch_size=3, insert_workers=2, max_pending_batches=1)
+
+    assert dimension == 4
+    assert result["insert_count"] == 10
+    assert sorted(result["ids"]) == list(range(100, 110))
+    assert embedding.encode_documents.call_count == 4
+    assert {row["subject"] for row in inserted} == {"science"}
+    assert "embed_seconds" in result
+
+@patch('core.collections.get_writer_client')
+@patch('core.collections.get_client')
+@patch('core.collections.model.DefaultEmbeddingFunction')
+def test_vectorize_documents_stops_when_inserts_fail(mock_embedding_fn, mock_get_client, mock_get_writer,
+                                                     mock_milvus_client):
+    embedding = MagicMock()
+    embedding.dim = 4
+    embedding.encode_documents.side_effect = lambda batch: [[0.1] * 4 for _ in batch]
+    mock_embedding_fn.return_value = embedding
+    mock_get_client.return_value = mock_milvus_client
+    mock_get_writer.side_effect = MilvusConnectionError("Failed to connect to Milvus")
+
+    with pytest.raises(MilvusConnectionError):
+        vectorize_documents("test_collection", ["doc"] * 2000, embed_batch_size=10, max_pending_batches=1)
+    assert embedding.encode_documents.call_count < 200
+
+def test_make_chunk_id_is_stable():
+    by_text = make_chunk_id("faq/index.md", text="# Milvus")
+    assert by_text == make_chunk_id("faq/index.md", text="# Milvus")
+    assert by_text != make_chunk_id("faq/other.md", text="# Milvus")
+    assert by_text != make_chunk_id("faq/index.md", text="# Milvus 2")
+    assert make_chunk_id("faq/index.md", position=3) != make_chunk_id("faq/index.md", position=4)
+    assert 0 <= make_chunk_id("faq/index.md", position=3, text="x") < 2 ** 63
+    with pytest.raises(CollectionError):
+        make_chunk_id("faq/index.md")
+
+@pytest.fixture
+def sized_client(mock_milvus_client):
+    # 1000 rows of 4-dim float vectors without dynamic field: 1000 * (8 + 16) * 1.2 bytes each
+    mock_milvus_client.describe_collection.return_value = {**QUICK_DESCRIPTION, "enable_dynamic_field": False}
+    mock_milvus_client.get_collection_stats.return_value = {"row_count": 1000}
+    with patch('core.collections.get_client', return_value=mock_milvus_client):
+        yield mock_milvus_client
+
+def test_estimate_collection_memory(sized_client):
+    assert estimate_collection_memory("test_collection") == 28800
+
+def test_collection_manager_releases_least_recently_used(sized_client):
+    manager = LoadedCollectionManager(memory_budget_bytes=60000)
+
+    manager.ensure_loaded("a")
+    manager.ensure_loaded("b")
+    manager.ensure_loaded("a")  # Already loaded: only marks "a" as recently used
+    manager.ensure_loaded("c")
+
+    assert list(manager.loaded_collections()) == ["a", "c"]
+    sized_client.release_collection.assert_called_once_with(collection_name="b")
+    assert sized_client.load_collection.call_count == 3
+
+def test_collection_manager_counts_replicas(sized_client):
+    manager = LoadedCollectionManager(deployment=CollectionDeploymentConfig(replica_number=2, resource_groups=["rg1"]))
+
+    with patch.dict('os.environ', {'MILVUS_LITE_DB': ''}):
+        manager.ensure_loaded("a")
+
+    assert manager.loaded_collections() == {"a": 57600}
+    sized_client.load_collection.assert_called_once_with(collection_name="a", replica_number=2, resource_groups=["rg1"])
+
+@patch('core.collections.get_client')
+def test_create_collection_with_deployment(mock_get_client, mock_milvus_client):
+    mock_get_client.return_value = mock_milvus_client
+    schema = mock_milvus_client.create_schema.return_value
+    deployment = CollectionDeploymentConfig(shards_num=2, mmap_vectors=True, mmap_scalars=False, replica_number=3)
+
+    with patch.dict('os.environ', {'MILVUS_LITE_DB': ''}):
+        create_collection("test_collection", dimension=4, deployment=deployment)
+
+    fields = {call.kwargs["field_name"]: call.kwargs for call in schema.add_field.call_args_list}
+    assert fields["vector"]["mmap_enabled"] is True
+    assert "mmap_enabled" not in fields["id"]
+    kwargs = mock_milvus_client.create_collection.call_args.kwargs
+    assert kwargs["num_shards"] == 2
+    mock_milvus_client.load_collection.assert_called_once_with(collection_name="test_collection", replica_number=3)
+
+@patch('core.collections.get_client')
+def test_create_collection_rejects_replicas_on_lite(mock_get_client, mock_milvus_client, tmp_path):
+    mock_get_client.return_value = mock_milvus_client
+
+    with patch.dict('os.environ', {'MILVUS_LITE_DB': str(tmp_path / "milvus.db")}):
+        with pytest.raises(UnsupportedFeatureError):
+            create_collection("test_collection", dimension=4, deployment=CollectionDeploymentConfig(replica_number=2))
+
+    mock_milvus_client.drop_collection.assert_not_called()
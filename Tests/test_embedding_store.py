@@ -0,0 +1,53 @@
+import json
+import numpy as np
+import pytest
+from core import EmbeddingStore, write_embeddings, has_embeddings, convert_embeddings_json
+from core.exceptions import EmbeddingError
+
+
+def make_rows(n, dim=4, offset=0):
+    return [{"id": offset + i, "vector": [float(offset + i)] * dim, "text": f"chunk {offset + i} – café",
+             "checksum": f"{offset + i:032x}", "source": f"doc{i}.md", "heading": "Intro > Setup"}
+            for i in range(n)]
+
+def test_write_and_read_embeddings(tmp_path):
+    path = str(tmp_path / "embeddings")
+    write_embeddings(make_rows(3), path)
+
+    store = EmbeddingStore(path)
+
+    assert len(store) == 3 and store.dim == 4
+    assert isinstance(store.vectors, np.memmap) and store.vectors.dtype == np.float32
+    assert store.ids.tolist() == [0, 1, 2]
+    assert store.checksums()[2] == f"{2:032x}"
+    row = store.row(1)
+    assert row["text"] == "chunk 1 – café" and row["source"] == "doc1.md" and row["heading"] == "Intro > Setup"
+    assert row["vector"].tolist() == [1.0] * 4
+
+def test_write_embeddings_replaces_store(tmp_path):
+    path = str(tmp_path / "embeddings")
+    write_embeddings(make_rows(3), path)
+    store = EmbeddingStore(path)
+
+    # Merge like an incremental load: keep rows from the mapped store, replace the rest
+    write_embeddings(list(store.rows([0])) + make_rows(2, offset=10), path)
+
+    store = EmbeddingStore(path)
+    assert store.ids.tolist() == [0, 10, 11]
+    assert store.row(0)["vector"].tolist() == [0.0] * 4
+    assert not (tmp_path / "embeddings.tmp").exists() and not (tmp_path / "embeddings.old").exists()
+
+def test_write_embeddings_rejects_mixed_dimensions(tmp_path):
+    rows = make_rows(2) + make_rows(1, dim=8, offset=5)
+    with pytest.raises(EmbeddingError, match="expected 4"):
+        write_embeddings(rows, str(tmp_path / "embeddings"))
+    assert not has_embeddings(str(tmp_path / "embeddings")) and not (tmp_path / "embeddings.tmp").exists()
+
+def test_convert_embeddings_json(tmp_path):
+    json_path = tmp_path / "embeddings.json"
+    json_path.write_text(json.dumps(make_rows(5), indent=2))
+
+    store = convert_embeddings_json(str(json_path), str(tmp_path / "embeddings"))
+
+    assert len(store) == 5
+    assert [row["source"] for row in store.rows()] == [f"doc{i}.md" for i in range(5)]
@@ -0,0 +1,73 @@
+import numpy as np
+from unittest.mock import MagicMock
+from pymilvus import DataType
+
+from core import iter_collection, export_columns, export_field_map
+
+DESCRIPTION = {
+    "fields": [
+        {"name": "id", "type": DataType.INT64, "params": {}, "is_primary": True},
+        {"name": "vector", "type": DataType.FLOAT_VECTOR, "params": {"dim": 2}},
+    ],
+    "enable_dynamic_field": True,
+}
+
+
+def make_client(batches):
+    client = MagicMock()
+    client.describe_collection.return_value = DESCRIPTION
+    client.get_collection_stats.return_value = {"row_count": sum(len(b) for b in batches)}
+    client.query_iterator.return_value.next.side_effect = list(batches) + [[]]
+    return client
+
+def rows(start, count):
+    return [{"id": i, "vector": [float(i), 0.0], "checksum": f"c{i}"} for i in range(start, start + count)]
+
+def test_iter_collection_yields_column_batches():
+    client = make_client([rows(0, 3), rows(3, 2)])
+    progress = []
+
+    batches = list(iter_collection("test_collection", batch_size=3, client=client,
+                                   progress=lambda done, total: progress.append((done, total))))
+
+    assert [b["id"] for b in batches] == [[0, 1, 2], [3, 4]]
+    assert isinstance(batches[0]["vector"], np.ndarray)
+    assert batches[0]["vector"].shape == (3, 2) and batches[0]["vector"].dtype == np.float32
+    assert progress == [(3, 5), (5, 5)]
+    kwargs = client.query_iterator.call_args.kwargs
+    assert kwargs["output_fields"] == ["id", "vector"] and kwargs["batch_size"] == 3
+    client.query_iterator.return_value.close.assert_called_once()
+
+def test_export_columns_and_field_map():
+    columns = export_columns("test_collection", ["id", "vector"], client=make_client([rows(0, 2), rows(2, 2)]))
+    assert columns["id"] == [0, 1, 2, 3]
+    assert columns["vector"].shape == (4, 2)
+
+    checksums = export_field_map("test_collection", "checksum", client=make_client([rows(0, 2)]))
+    assert checksums == {0: "c0", 1: "c1"}
+
+def test_iter_collection_wildcard_collects_dynamic_fields():
+    client = make_client([rows(0, 2)])
+    batch = next(iter_collection("test_collection", ["*"], client=client))
+    assert client.query_iterator.call_args.kwargs["output_fields"] == ["*"]
+    assert batch["id"] == [0, 1] and batch["vector"].shape == (2, 2)
+    assert batch["$meta"] == [{"checksum": "c0"}, {"checksum": "c1"}]
+
+def test_iter_collection_decodes_byte_vectors():
+    client = make_client([[
+        {"id": 0, "half": [np.array([1.5, -2.0], dtype=np.float16).tobytes()],
+         "brain": np.array([0x3FC0, 0xC000], dtype="<u2").tobytes(),
+         "small": [np.array([3, -4], dtype=np.int8).tobytes()]},
+    ]])
+    client.describe_collection.return_value = {"fields": [
+        {"name": "id", "type": DataType.INT64, "params": {}, "is_primary": True},
+        {"name": "half", "type": DataType.FLOAT16_VECTOR, "params": {"dim": 2}},
+        {"name": "brain", "type": DataType.BFLOAT16_VECTOR, "params": {"dim": 2}},
+        {"name": "small", "type": DataType.INT8_VECTOR, "params": {"dim": 2}},
+    ]}
+
+    batch = next(iter_collection("test_collection", client=client))
+
+    assert batch["half"].dtype == np.float16 and batch["half"].tolist() == [[1.5, -2.0]]
+    assert batch["brain"].dtype == np.float32 and batch["brain"].tolist() == [[1.5, -2.0]]
+    assert batch["small"].dtype == np.int8 and batch["small"].tolist() == [[3, -4]]
@@ -0,0 +1,122 @@
+import os
+import json
+import pytest
+from unittest.mock import patch
+from pymilvus import DataType
+
+from core import create_scalar_indexes, suggest_scalar_indexes, choose_vector_index, build_vector_index
+from core.indexes import filter_fields, wait_for_index
+from core.exceptions import CollectionError
+
+DESCRIPTION = {
+    "fields": [
+        {"name": "id", "type": DataType.INT64, "is_primary": True},
+        {"name": "vector", "type": DataType.FLOAT_VECTOR, "params": {"dim": 4}},
+        {"name": "subject", "type": DataType.VARCHAR, "params": {"max_length": 100}},
+        {"name": "position", "type": DataType.INT64},
+    ],
+}
+
+@pytest.fixture
+def indexed_client(mock_milvus_client):
+    mock_milvus_client.describe_collection.return_value = DESCRIPTION
+    mock_milvus_client.list_indexes.return_value = ["vector", "subject"]
+    mock_milvus_client.describe_index.side_effect = lambda collection_name, index_name: {
+        "field_name": index_name, "index_type": "AUTOINDEX" if index_name == "vector" else "INVERTED"}
+    with patch('core.indexes.get_client', return_value=mock_milvus_client):
+        with patch.dict(os.environ, {'MILVUS_LITE_DB': ''}):
+            yield mock_milvus_client
+
+def test_filter_fields():
+    assert filter_fields('subject == "a" and position >= 3') == ["subject", "position"]
+    assert filter_fields("id in [1, 2] or not (source like 'docs/%')") == ["id", "source"]
+
+def test_create_scalar_indexes_skips_existing(indexed_client):
+    index_params = indexed_client.prepare_index_params.return_value
+
+    created = create_scalar_indexes("test_collection", {"subject": None, "position": None})
+
+    assert created == ["position"]
+    index_params.add_index.assert_called_once_with(field_name="position", index_type="STL_SORT", index_name="position")
+
+def test_create_scalar_indexes_unknown_field(indexed_client):
+    with pytest.raises(CollectionError, match="not a schema field"):
+        create_scalar_indexes("test_collection", {"checksum": None})
+
+def test_suggest_scalar_indexes(indexed_client):
+    suggestions = suggest_scalar_indexes("test_collection", [
+        'subject == "a"', "id in [1, 2]", "position > 3", 'checksum == "x"'])
+
+    assert [(s["field"], s["index_type"]) for s in suggestions] == [("position", "STL_SORT"), ("checksum", None)]
+
+@pytest.mark.parametrize("rows, budget, latency, expected", [
+    (5_000, None, None, "FLAT"),
+    (1_000_000, None, None, "HNSW"),
+    (1_000_000, 2 * 2**30, None, "IVF_SQ8"),
+    (1_000_000, 500 * 2**20, None, "DISKANN"),
+    (1_000_000, 500 * 2**20, 1.0, "IVF_PQ"),
+])
+def test_choose_vector_index(rows, budget, latency, expected):
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': ''}):
+        decision = choose_vector_index(rows, 768, memory_budget_bytes=budget, latency_target_ms=latency)
+    assert decision["index_type"] == expected
+    assert budget is None or decision["estimated_memory_bytes"] <= budget
+
+def test_choose_vector_index_params():
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': ''}):
+        pq = choose_vector_index(1_000_000, 768, memory_budget_bytes=500 * 2**20, latency_target_ms=1.0)
+    assert 768 % pq["params"]["m"] == 0
+    assert pq["params"]["nlist"] == 4000 and pq["search_params"] == {"nprobe": 16}
+
+def test_choose_vector_index_on_lite(tmp_path):
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': str(tmp_path / "milvus.db")}):
+        assert choose_vector_index(1_000_000, 768)["index_type"] == "IVF_FLAT"
+
+def test_build_vector_index_replaces_and_records(indexed_client, tmp_path):
+    indexed_client.get_collection_stats.return_value = {"row_count": 50_000}
+    audit_path = tmp_path / "decisions.jsonl"
+
+    with patch('core.collections.get_client', return_value=indexed_client):
+        decision = build_vector_index("test_collection", audit_path=str(audit_path))
+
+    assert decision["index_type"] == "HNSW" and decision["action"] == "replaced"
+    indexed_client.drop_index.assert_called_once_with(collection_name="test_collection", index_name="vector")
+    indexed_client.create_index.assert_called_once()
+    indexed_client.load_collection.assert_called_once()
+    entry = json.loads(audit_path.read_text().splitlines()[0])
+    assert entry["collection"] == "test_collection" and entry["inputs"]["row_count"] == 50_000
+
+def test_build_vector_index_resolves_forced_type_on_lite(indexed_client, tmp_path):
+    indexed_client.get_collection_stats.return_value = {"row_count": 50_000}
+
+    with patch('core.collections.get_client', return_value=indexed_client):
+        with patch.dict(os.environ, {'MILVUS_LITE_DB': str(tmp_path / "milvus.db")}):
+            decision = build_vector_index("test_collection", index_type="hnsw", audit_path=None)
+
+    assert decision["index_type"] == "FLAT" and "HNSW is not built" in decision["reason"]
+    add_index = indexed_client.prepare_index_params.return_value.add_index
+    assert add_index.call_args.kwargs["index_type"] == "FLAT"
+
+def build_states(*states):
+    return [{"state": state, "indexed_rows": indexed, "total_rows": 100, "pending_index_rows": 100 - indexed}
+            for state, indexed in states]
+
+def test_wait_for_index_reports_progress(indexed_client):
+    indexed_client.describe_index.side_effect = build_states(("InProgress", 0), ("InProgress", 0),
+                                                             ("InProgress", 60), ("Finished", 100))
+    seen = []
+
+    final = wait_for_index("test_collection", "vector", poll_interval=0, progress=seen.append)
+
+    assert final["indexed_rows"] == 100
+    assert [p["indexed_rows"] for p in seen] == [0, 60, 100]  # Unchanged polls are not reported
+
+def test_wait_for_index_failure_and_timeout(indexed_client):
+    indexed_client.describe_index.side_effect = [{"state": "Failed", "index_state_fail_reason": "out of memory"}]
+    with pytest.raises(CollectionError, match="out of memory"):
+        wait_for_index("test_collection", "vector", poll_interval=0, progress=None)
+
+    indexed_client.describe_index.side_effect = None
+    indexed_client.describe_index.return_value = build_states(("InProgress", 10))[0]
+    with pytest.raises(CollectionError, match="10/100 rows indexed"):
+        wait_for_index("test_collection", "vector", timeout=0, poll_interval=0, progress=None)
@@ -1,9 +1,27 @@
+import os
+import importlib.util
 import pytest
 import numpy as np
+import scipy.sparse as sp
 from unittest.mock import patch, MagicMock
 
 from core import get_client, create_collection, insert_data, create_database, vectorize_documents, drop_collection
 
+LOADERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "document-loaders")
+
+def load_loader(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(LOADERS_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_bm25():
+    """BM25 stand-in giving each document one term, as fitting needs NLTK data"""
+    bm25 = MagicMock()
+    bm25.encode_documents.side_effect = lambda texts: sp.csr_matrix(np.eye(len(texts), 8, dtype=np.float32))
+    bm25.encode_queries.side_effect = lambda texts: sp.csr_matrix(np.eye(len(texts), 8, dtype=np.float32))
+    return bm25
+
 
 class TestMilvusIntegration:
     """Integration tests for MilvusUtils (requires running Milvus instance)"""
@@ -81,4 +99,58 @@ class TestMilvusIntegration:
         
         finally:
             # Cleanup would go here if drop_database was implemented
-            pass
\ No newline at end of file
+            pass
+
+def test_hybrid_docs_load(tmp_path, monkeypatch):
+    """Hybrid Ollama docs load inserts rows with sparse vectors and searches them"""
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    (docs_dir / "index.md").write_text("# Index\n\nHNSW builds a graph.\n\n## IVF\n\nIVF clusters vectors.\n")
+    (docs_dir / "search.md").write_text("# Search\n\nSet nprobe to search more clusters.\n")
+    monkeypatch.chdir(tmp_path)
+
+    loader = load_loader("load_milvus_docs_ollama")
+    loader.collection_name = "test_hybrid_docs"
+    loader.docs_dir = str(docs_dir)
+    bm25 = make_bm25()
+    try:
+        with patch.object(loader.EmbeddingProvider, "embed_text", return_value=[0.1, 0.2, 0.3, 0.4]), \
+             patch.object(loader, "fit_bm25", return_value=bm25), \
+             patch.object(loader, "check_collection_and_confirm", return_value=True):
+            loader.process(hybrid=True)
+
+        client = get_client()
+        rows = client.query(collection_name="test_hybrid_docs", filter="id >= 0",
+                            output_fields=["text", "source"], consistency_level="Strong")
+        assert len(rows) == 3
+        assert {row["source"] for row in rows} == {"index.md", "search.md"}
+
+        from core import search_hybrid
+        hits = search_hybrid("test_hybrid_docs", [[0.1, 0.2, 0.3, 0.4]], ["HNSW"], limit=2,
+                             output_fields=["text"], bm25=bm25, consistency="Strong")
+        assert len(hits[0].to_dicts()) == 2
+
+        # Sync restores a deleted row from the embeddings store, with its sparse vector
+        removed = rows[0]["id"]
+        client.delete(collection_name="test_hybrid_docs", ids=[removed])
+        sync = load_loader("sync_from_json")
+        sync.collection_name = "test_hybrid_docs"
+        with patch.object(sync, "load_bm25", return_value=bm25):
+            sync.sync_embeddings()
+        restored = client.query(collection_name="test_hybrid_docs", ids=[removed],
+                                output_fields=["text", "sparse_vector"], consistency_level="Strong")
+        assert restored[0]["text"] == rows[0]["text"] and restored[0]["sparse_vector"]
+
+        # An incremental run without --hybrid still adds sparse vectors to the hybrid collection
+        (docs_dir / "search.md").write_text("# Search\n\nSet nprobe and ef to search more.\n")
+        with patch.object(loader.EmbeddingProvider, "embed_text", return_value=[0.1, 0.2, 0.3, 0.4]), \
+             patch.object(loader, "load_bm25", return_value=bm25):
+            loader.process()
+        edited = client.query(collection_name="test_hybrid_docs", filter='source == "search.md"',
+                              output_fields=["text", "sparse_vector"], consistency_level="Strong")
+        assert [row["text"] for row in edited] == ["# Search\n\nSet nprobe and ef to search more."]
+        assert edited[0]["sparse_vector"]
+    finally:
+        client = get_client()
+        if client.has_collection("test_hybrid_docs"):
+            drop_collection("test_hybrid_docs")
@@ -0,0 +1,65 @@
+import os
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+from core import maintain_collection, segment_stats
+from core.exceptions import CollectionError
+from core.maintenance import wait_for_compaction
+
+
+@pytest.fixture
+def writer():
+    client = MagicMock()
+    with patch('core.maintenance.get_writer_client', return_value=client):
+        with patch.dict(os.environ, {'MILVUS_LITE_DB': ''}):
+            yield client
+
+def segments(*rows):
+    return [SimpleNamespace(num_rows=n) for n in rows]
+
+def test_segment_stats_delete_ratio(writer):
+    writer.query.return_value = [{"count(*)": 750}]
+    writer.list_persistent_segments.return_value = segments(500, 500)
+
+    stats = segment_stats("test_collection")
+
+    assert stats == {"segments": 2, "stored_rows": 1000, "live_rows": 750, "delete_ratio": 0.25}
+    assert writer.query.call_args.kwargs["consistency_level"] == "Strong"
+
+def test_maintain_collection_compacts_over_threshold(writer):
+    writer.query.return_value = [{"count(*)": 1000}]
+    writer.list_persistent_segments.side_effect = [segments(*[50] * 20), segments(1000)]
+    writer.compact.return_value = 42
+    writer.get_compaction_state.side_effect = ["Executing", "Completed"]
+
+    report = maintain_collection("test_collection", max_segments=16, poll_interval=0)
+
+    writer.flush.assert_called_once_with(collection_name="test_collection")
+    writer.compact.assert_called_once_with(collection_name="test_collection")
+    assert report["compacted"] and report["reasons"] == ["20 segments > 16"]
+    assert (report["before"]["segments"], report["after"]["segments"]) == (20, 1)
+
+def test_maintain_collection_skips_healthy_collection(writer):
+    writer.query.return_value = [{"count(*)": 1000}]
+    writer.list_persistent_segments.return_value = segments(1000)
+
+    report = maintain_collection("test_collection")
+
+    assert not report["compacted"] and report["reasons"] == []
+    writer.compact.assert_not_called()
+
+def test_maintain_collection_on_lite_only_flushes(writer, tmp_path):
+    writer.query.return_value = [{"count(*)": 10}]
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': str(tmp_path / "milvus.db")}):
+        report = maintain_collection("test_collection", force=True)
+
+    writer.flush.assert_called_once()
+    writer.list_persistent_segments.assert_not_called()
+    writer.compact.assert_not_called()
+    assert report["before"]["segments"] is None
+
+def test_wait_for_compaction_timeout(writer):
+    writer.get_compaction_state.return_value = "Executing"
+    with pytest.raises(CollectionError, match="not completed"):
+        wait_for_compaction(42, timeout=0, poll_interval=0)
@@ -0,0 +1,62 @@
+import os
+from core import IngestManifest
+
+
+def write(path, text, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+def test_manifest_diff_and_apply(tmp_path):
+    docs = tmp_path / "docs"
+    write(docs / "a.md", "# A", 1_000)
+    write(docs / "sub" / "b.md", "# B", 1_000)
+    write(docs / "c.md", "# C", 1_000)
+    manifest_path = str(tmp_path / "manifest.json")
+
+    manifest = IngestManifest.load("docs", str(docs), manifest_path)
+    changes = manifest.diff()
+    assert changes.added == ["a.md", "c.md", "sub/b.md"] and not changes.changed
+    assert manifest.apply({"a.md": [1, 2], "c.md": [3], "sub/b.md": [4]}) == set()
+    manifest.save()
+
+    write(docs / "a.md", "# A edited", 2_000)     # Changed content
+    write(docs / "c.md", "# C", 2_000)            # Touched only
+    os.remove(docs / "sub" / "b.md")
+    write(docs / "d.md", "# D", 2_000)
+
+    manifest = IngestManifest.load("docs", str(docs), manifest_path)
+    changes = manifest.diff()
+    assert (changes.added, changes.changed, changes.removed, changes.unchanged) == (["d.md"], ["a.md"], ["sub/b.md"], ["c.md"])
+    assert changes.to_process == ["d.md", "a.md"]
+    assert manifest.chunk_ids(changes.changed) == {1, 2}
+
+    stale = manifest.apply({"a.md": [2, 5], "d.md": [6]}, changes.removed)
+    assert stale == {1, 4}
+    manifest.save()
+
+    manifest = IngestManifest.load("docs", str(docs), manifest_path)
+    assert sorted(manifest.files) == ["a.md", "c.md", "d.md"]
+    assert manifest.files["c.md"]["mtime_ns"] == 2_000    # Touched file's new stat is kept
+    changes = manifest.diff()
+    assert not changes.to_process and not changes.removed
+
+def test_manifest_for_other_root_starts_empty(tmp_path):
+    manifest = IngestManifest("docs", "/old/root", str(tmp_path / "manifest.json"))
+    manifest.files = {"a.md": {"size": 1, "mtime_ns": 1, "sha256": "x", "chunk_ids": [1]}}
+    manifest.save()
+    assert IngestManifest.load("docs", "/new/root", str(tmp_path / "manifest.json")).files == {}
+
+def test_manifest_discarded_when_params_change(tmp_path):
+    docs = tmp_path / "docs"
+    write(docs / "a.md", "# A", 1_000)
+    manifest_path = str(tmp_path / "manifest.json")
+
+    manifest = IngestManifest.load("docs", str(docs), manifest_path, params={"max_tokens": 256})
+    manifest.diff()
+    manifest.apply({"a.md": [1]})
+    manifest.save()
+
+    assert IngestManifest.load("docs", str(docs), manifest_path, params={"max_tokens": 256}).files
+    assert not IngestManifest.load("docs", str(docs), manifest_path, params={"max_tokens": 512}).files
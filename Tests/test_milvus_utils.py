@@ -3,7 +3,7 @@ import pytest
 from pymilvus import MilvusException, MilvusClient
 from unittest.mock import patch, MagicMock
 
-from core import get_client, create_database, create_collection, drop_database, EmbeddingProvider, vectorize_documents, drop_collection, has_collection, insert_data
+from core import get_client, create_database, clear_database, reset_database, create_collection, drop_database, EmbeddingProvider, vectorize_documents, drop_collection, has_collection, insert_data
 from core.exceptions import DatabaseError, EmbeddingError
 
 db_name='test_db'
@@ -23,16 +23,42 @@ def test_create_database_new():
 
 def test_create_database_existing():
     with patch.object(get_client(), 'list_databases') as mock_list_db:
-        with patch.object(get_client(), 'using_database') as mock_using_db:
+        with patch('core.databases.use_database') as mock_using_db:
             with patch.object(get_client(), 'drop_database') as mock_drop_db:
                 with patch.object(get_client(), 'create_database') as mock_create_db:
-                    with patch('pymilvus.utility.list_collections') as mock_list_collections:
-                        mock_list_db.return_value = [db_name]
-                        mock_list_collections.return_value = []
-                        create_database(db_name)
-                        mock_using_db.assert_called_once_with(db_name)
-                        mock_drop_db.assert_called_once_with(db_name)
-                        mock_create_db.assert_called_once_with(db_name)
+                    with patch.object(get_client(), 'list_collections') as mock_list_collections:
+                        with patch.object(get_client(), 'drop_collection') as mock_drop_collection:
+                            mock_list_db.return_value = [db_name]
+                            mock_list_collections.return_value = ["a", "b", "c"]
+                            create_database(db_name)
+                            mock_using_db.assert_called_once_with(db_name)
+                            assert sorted(c.kwargs["collection_name"] for c in mock_drop_collection.call_args_list) == ["a", "b", "c"]
+                            mock_drop_db.assert_called_once_with(db_name)
+                            mock_create_db.assert_called_once_with(db_name)
+
+@patch('core.databases.use_database')
+@patch('core.databases.get_client')
+def test_clear_database_reports_failed_drops(mock_get_client, mock_use_database):
+    client = mock_get_client.return_value
+    client.list_collections.return_value = ["a", "b"]
+    client.drop_collection.side_effect = lambda collection_name: (
+        None if collection_name == "a" else (_ for _ in ()).throw(MilvusException(1, "busy")))
+    with pytest.raises(DatabaseError, match="drop 1 collection"):
+        clear_database(db_name)
+
+@patch('core.databases.use_database')
+@patch('core.databases.get_client')
+def test_reset_database_truncates(mock_get_client, mock_use_database):
+    client = mock_get_client.return_value
+    client.list_databases.return_value = [db_name]
+    client.list_collections.return_value = ["a", "b"]
+
+    assert reset_database(db_name) == ["a", "b"]
+
+    mock_use_database.assert_called_once_with(db_name)
+    assert client.truncate_collection.call_count == 2
+    client.drop_collection.assert_not_called()
+    client.drop_database.assert_not_called()
 
 def test_create_database_exception():
     with patch.object(get_client(), 'list_databases') as mock_list_db:
@@ -176,4 +202,78 @@ def test_get_device():
         
         mock_mps.return_value = False
         device = EmbeddingProvider.get_device()
-        assert str(device) == 'cpu'
\ No newline at end of file
+        assert str(device) == 'cpu'
+
+def test_milvus_config_lite_uri():
+    from core.config import MilvusConfig
+    assert MilvusConfig(uri="./milvus.db").is_lite
+    assert not MilvusConfig(uri="http://localhost:19530").is_lite
+
+def test_get_client_lite(tmp_path):
+    from core.client import reset_client
+    db_path = str(tmp_path / "milvus.db")
+    reset_client()
+    try:
+        with patch.dict(os.environ, {'MILVUS_LITE_DB': db_path}):
+            with patch('core.client.MilvusClient') as mock_client_cls:
+                get_client()
+                mock_client_cls.assert_called_once_with(uri=db_path)
+    finally:
+        reset_client()
+
+def test_lite_feature_detection():
+    from core import require_feature, resolve_index_type, UnsupportedFeatureError
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': './milvus.db'}):
+        assert resolve_index_type("HNSW") == "FLAT"
+        assert resolve_index_type("ivf_flat") == "IVF_FLAT"
+        with pytest.raises(UnsupportedFeatureError, match="bulk_import"):
+            require_feature("bulk_import")
+    with patch.dict(os.environ, {'MILVUS_LITE_DB': ''}):
+        assert resolve_index_type("HNSW") == "HNSW"
+        require_feature("bulk_import")
+
+def test_role_client_default_consistency():
+    from core.client import RoleClient
+    from core.config import get_client_role_config
+    inner = MagicMock()
+    reader = RoleClient(inner, get_client_role_config("reader"))
+    reader.search(collection_name="c", data=[[0.1]])
+    inner.search.assert_called_once_with(collection_name="c", data=[[0.1]], consistency_level="Bounded")
+    reader.query(collection_name="c", consistency_level="Strong")
+    inner.query.assert_called_once_with(collection_name="c", consistency_level="Strong")
+    reader.insert(collection_name="c", data=[])
+    inner.insert.assert_called_once_with(collection_name="c", data=[])
+
+def test_role_client_pools():
+    from core.client import get_role_client, get_reader_client, get_writer_client, reset_client
+    from core.exceptions import MilvusConnectionError
+    reset_client()
+    try:
+        with patch.dict(os.environ, {'MILVUS_READER_POOL_SIZE': '2', 'MILVUS_WRITER_TIMEOUT': '300'}):
+            with patch('core.client._connect', side_effect=lambda timeout=None: MagicMock()) as mock_connect:
+                first, second, third = get_reader_client(), get_reader_client(), get_reader_client()
+                assert first is not second and first is third
+                writer = get_writer_client()
+                assert writer.config.timeout == 300.0
+                assert writer.config.consistency_level == "Session"
+                assert mock_connect.call_count == 3
+        with pytest.raises(MilvusConnectionError, match="Unknown client role"):
+            get_role_client("admin")
+    finally:
+        reset_client()
+
+def test_use_database_switches_role_pools(tmp_path):
+    from core import use_database, get_reader_client, get_writer_client, reset_client
+    db_path = str(tmp_path / "milvus.db")
+    reset_client()
+    try:
+        with patch.dict(os.environ, {'MILVUS_LITE_DB': db_path, 'MILVUS_DB_NAME': ''}):
+            with patch('core.client.MilvusClient', side_effect=lambda **kwargs: MagicMock()) as mock_client_cls:
+                reader = get_reader_client()
+                use_database("proj")
+                reader.client.using_database.assert_called_once_with("proj")
+                get_client().using_database.assert_called_with("proj")
+                get_writer_client()
+                assert mock_client_cls.call_args.kwargs["db_name"] == "proj"
+    finally:
+        reset_client()
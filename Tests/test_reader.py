@@ -0,0 +1,30 @@
+import pytest
+from core import iter_file_chunks, ChunkingConfig
+
+
+@pytest.fixture
+def docs(tmp_path):
+    for i in range(10):
+        (tmp_path / f"doc{i}.md").write_text(f"# Doc {i}\n\nBody of document number {i}.\n")
+    return tmp_path
+
+@pytest.mark.parametrize("parse_workers", [0, 2])
+def test_iter_file_chunks_yields_files_in_order(docs, parse_workers):
+    sources = [f"doc{i}.md" for i in range(10)]
+
+    results = list(iter_file_chunks(str(docs), sources, provider="ollama", config=ChunkingConfig(),
+                                    parse_workers=parse_workers, prefetch=3))
+
+    assert [source for source, _ in results] == sources
+    assert [chunks[0].heading_path for _, chunks in results] == [f"Doc {i}" for i in range(10)]
+    assert "Body of document number 7." in results[7][1][0].text
+
+def test_iter_file_chunks_raises_read_errors(docs):
+    with pytest.raises(FileNotFoundError):
+        list(iter_file_chunks(str(docs), ["doc0.md", "missing.md"], provider="ollama", parse_workers=0))
+
+def test_iter_file_chunks_stops_with_consumer(docs):
+    file_chunks = iter_file_chunks(str(docs), [f"doc{i}.md" for i in range(10)], provider="ollama",
+                                   parse_workers=0, prefetch=2)
+    assert next(file_chunks)[0] == "doc0.md"
+    file_chunks.close()
@@ -0,0 +1,134 @@
+import time
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+import scipy.sparse as sp
+from core import build_filter, consistency_options, ReadConsistency, search_by_subject, search_batch, search_hybrid, create_collection, add_sparse_vectors, SPARSE_FIELD
+
+
+def test_build_filter():
+    assert build_filter("subject", None) == ""
+    assert build_filter("subject", "history") == 'subject == "history"'
+    assert build_filter("subject", ["history"]) == 'subject == "history"'
+    assert build_filter("subject", ["a", 'b"c']) == 'subject in ["a", "b\\"c"]'
+    assert build_filter("id", [1, 2]) == "id in [1, 2]"
+
+@patch('core.search.get_collection_manager')
+@patch('core.search.get_reader_client')
+def test_search_by_subject(mock_get_reader, mock_get_manager):
+    mock_client = MagicMock()
+    mock_client.search.return_value = [[{"id": 1, "distance": 0.9, "entity": {"text": "t"}}]]
+    mock_get_reader.return_value = mock_client
+
+    hits = search_by_subject("test_collection", [0.1, 0.2], ["history", "science"], limit=3,
+                             output_fields=["text"], extra_filter="id > 0")
+
+    assert hits[0]["id"] == 1
+    kwargs = mock_client.search.call_args.kwargs
+    assert kwargs["filter"] == '(subject in ["history", "science"]) and (id > 0)'
+    assert kwargs["limit"] == 3
+    mock_get_manager.return_value.ensure_loaded.assert_called_once_with("test_collection")
+
+@patch('core.collections.get_client')
+def test_create_collection_with_partition_key(mock_get_client, mock_milvus_client):
+    mock_get_client.return_value = mock_milvus_client
+    schema = mock_milvus_client.create_schema.return_value
+
+    create_collection("test_collection", dimension=4, partition_key_field="subject", num_partitions=32)
+
+    fields = {call.kwargs["field_name"]: call.kwargs for call in schema.add_field.call_args_list}
+    assert fields["subject"]["is_partition_key"] is True
+    kwargs = mock_milvus_client.create_collection.call_args.kwargs
+    assert kwargs["num_partitions"] == 32
+    assert "index_params" in kwargs
+
+@patch('core.search.get_collection_manager')
+@patch('core.search.get_reader_client')
+def test_search_batch(mock_get_reader, mock_get_manager):
+    mock_client = MagicMock()
+    mock_client.search.side_effect = [
+        [[{"id": 1, "distance": 0.9, "entity": {"text": "a"}}, {"id": 2, "distance": 0.8, "entity": {"text": "b"}}],
+         [{"id": 3, "distance": 0.7, "entity": {"text": "c"}}]],
+        [[]],
+    ]
+    mock_get_reader.return_value = mock_client
+
+    res = search_batch("test_collection", np.ones((3, 2)), limit=2, output_fields=["text"], max_nq=2)
+
+    assert mock_client.search.call_count == 2
+    assert len(mock_client.search.call_args_list[0].kwargs["data"]) == 2
+    assert res.ids.tolist() == [[1, 2], [3, -1], [-1, -1]]
+    assert res.counts.tolist() == [2, 1, 0]
+    assert res[1].fields == {"text": ["c"]}
+    assert res[0].to_dicts()[1] == {"id": 2, "distance": np.float32(0.8), "entity": {"text": "b"}}
+    assert len(res[2]) == 0
+
+def test_consistency_options():
+    from pymilvus.client.utils import hybridts_to_unixtime
+    from core.exceptions import CollectionError
+
+    assert consistency_options(None) == {}
+    assert consistency_options("Strong") == {"consistency_level": "Strong"}
+    assert consistency_options(ReadConsistency(guarantee_timestamp=123)) == {
+        "consistency_level": "Customized", "guarantee_timestamp": 123}
+    options = consistency_options(ReadConsistency("Bounded", staleness_seconds=5))
+    assert options["consistency_level"] == "Customized"
+    assert abs(hybridts_to_unixtime(options["guarantee_timestamp"]) - (time.time() - 5)) < 1
+    with pytest.raises(CollectionError):
+        consistency_options("Sometimes")
+    with pytest.raises(CollectionError):
+        consistency_options(ReadConsistency("Strong", staleness_seconds=5))
+
+@patch('core.search.get_collection_manager')
+@patch('core.search.get_reader_client')
+def test_search_batch_consistency(mock_get_reader, mock_get_manager):
+    mock_get_reader.return_value.search.return_value = [[]]
+    search_batch("test_collection", [[0.1, 0.2]], limit=1, search_params={"params": {}})
+    search_batch("test_collection", [[0.1, 0.2]], limit=1, search_params={"params": {}}, consistency="Eventually")
+
+    calls = mock_get_reader.return_value.search.call_args_list
+    assert "consistency_level" not in calls[0].kwargs  # Reader client default applies
+    assert calls[1].kwargs["consistency_level"] == "Eventually"
+
+def make_bm25():
+    bm25 = MagicMock()
+    bm25.encode_documents.return_value = sp.csr_matrix([[0.0, 1.5, 0.0], [0.5, 0.0, 0.0]])
+    bm25.encode_queries.return_value = sp.csr_matrix([[0.0, 1.0, 0.0]])
+    return bm25
+
+def test_add_sparse_vectors():
+    rows = add_sparse_vectors([{"text": "HNSW"}, {"text": "nprobe"}], make_bm25())
+    assert rows[0][SPARSE_FIELD] == {1: 1.5}
+    assert rows[1][SPARSE_FIELD] == {0: 0.5}
+
+@patch('core.search.get_collection_manager')
+@patch('core.search.get_reader_client')
+def test_search_hybrid(mock_get_reader, mock_get_manager):
+    mock_client = MagicMock()
+    mock_client.hybrid_search.return_value = [[{"id": 7, "distance": 0.03, "entity": {"text": "HNSW"}}]]
+    mock_get_reader.return_value = mock_client
+
+    res = search_hybrid("test_collection", [[0.1, 0.2]], ["what is HNSW"], limit=2, output_fields=["text"],
+                        bm25=make_bm25(), filter='subject == "faq"')
+
+    assert res[0].fields == {"text": ["HNSW"]}
+    kwargs = mock_client.hybrid_search.call_args.kwargs
+    dense, sparse = kwargs["reqs"]
+    assert dense.anns_field == "vector" and sparse.anns_field == SPARSE_FIELD
+    assert sparse.data == [{1: 1.0}]
+    assert dense.limit == 4 and kwargs["limit"] == 2
+    assert dense.expr == 'subject == "faq"'
+
+@patch('core.collections.get_client')
+def test_create_collection_with_sparse_field(mock_get_client, mock_milvus_client):
+    mock_get_client.return_value = mock_milvus_client
+    schema = mock_milvus_client.create_schema.return_value
+    index_params = mock_milvus_client.prepare_index_params.return_value
+
+    create_collection("test_collection", dimension=4, sparse_field=SPARSE_FIELD)
+
+    fields = {call.kwargs["field_name"]: call.kwargs for call in schema.add_field.call_args_list}
+    assert set(fields) == {"id", "vector", SPARSE_FIELD, "text"}
+    indexed = {call.kwargs["field_name"]: call.kwargs["index_type"] for call in index_params.add_index.call_args_list}
+    assert indexed == {"vector": "AUTOINDEX", SPARSE_FIELD: "SPARSE_INVERTED_INDEX"}
@@ -0,0 +1,95 @@
+import json
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+from pymilvus import DataType
+
+from core import snapshot_collection, restore_collection
+from core.exceptions import CollectionError
+
+DESCRIPTION = {
+    "collection_name": "docs",
+    "auto_id": False,
+    "fields": [
+        {"name": "id", "type": DataType.INT64, "params": {}, "is_primary": True},
+        {"name": "vector", "type": DataType.FLOAT_VECTOR, "params": {"dim": 2}},
+        {"name": "sparse_vector", "type": DataType.SPARSE_FLOAT_VECTOR, "params": {}},
+        {"name": "extra", "type": DataType.JSON, "params": {}},
+    ],
+    "enable_dynamic_field": True,
+    "consistency_level_name": "Session",
+}
+
+def batches(collection_name, output_fields, batch_size, progress):
+    assert output_fields == ["*"]
+    for start in (0, 2):
+        ids = [start, start + 1]
+        yield {"id": ids, "vector": np.array([[i, 0.5] for i in ids], dtype=np.float32),
+               "sparse_vector": [{3: 0.5, 9: float(i)} for i in ids], "extra": [{"n": i} for i in ids],
+               "$meta": [{"text": f"doc {i}"} for i in ids]}
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.describe_collection.return_value = DESCRIPTION
+    client.list_indexes.return_value = ["vector"]
+    client.describe_index.return_value = {"index_name": "vector", "field_name": "vector", "index_type": "HNSW",
+                                          "metric_type": "COSINE", "M": "16", "state": "Finished", "total_rows": 4}
+    with patch('core.snapshot.get_client', return_value=client):
+        yield client
+
+def test_snapshot_round_trip(client, tmp_path):
+    path = str(tmp_path / "docs")
+    with patch('core.snapshot.iter_collection', side_effect=batches), \
+         patch('core.snapshot.get_collection_manager') as mock_manager:
+        manifest = snapshot_collection("docs", path, rows_per_file=2, progress=None)
+
+    mock_manager.return_value.ensure_loaded.assert_called_once_with("docs")
+
+    assert manifest["rows"] == 4 and manifest["files"] == ["part-00000.parquet", "part-00001.parquet"]
+    assert manifest["indexes"] == [{"index_name": "vector", "field_name": "vector", "index_type": "HNSW",
+                                    "metric_type": "COSINE", "params": {"M": "16"}}]
+    with open(tmp_path / "docs" / "manifest.json") as f:
+        assert json.load(f)["schema"]["fields"][1]["type"] == DataType.FLOAT_VECTOR
+
+    inserted = []
+    with patch('core.snapshot.has_collection', return_value=False), \
+         patch('core.snapshot.supports_feature', return_value=False), \
+         patch('core.snapshot.insert_data', side_effect=lambda name, rows, batch_size: inserted.extend(rows) or {"insert_count": len(rows)}), \
+         patch('core.snapshot.create_index_and_wait') as mock_index, \
+         patch('core.snapshot.load_collection') as mock_load:
+        result = restore_collection(path, "docs_copy")
+
+    assert result["rows"] == 4
+    assert client.create_collection.call_args.kwargs["consistency_level"] == "Session"
+    assert inserted[1] == {"id": 1, "vector": [1.0, 0.5], "sparse_vector": {3: 0.5, 9: 1.0},
+                           "extra": {"n": 1}, "text": "doc 1"}
+    client.prepare_index_params.return_value.add_index.assert_called_once_with(
+        field_name="vector", index_type="HNSW", index_name="vector", metric_type="COSINE", params={"M": "16"})
+    assert mock_index.call_args.kwargs["load"] is False
+    mock_load.assert_called_once_with("docs_copy")
+
+def test_restore_uses_bulk_import(client, tmp_path):
+    path = tmp_path / "docs"
+    path.mkdir()
+    (path / "manifest.json").write_text(json.dumps({"collection_name": "docs", "schema": DESCRIPTION, "indexes": [],
+                                                    "rows": 4, "files": ["part-00000.parquet"]}))
+    importer = MagicMock()
+    importer.submit.return_value = "job-1"
+    importer.progress.return_value = {"state": "Completed", "progress": 100, "imported_rows": 4, "reason": ""}
+
+    with patch('core.snapshot.has_collection', return_value=False), patch('core.snapshot.load_collection'):
+        result = restore_collection(str(path), importer=importer)
+
+    importer.submit.assert_called_once_with("docs", [[str(path / "part-00000.parquet")]])
+    assert result == {"collection_name": "docs", "rows": 4, "seconds": result["seconds"]}
+
+def test_restore_refuses_existing_collection(client, tmp_path):
+    path = tmp_path / "docs"
+    path.mkdir()
+    (path / "manifest.json").write_text(json.dumps({"collection_name": "docs", "schema": DESCRIPTION,
+                                                    "indexes": [], "rows": 0, "files": []}))
+    with patch('core.snapshot.has_collection', return_value=True):
+        with pytest.raises(CollectionError, match="exists"):
+            restore_collection(str(path))
+    client.drop_collection.assert_not_called()
@@ -0,0 +1,78 @@
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+from core import tune_search_params, load_tuned_search_params
+from core.search import SearchResults, save_tuned_search_params
+from core.tuning import exact_top_k, recall_at_k
+
+VECTORS = np.array([[1, 0], [0.9, 0.1], [0, 1], [-1, 0]], dtype=np.float32)
+
+
+def stream(batch_size):
+    def iter_collection(collection_name, output_fields, batch_size=batch_size):
+        for start in range(0, len(VECTORS), batch_size):
+            yield {"id": list(range(start, min(start + batch_size, len(VECTORS)))),
+                   "vector": VECTORS[start:start + batch_size]}
+    return iter_collection
+
+def test_exact_top_k_streams_batches():
+    queries = np.array([[1, 0], [0, 1]], dtype=np.float32)
+    with patch('core.tuning.iter_collection', side_effect=stream(3)):
+        truth = exact_top_k("test_collection", queries, 2, "COSINE")
+    assert truth.tolist() == [[0, 1], [2, 1]]
+    with patch('core.tuning.iter_collection', side_effect=stream(1)):
+        assert exact_top_k("test_collection", queries, 1, "L2").tolist() == [[0], [2]]
+
+def test_recall_at_k():
+    truth = np.array([[0, 1], [2, 3]])
+    assert recall_at_k(np.array([[0, 1], [2, -1]]), truth) == 0.75
+
+def results(ids):
+    res = SearchResults(len(ids), len(ids[0]), [])
+    res.ids[:] = ids
+    return res
+
+@patch('core.search.get_reader_client')
+@patch('core.tuning.get_collection_manager')
+@patch('core.tuning.get_reader_client')
+def test_tune_search_params_picks_cheapest_setting(mock_get_reader, mock_get_manager, mock_search_reader, tmp_path):
+    client = MagicMock()
+    client.list_indexes.return_value = ["vector"]
+    client.describe_index.return_value = {"index_type": "IVF_FLAT", "metric_type": "COSINE", "nlist": "4"}
+    mock_get_reader.return_value = client
+    mock_search_reader.return_value = client
+    found = {1: [[0, 3]], 2: [[0, 1]], 4: [[0, 1]]}
+
+    def search(collection_name, queries, limit, search_params, anns_field):
+        return results(found[search_params["params"]["nprobe"]])
+
+    path = str(tmp_path / "search_params.json")
+    with patch('core.tuning.iter_collection', side_effect=stream(4)), patch('core.tuning.search_batch', side_effect=search):
+        setting = tune_search_params("test_collection", k=2, target_recall=1.0, query_vectors=[[1, 0]], path=path)
+
+    assert [entry["params"]["nprobe"] for entry in setting["sweep"]] == [1, 2, 4]
+    assert setting["params"] == {"nprobe": 2} and setting["recall"] == 1.0
+    assert load_tuned_search_params("test_collection", path) == {"metric_type": "COSINE", "params": {"nprobe": 2}}
+
+    # Rebuilt with another index type, the tuned nprobe no longer applies
+    client.describe_index.return_value = {"index_type": "HNSW", "metric_type": "COSINE"}
+    with patch('core.search.INDEX_TYPE_CACHE_SECONDS', 0):
+        assert load_tuned_search_params("test_collection", path) is None
+
+@patch('core.search.get_collection_manager')
+@patch('core.search.get_reader_client')
+def test_search_batch_uses_tuned_params(mock_get_reader, mock_get_manager, tmp_path, monkeypatch):
+    path = str(tmp_path / "search_params.json")
+    monkeypatch.setenv("MILVUS_SEARCH_PARAMS_PATH", path)
+    save_tuned_search_params("test_collection", {"index_type": "HNSW", "metric_type": "L2", "params": {"ef": 48}})
+    mock_get_reader.return_value.list_indexes.return_value = ["vector"]
+    mock_get_reader.return_value.describe_index.return_value = {"index_type": "HNSW", "metric_type": "L2"}
+    mock_get_reader.return_value.search.return_value = [[]]
+
+    from core import search_batch
+    search_batch("test_collection", [[0.1, 0.2]], limit=1)
+    search_batch("test_collection", [[0.1, 0.2]], limit=1, search_params={"params": {"ef": 8}})
+
+    calls = mock_get_reader.return_value.search.call_args_list
+    assert calls[0].kwargs["search_params"] == {"metric_type": "L2", "params": {"ef": 48}}
+    assert calls[1].kwargs["search_params"] == {"params": {"ef": 8}}
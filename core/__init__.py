@@ -1,12 +1,29 @@
 """Core Milvus utilities package."""
 
 # New modular interface
-from .client import get_client, reset_client
+from .client import get_client, reset_client, use_database, get_reader_client, get_writer_client, is_milvus_lite, require_feature, resolve_index_type, describe_backend
 from .embeddings import EmbeddingProvider
-from .collections import create_collection, drop_collection, has_collection, insert_data, vectorize_documents
-from .databases import create_database, drop_database, list_databases
-from .config import get_milvus_config, get_embedding_config
-from .exceptions import MilvusConnectionError, DatabaseError, CollectionError, EmbeddingError
+from .collections import (create_collection, ensure_collection, drop_collection, has_collection, insert_data,
+                          upsert_data, bulk_load, vectorize_documents, make_chunk_id,
+                          load_collection, LoadedCollectionManager, get_collection_manager)
+from .indexes import (create_scalar_indexes, suggest_scalar_indexes, choose_vector_index, build_vector_index,
+                      index_progress, wait_for_index, create_index_and_wait)
+from .search import (build_filter, search_by_subject, search_batch, search_hybrid, SearchResults, QueryHits,
+                     load_tuned_search_params, consistency_options)
+from .tuning import tune_search_params
+from .sparse import fit_bm25, load_bm25, add_sparse_vectors, SPARSE_FIELD
+from .export import iter_collection, export_columns, export_field_map, print_progress
+from .maintenance import maintain_collection, segment_stats
+from .snapshot import snapshot_collection, restore_collection
+from .manifest import IngestManifest, ManifestDiff
+from .chunking import Chunk, chunk_markdown, token_counter, approximate_tokens
+from .reader import iter_file_chunks
+from .embedding_store import EmbeddingStore, write_embeddings, has_embeddings, convert_embeddings_json
+from .databases import create_database, drop_database, list_databases, clear_database, reset_database
+from .config import (get_milvus_config, get_embedding_config, get_deployment_config, CollectionDeploymentConfig,
+                     get_read_consistency, ReadConsistency, get_chunking_config, ChunkingConfig,
+                     get_bulk_storage_config, BulkStorageConfig)
+from .exceptions import MilvusConnectionError, DatabaseError, CollectionError, EmbeddingError, UnsupportedFeatureError
 
 # Backward compatibility - MilvusUtils class
 class MilvusUtils:
@@ -21,9 +38,12 @@ class MilvusUtils:
     
     # Collection methods
     create_collection = staticmethod(create_collection)
+    ensure_collection = staticmethod(ensure_collection)
     drop_collection = staticmethod(drop_collection)
     has_collection = staticmethod(has_collection)
     insert_data = staticmethod(insert_data)
+    upsert_data = staticmethod(upsert_data)
+    bulk_load = staticmethod(bulk_load)
     vectorize_documents = staticmethod(vectorize_documents)
     
     # Embedding methods
@@ -44,12 +64,21 @@ class MilvusUtils:
 # Export everything for easy access
 __all__ = [
     # New interface
-    'get_client', 'reset_client',
+    'get_client', 'reset_client', 'use_database', 'get_reader_client', 'get_writer_client', 'is_milvus_lite', 'require_feature', 'resolve_index_type', 'describe_backend',
     'EmbeddingProvider',
-    'create_collection', 'drop_collection', 'has_collection', 'insert_data', 'vectorize_documents',
-    'create_database', 'drop_database', 'list_databases',
-    'get_milvus_config', 'get_embedding_config',
-    'MilvusConnectionError', 'DatabaseError', 'CollectionError', 'EmbeddingError',
+    'create_collection', 'ensure_collection', 'drop_collection', 'has_collection', 'insert_data', 'upsert_data', 'bulk_load', 'vectorize_documents', 'make_chunk_id',
+    'load_collection', 'LoadedCollectionManager', 'get_collection_manager',
+    'create_scalar_indexes', 'suggest_scalar_indexes', 'choose_vector_index', 'build_vector_index',
+    'index_progress', 'wait_for_index', 'create_index_and_wait',
+    'build_filter', 'search_by_subject', 'search_batch', 'search_hybrid', 'SearchResults', 'QueryHits',
+    'load_tuned_search_params', 'consistency_options', 'tune_search_params',
+    'fit_bm25', 'load_bm25', 'add_sparse_vectors', 'SPARSE_FIELD',
+    'iter_collection', 'export_columns', 'export_field_map', 'print_progress',
+    'snapshot_collection', 'restore_collection', 'IngestManifest', 'ManifestDiff', 'Chunk', 'chunk_markdown', 'token_counter', 'approximate_tokens', 'iter_file_chunks', 'EmbeddingStore', 'write_embeddings', 'has_embeddings', 'convert_embeddings_json', 'maintain_collection', 'segment_stats',
+    'create_database', 'drop_database', 'list_databases', 'clear_database', 'reset_database',
+    'get_milvus_config', 'get_embedding_config', 'get_deployment_config', 'CollectionDeploymentConfig',
+    'get_read_consistency', 'ReadConsistency', 'get_chunking_config', 'ChunkingConfig', 'get_bulk_storage_config', 'BulkStorageConfig',
+    'MilvusConnectionError', 'DatabaseError', 'CollectionError', 'EmbeddingError', 'UnsupportedFeatureError',
     # Legacy interface
     'MilvusUtils'
 ]
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""Markdown-aware chunking into token-bounded pieces."""
+
+import re
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+from .config import ChunkingConfig, get_chunking_config, get_embedding_config
+
+TokenCounter = Callable[[str], int]
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+# Sentence ends followed by whitespace, and line breaks inside a paragraph
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])[ \t]+|\n")
+_WORDS = re.compile(r"\w+|[^\w\s]")
+
+@dataclass
+class Chunk:
+    """Chunk text with the headings it sits under, outermost first."""
+    text: str
+    headings: List[str] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def heading_path(self) -> str:
+        return " > ".join(self.headings)
+
+def approximate_tokens(text: str) -> int:
+    """Estimate subword tokens: one per word or symbol, plus one per 4 characters past the first 4."""
+    return sum(max(1, math.ceil(len(word) / 4)) for word in _WORDS.findall(text))
+
+def token_counter(provider: str = "huggingface", model: Optional[str] = None) -> TokenCounter:
+    """Count tokens with the embedding model's tokenizer, or estimate them.
+
+    HuggingFace models use their own tokenizer. Ollama does not expose its tokenizer,
+    and a tokenizer that cannot be loaded (e.g. offline) falls back to approximate_tokens.
+    """
+    if provider == "huggingface":
+        model = model or get_embedding_config().hf_model
+        if model:
+            try:
+                from transformers import AutoTokenizer
+                tokenizer = AutoTokenizer.from_pretrained(model)
+                return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+            except Exception as e:
+                print(f"WARNING: Cannot load tokenizer for {model}, estimating tokens: {e}")
+    return approximate_tokens
+
+def _strip_front_matter(lines: List[str]) -> List[str]:
+    if lines and lines[0].strip() == "---":
+        for i in range(1, len(lines)):
+            if lines[i].strip() == "---":
+                return lines[i + 1:]
+    return lines
+
+def parse_markdown(text: str) -> List[Tuple[List[str], List[Tuple[str, bool]]]]:
+    """Split markdown into sections under their heading path.
+
+    Returns:
+        (headings, blocks) per section, where blocks are (text, is_code) paragraphs and
+        fenced code blocks in order. A section's own heading line is its first block;
+        sections with nothing but a heading are left out. Lines starting with # inside
+        code fences are not headings.
+    """
+    sections: List[Tuple[List[str], List[Tuple[str, bool]]]] = []
+    stack: List[Tuple[int, str]] = []
+    blocks: List[Tuple[str, bool]] = []
+    paragraph: List[str] = []
+    fence: Optional[str] = None
+    code: List[str] = []
+
+    def end_paragraph():
+        if paragraph and "".join(paragraph).strip():
+            blocks.append(("\n".join(paragraph).strip(), False))
+        paragraph.clear()
+
+    def end_section():
+        end_paragraph()
+        # A heading with no body of its own lives on in the heading path of its subsections
+        if blocks and not (len(blocks) == 1 and stack and blocks[0][0].startswith("#")):
+            sections.append(([title for _, title in stack], list(blocks)))
+        blocks.clear()
+
+    for line in _strip_front_matter(text.splitlines()):
+        if fence:
+            code.append(line)
+            if line.strip().startswith(fence) and set(line.strip()) == {fence[0]}:
+                blocks.append(("\n".join(code), True))
+                code, fence = [], None
+            continue
+        match = _FENCE.match(line)
+        if match:
+            end_paragraph()
+            fence, code = match.group(1), [line]
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            end_section()
+            level = len(heading.group(1))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, heading.group(2)))
+            blocks.append((line.strip(), False))
+        elif not line.strip():
+            end_paragraph()
+        else:
+            paragraph.append(line)
+    if code:
+        blocks.append(("\n".join(code), True))  # Unclosed fence runs to the end of the file
+    end_section()
+    return sections
+
+def _split_words(text: str, max_tokens: int, count: TokenCounter) -> List[str]:
+    pieces, current, tokens = [], [], 0
+    for word in text.split(" "):
+        word_tokens = count(word)
+        if current and tokens + word_tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, tokens = [], 0
+        current.append(word)
+        tokens += word_tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+def _units(block: str, is_code: bool, max_tokens: int, count: TokenCounter) -> List[Tuple[str, str, int]]:
+    """Split a block into (separator before, text, tokens) units no longer than max_tokens.
+
+    Code blocks stay whole when they fit, otherwise they split by line; paragraphs
+    split into sentences and lines. Anything still too long splits by words.
+    """
+    if is_code:
+        tokens = count(block)
+        if tokens <= max_tokens:
+            return [("\n\n", block, tokens)]
+        parts = [("\n", line) for line in block.split("\n")]
+    else:
+        parts, position, separator = [], 0, "\n\n"
+        for match in _SENTENCE_BREAK.finditer(block):
+            parts.append((separator, block[position:match.start()]))
+            separator = "\n" if "\n" in match.group() else " "
+            position = match.end()
+        parts.append((separator, block[position:]))
+    units = []
+    for i, (separator, text) in enumerate(parts):
+        separator = "\n\n" if i == 0 else separator
+        tokens = count(text)
+        if tokens <= max_tokens:
+            units.append((separator, text, tokens))
+            continue
+        for j, piece in enumerate(_split_words(text, max_tokens, count)):
+            units.append((separator if j == 0 else " ", piece, count(piece)))
+    return units
+
+def _take(text: str, max_tokens: int, count: TokenCounter) -> Tuple[str, str, str]:
+    """Split text into a head of at most max_tokens and the rest, at line breaks or else between words.
+
+    Returns (head, separator, rest); head is empty when not even the first word fits.
+    """
+    for separator in ("\n", " "):
+        parts = text.split(separator)
+        taken, tokens = 0, 0
+        while taken < len(parts) - 1 and tokens + count(parts[taken]) <= max_tokens:
+            tokens += count(parts[taken])
+            taken += 1
+        if taken:
+            return separator.join(parts[:taken]), separator, separator.join(parts[taken:])
+    return "", " ", text
+
+def chunk_markdown(text: str, max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None,
+                   min_tokens: Optional[int] = None, count_tokens: TokenCounter = approximate_tokens,
+                   config: Optional[ChunkingConfig] = None) -> List[Chunk]:
+    """Chunk markdown by section, packing paragraphs and code blocks up to max_tokens.
+
+    Chunks never span two sections, so each carries one heading path. Consecutive
+    chunks of a section repeat up to overlap_tokens of trailing sentences. Chunks
+    under min_tokens (such as a heading with no body) are dropped, and a heading
+    always shares its chunk with the start of the section body. Limits default
+    to the CHUNK_* settings (see get_chunking_config).
+    """
+    config = config or get_chunking_config()
+    max_tokens = max_tokens or config.max_tokens
+    overlap_tokens = config.overlap_tokens if overlap_tokens is None else overlap_tokens
+    min_tokens = config.min_tokens if min_tokens is None else min_tokens
+
+    chunks: List[Chunk] = []
+    for headings, blocks in parse_markdown(text):
+        units = deque(unit for block, is_code in blocks for unit in _units(block, is_code, max_tokens, count_tokens))
+        # The section's own heading line, which is never emitted as a chunk by itself
+        heading = units[0] if headings and units and not blocks[0][1] and blocks[0][0].startswith("#") else None
+        current: List[Tuple[str, str, int]] = []
+        emitted = 0  # Units of current already in an emitted chunk (the overlap)
+
+        def emit():
+            body = "".join(sep + text for sep, text, _ in current).strip()
+            tokens = sum(tokens for _, _, tokens in current)
+            if tokens >= min_tokens:
+                chunks.append(Chunk(body, list(headings), tokens))
+
+        while units:
+            unit = units.popleft()
+            if current == [heading] and heading[2] + unit[2] > max_tokens:
+                # Fill the heading's chunk with the start of the unit and queue the rest
+                head, separator, rest = _take(unit[1], max_tokens - heading[2], count_tokens)
+                if head:
+                    units.appendleft((separator, rest, count_tokens(rest)))
+                    unit = (unit[0], head, count_tokens(head))
+            if current and sum(u[2] for u in current) + unit[2] > max_tokens:
+                if len(current) > emitted:
+                    emit()
+                # Carry trailing units into the next chunk, within the overlap budget
+                tail, tail_tokens = [], 0
+                for previous in reversed(current):
+                    if tail_tokens + previous[2] > overlap_tokens or tail_tokens + previous[2] + unit[2] > max_tokens:
+                        break
+                    tail.insert(0, previous)
+                    tail_tokens += previous[2]
+                current, emitted = tail, len(tail)
+            current.append(unit)
+        if len(current) > emitted:
+            emit()
+    return chunks
@@ -1,27 +1,171 @@
 """Milvus client connection management."""
 
-from typing import Optional
+import os
+import itertools
+import threading
+from typing import Any, Dict, Iterator, List, Optional
 from pymilvus import MilvusClient
-from .config import get_milvus_config
-from .exceptions import MilvusConnectionError
+from .config import ClientRoleConfig, CLIENT_ROLE_DEFAULTS, get_client_role_config, get_milvus_config
+from .exceptions import MilvusConnectionError, UnsupportedFeatureError
 
 # Global client instance - initialized lazily
 _client: Optional[MilvusClient] = None
 
+# Per-role client pools - initialized lazily
+_role_pools: Dict[str, List["RoleClient"]] = {}
+_role_cursors: Dict[str, Iterator["RoleClient"]] = {}
+_role_lock = threading.Lock()
+
+# Database set by use_database; None means MILVUS_DB_NAME, or the server default
+_database: Optional[str] = None
+
+# Read calls that accept a consistency_level override
+_READ_METHODS = {"search", "hybrid_search", "search_iterator", "query", "query_iterator"}
+
+# Index types Milvus Lite builds natively; any other type is served as FLAT.
+LITE_INDEX_TYPES = {"FLAT", "IVF_FLAT", "AUTOINDEX"}
+
+# Server features that Milvus Lite does not provide.
+LITE_UNSUPPORTED_FEATURES = {
+    "bulk_import": "bulk import jobs need a Milvus server with object storage",
+    "add_field": "adding fields to an existing collection",
+    "mmap": "memory-mapped field storage",
+    "replicas": "loading more than one replica",
+    "resource_groups": "resource groups",
+    "compaction": "manual compaction",
+}
+
+class RoleClient:
+    """MilvusClient wrapper that applies a role's default consistency level to reads.
+
+    All other attributes are delegated to the wrapped client, so a RoleClient can be
+    used wherever a MilvusClient is expected. Explicit consistency_level arguments win.
+    """
+
+    def __init__(self, client: MilvusClient, config: ClientRoleConfig):
+        self.client = client
+        self.config = config
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.client, name)
+        if name not in _READ_METHODS:
+            return attr
+
+        def read(*args, **kwargs):
+            kwargs.setdefault("consistency_level", self.config.consistency_level)
+            return attr(*args, **kwargs)
+        return read
+
+def _connect(timeout: Optional[float] = None) -> MilvusClient:
+    """Open and validate a new client for the configured deployment."""
+    try:
+        config = get_milvus_config()
+        kwargs: Dict[str, Any] = {"uri": config.uri}
+        if config.is_lite:
+            # Milvus Lite stores everything in one local file and needs no credentials
+            os.makedirs(os.path.dirname(os.path.abspath(config.uri)), exist_ok=True)
+        else:
+            kwargs["token"] = config.token
+        db_name = config.db_name if _database is None else _database
+        if db_name:
+            kwargs["db_name"] = db_name
+        if timeout:
+            kwargs["timeout"] = timeout
+        client = MilvusClient(**kwargs)
+        # Test connection
+        client.list_databases()
+        return client
+    except Exception as e:
+        raise MilvusConnectionError(f"Failed to connect to Milvus: {e}")
+
 def get_client() -> MilvusClient:
     """Get Milvus client with lazy initialization and connection validation."""
     global _client
     if _client is None:
-        try:
-            config = get_milvus_config()
-            _client = MilvusClient(uri=config.uri, token=config.token)
-            # Test connection
-            _client.list_databases()
-        except Exception as e:
-            raise MilvusConnectionError(f"Failed to connect to Milvus: {e}")
+        _client = _connect()
     return _client
 
+def get_role_client(role: str) -> RoleClient:
+    """Get the next client from a role's pool, round-robin.
+
+    Each pooled client holds its own connection, so bulk writes on the writer pool
+    do not queue behind or in front of interactive searches on the reader pool.
+    """
+    if role not in CLIENT_ROLE_DEFAULTS:
+        raise MilvusConnectionError(f"Unknown client role: {role}")
+    with _role_lock:
+        if role not in _role_pools:
+            config = get_client_role_config(role)
+            pool = [RoleClient(_connect(config.timeout), config) for _ in range(max(1, config.pool_size))]
+            _role_pools[role] = pool
+            _role_cursors[role] = itertools.cycle(pool)
+        return next(_role_cursors[role])
+
+def get_reader_client() -> RoleClient:
+    """Get a client tuned for interactive search (Bounded consistency by default)."""
+    return get_role_client("reader")
+
+def get_writer_client() -> RoleClient:
+    """Get a client tuned for ingestion (long timeout, Session consistency by default)."""
+    return get_role_client("writer")
+
+def use_database(db_name: str) -> None:
+    """Switch the shared client and every pooled role client to db_name.
+
+    Clients opened later connect to db_name too, so collections created through the
+    shared client are the ones the writer pool inserts into and the reader pool searches.
+    """
+    global _database
+    with _role_lock:
+        _database = db_name
+        pooled = [role_client.client for pool in _role_pools.values() for role_client in pool]
+    get_client().using_database(db_name)
+    for client in pooled:
+        client.using_database(db_name)
+
 def reset_client() -> None:
-    """Reset client connection (useful for testing)."""
-    global _client
-    _client = None
\ No newline at end of file
+    """Reset client connections (useful for testing)."""
+    global _client, _database
+    _client = None
+    _database = None
+    with _role_lock:
+        _role_pools.clear()
+        _role_cursors.clear()
+
+def is_milvus_lite() -> bool:
+    """Check whether the configured URI targets an embedded Milvus Lite file."""
+    return get_milvus_config().is_lite
+
+def supports_feature(feature: str) -> bool:
+    """Check whether the configured deployment supports a server feature."""
+    return not (is_milvus_lite() and feature in LITE_UNSUPPORTED_FEATURES)
+
+def require_feature(feature: str) -> None:
+    """Raise UnsupportedFeatureError if the configured deployment lacks a feature."""
+    if not supports_feature(feature):
+        raise UnsupportedFeatureError(
+            f"Milvus Lite does not support {LITE_UNSUPPORTED_FEATURES[feature]} ('{feature}')"
+        )
+
+def resolve_index_type(index_type: str) -> str:
+    """Return the index type the deployment will actually build for index_type.
+
+    Milvus Lite accepts any index type but only builds FLAT and IVF_FLAT, so
+    benchmarks would otherwise report FLAT latency under an HNSW label.
+    """
+    index_type = index_type.upper()
+    if is_milvus_lite() and index_type not in LITE_INDEX_TYPES:
+        print(f"WARNING: Milvus Lite does not support {index_type} indexes. Falling back to FLAT.")
+        return "FLAT"
+    return index_type
+
+def describe_backend() -> Dict[str, Any]:
+    """Summarize the configured deployment for benchmark and diagnostic logs."""
+    config = get_milvus_config()
+    lite = config.is_lite
+    return {
+        "uri": config.uri,
+        "mode": "lite" if lite else "server",
+        "index_types": sorted(LITE_INDEX_TYPES) if lite else "all",
+        "unsupported_features": sorted(LITE_UNSUPPORTED_FEATURES) if lite else [],
+    }
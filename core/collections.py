@@ -1,50 +1,327 @@
 """Collection operations for Milvus."""
 
-from typing import Any, Dict, List, Tuple
-from pymilvus import MilvusException, model
-from .client import get_client
+import os
+import json
+import time
+import hashlib
+import uuid
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from pymilvus import CollectionSchema, DataType, MilvusException, model
+from .client import get_client, get_writer_client, require_feature, resolve_index_type, supports_feature
+from .config import (BulkStorageConfig, CollectionDeploymentConfig, get_bulk_storage_config, get_deployment_config,
+                     get_milvus_config)
 from .exceptions import CollectionError
+from .indexes import create_index_and_wait, create_scalar_indexes
+
+# Batch limits keep each request well under the default 64 MB gRPC message size
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_BATCH_BYTES = 16 * 1024 * 1024
+DEFAULT_WRITE_WORKERS = 4
+DEFAULT_WRITE_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+DEFAULT_EMBED_BATCH_SIZE = 64
+
+# Bytes per dimension of vector types, and rough per-row sizes for other fields
+VECTOR_BYTES_PER_DIM = {DataType.FLOAT_VECTOR: 4, DataType.FLOAT16_VECTOR: 2,
+                        DataType.BFLOAT16_VECTOR: 2, DataType.BINARY_VECTOR: 1 / 8}
+VARCHAR_ESTIMATE_BYTES = 512
+DYNAMIC_FIELD_ESTIMATE_BYTES = 256
+INDEX_OVERHEAD = 1.2
+
+# Bulk import job states reported by Milvus
+IMPORT_COMPLETED = "Completed"
+IMPORT_FAILED = "Failed"
+
+def _schema_fields(dimension: int, auto_index: bool, partition_key_field: Optional[str] = None,
+                   sparse_field: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Field definitions of collections created by create_collection."""
+    fields: List[Dict[str, Any]] = [
+        {"field_name": "id", "datatype": DataType.INT64, "is_primary": True},
+        {"field_name": "vector", "datatype": DataType.FLOAT_VECTOR, "dim": dimension},
+    ]
+    if sparse_field:
+        fields.append({"field_name": sparse_field, "datatype": DataType.SPARSE_FLOAT_VECTOR})
+    if not auto_index or partition_key_field or sparse_field:
+        fields.append({"field_name": "text", "datatype": DataType.VARCHAR, "max_length": 65535})
+    # Hybrid rows carry text for BM25 but no subject, which they keep in the dynamic field if set
+    if not auto_index or partition_key_field:
+        fields.append({"field_name": "subject", "datatype": DataType.VARCHAR, "max_length": 100})
+    if partition_key_field:
+        if partition_key_field not in {field["field_name"] for field in fields}:
+            fields.append({"field_name": partition_key_field, "datatype": DataType.VARCHAR, "max_length": 100})
+        for field in fields:
+            if field["field_name"] == partition_key_field:
+                field["is_partition_key"] = True
+    return fields
+
+def _check_deployment(deployment: CollectionDeploymentConfig) -> None:
+    """Fail before touching the collection if the deployment cannot honour the settings."""
+    if deployment.mmap_vectors or deployment.mmap_scalars:
+        require_feature("mmap")
+    if deployment.replica_number and deployment.replica_number > 1:
+        require_feature("replicas")
+    if deployment.resource_groups:
+        require_feature("resource_groups")
+
+def _apply_mmap(fields: List[Dict[str, Any]], deployment: CollectionDeploymentConfig) -> List[Dict[str, Any]]:
+    """Copy field definitions with mmap_enabled set on vector and non-primary scalar fields."""
+    result = []
+    for field in fields:
+        field = dict(field)
+        mmap = deployment.mmap_vectors if "dim" in field else None if field.get("is_primary") else deployment.mmap_scalars
+        if mmap is not None:
+            field["mmap_enabled"] = mmap
+        result.append(field)
+    return result
+
+def _load_options(deployment: CollectionDeploymentConfig) -> Dict[str, Any]:
+    options: Dict[str, Any] = {}
+    if deployment.replica_number:
+        options["replica_number"] = deployment.replica_number
+    if deployment.resource_groups:
+        options["resource_groups"] = deployment.resource_groups
+    return options
+
+def load_collection(collection_name: str, deployment: Optional[CollectionDeploymentConfig] = None) -> None:
+    """Load a collection with the configured replica count and resource groups."""
+    deployment = deployment or get_deployment_config()
+    _check_deployment(deployment)
+    try:
+        get_client().load_collection(collection_name=collection_name, **_load_options(deployment))
+    except MilvusException as e:
+        raise CollectionError(f"Failed to load collection '{collection_name}': {e}")
 
 def create_collection(collection_name: str | None, dimension: int = 1536, 
                      metric_type: str = "COSINE", consistency_level: str = "Session", 
-                     auto_index: bool = True) -> None:
+                     auto_index: bool = True, partition_key_field: Optional[str] = None,
+                     num_partitions: Optional[int] = None,
+                     scalar_indexes: Optional[Dict[str, Optional[str]]] = None,
+                     deployment: Optional[CollectionDeploymentConfig] = None,
+                     sparse_field: Optional[str] = None) -> None:
     """Create or recreate a collection.
     
     Args:
         auto_index: If True, creates collection with automatic index. 
                    If False, creates collection without index (you must create index separately).
+        partition_key_field: VARCHAR field (e.g. "subject") used as Milvus partition key, so
+                   filters on it only search the matching partitions. Uses the schema method.
+        num_partitions: Number of partitions hashed from the partition key (Milvus default 16).
+        scalar_indexes: Filter fields to index, mapped to an index type or None for the
+                   default of the field's type (see core.indexes.create_scalar_indexes).
+        deployment: Shard count, mmap storage of vector and scalar fields, and the replica
+                   count and resource groups used at load time. Defaults to the MILVUS_SHARDS_NUM,
+                   MILVUS_MMAP_*, MILVUS_REPLICAS and MILVUS_RESOURCE_GROUPS environment variables.
+        sparse_field: SPARSE_FLOAT_VECTOR field (e.g. core.sparse.SPARSE_FIELD) stored next to
+                   the dense vector for BM25 hybrid search. Uses the schema method.
     """
     if not collection_name:
         raise CollectionError("collection_name is required")
+    deployment = deployment or get_deployment_config()
+    _check_deployment(deployment)
     
     try:
         client = get_client()
         if client.has_collection(collection_name=collection_name):
             client.drop_collection(collection_name=collection_name)
         
-        if auto_index:
+        options: Dict[str, Any] = {"consistency_level": consistency_level}
+        if deployment.shards_num:
+            options["num_shards"] = deployment.shards_num
+        mmap = deployment.mmap_vectors is not None or deployment.mmap_scalars is not None
+        if auto_index and not partition_key_field and not sparse_field and not mmap:
             # Simple method - creates collection with automatic index
             client.create_collection(
                 collection_name=collection_name,
                 dimension=dimension,
                 metric_type=metric_type,
-                consistency_level=consistency_level
+                **options
             )
         else:
-            # Schema method - creates collection without index
-            from pymilvus import DataType
+            # Schema method - creates collection without index unless auto_index is set
             schema = client.create_schema(auto_id=False, enable_dynamic_field=True)
-            schema.add_field(field_name="id", datatype=DataType.INT64, is_primary=True)
-            schema.add_field(field_name="vector", datatype=DataType.FLOAT_VECTOR, dim=dimension)
-            schema.add_field(field_name="text", datatype=DataType.VARCHAR, max_length=65535)
-            schema.add_field(field_name="subject", datatype=DataType.VARCHAR, max_length=100)
-            
-            client.create_collection(collection_name=collection_name, schema=schema)
+            for field in _apply_mmap(_schema_fields(dimension, auto_index, partition_key_field, sparse_field), deployment):
+                schema.add_field(**field)
+
+            if auto_index:
+                index_params = client.prepare_index_params()
+                index_args: Dict[str, Any] = {}
+                if deployment.mmap_vectors is not None:
+                    # The vector index is mapped separately from the raw vector field
+                    index_args["params"] = {"mmap.enabled": str(deployment.mmap_vectors).lower()}
+                index_params.add_index(field_name="vector", index_type="AUTOINDEX", metric_type=metric_type, **index_args)
+                if sparse_field:
+                    index_params.add_index(field_name=sparse_field, index_type="SPARSE_INVERTED_INDEX", metric_type="IP")
+                options["index_params"] = index_params
+            if partition_key_field and num_partitions:
+                options["num_partitions"] = num_partitions
+            client.create_collection(collection_name=collection_name, schema=schema, **options)
             
         print(f"Collection - {collection_name} - created successfully {'with auto-index' if auto_index else 'without index'}")
+        if scalar_indexes:
+            create_scalar_indexes(collection_name, scalar_indexes)
+        load_options = _load_options(deployment)
+        if auto_index and load_options:
+            # Collections created with an index are loaded with one replica; reload with the configured layout
+            client.release_collection(collection_name=collection_name)
+            client.load_collection(collection_name=collection_name, **load_options)
     except MilvusException as e:
         raise CollectionError(f"Failed to create collection '{collection_name}': {e}")
 
+def _structural_changes(existing: Dict[str, Dict[str, Any]], desired: List[Dict[str, Any]]) -> List[str]:
+    """List differences in primary key, vector or partition key fields, which require a rebuild."""
+    changes = []
+    for field in desired:
+        name = field["field_name"]
+        # Vector fields cannot be added to existing collections
+        if not (field.get("is_primary") or field.get("is_partition_key") or "dim" in field
+                or field["datatype"] == DataType.SPARSE_FLOAT_VECTOR):
+            continue
+        current = existing.get(name)
+        if current is None:
+            changes.append(f"missing field '{name}'")
+        elif field.get("is_partition_key") and not current.get("is_partition_key"):
+            changes.append(f"field '{name}' is not the partition key")
+        elif current["type"] != field["datatype"]:
+            changes.append(f"field '{name}' is {current['type'].name}, expected {field['datatype'].name}")
+        elif "dim" in field and int(current.get("params", {}).get("dim", 0)) != field["dim"]:
+            changes.append(f"field '{name}' has dim {current['params'].get('dim')}, expected {field['dim']}")
+    return changes
+
+def _add_scalar_field(client, collection_name: str, field: Dict[str, Any], dynamic: bool) -> Optional[str]:
+    """Add a missing scalar field in place when the deployment allows it."""
+    name = field["field_name"]
+    if supports_feature("add_field"):
+        params = {k: v for k, v in field.items() if k not in ("field_name", "datatype", "is_partition_key")}
+        # Milvus only allows nullable fields to be added to existing collections
+        client.add_collection_field(collection_name=collection_name, field_name=name,
+                                    data_type=field["datatype"], nullable=True, **params)
+        return f"added field '{name}'"
+    if dynamic:
+        print(f"Field '{name}' missing from '{collection_name}'; its values will be kept in the dynamic field.")
+    else:
+        print(f"WARNING: Cannot add field '{name}' to '{collection_name}' on this deployment.")
+    return None
+
+# describe_index keys that describe the build rather than its parameters
+_INDEX_STATE_KEYS = {"index_type", "metric_type", "field_name", "index_name", "total_rows",
+                     "indexed_rows", "pending_index_rows", "state", "index_state_fail_reason"}
+
+def _index_build_params(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Build params of a describe_index result, which flattens them in; Milvus Lite omits them."""
+    return {k: v for k, v in info.items() if k not in _INDEX_STATE_KEYS}
+
+def _ensure_vector_index(client, collection_name: str, metric_type: str,
+                         load_options: Optional[Dict[str, Any]] = None, index_type: Optional[str] = None,
+                         index_params: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Create the vector index if missing, or rebuild it in place if it no longer matches.
+
+    An existing index is rebuilt when its metric differs, or its type or params differ
+    from an index_type or index_params passed explicitly. Without them any index type is
+    kept, such as one chosen by build_vector_index, and a metric change keeps it too.
+    """
+    index_type = resolve_index_type(index_type) if index_type else None
+    indexes = client.list_indexes(collection_name=collection_name, field_name="vector")
+    if indexes:
+        current = client.describe_index(collection_name=collection_name, index_name=indexes[0])
+        differences = []
+        if index_type and current.get("index_type") != index_type:
+            differences.append(f"type {current.get('index_type')} -> {index_type}")
+        if current.get("metric_type") != metric_type:
+            differences.append(f"metric {current.get('metric_type')} -> {metric_type}")
+        differences += [f"{k} {current[k]} -> {v}" for k, v in (index_params or {}).items()
+                        if k in current and str(current[k]) != str(v)]
+        if not differences:
+            return []
+        if not index_type or index_type == current.get("index_type"):
+            index_type = current.get("index_type", "AUTOINDEX")
+            index_params = {**_index_build_params(current), **(index_params or {})}
+        client.release_collection(collection_name=collection_name)
+        client.drop_index(collection_name=collection_name, index_name=indexes[0])
+        change = f"rebuilt vector index ({'; '.join(differences)})"
+    else:
+        index_type = index_type or "AUTOINDEX"
+        change = f"created {index_type} vector index with metric {metric_type}"
+
+    params = client.prepare_index_params()
+    params.add_index(field_name="vector", index_type=index_type, metric_type=metric_type, params=index_params or {})
+    create_index_and_wait(collection_name, params, load=False)
+    client.load_collection(collection_name=collection_name, **(load_options or {}))
+    return [change]
+
+def ensure_collection(collection_name: str | None, dimension: int = 1536,
+                      metric_type: str = "COSINE", consistency_level: str = "Session",
+                      auto_index: bool = True, partition_key_field: Optional[str] = None,
+                      num_partitions: Optional[int] = None,
+                      scalar_indexes: Optional[Dict[str, Optional[str]]] = None,
+                      deployment: Optional[CollectionDeploymentConfig] = None,
+                      sparse_field: Optional[str] = None, index_type: Optional[str] = None,
+                      index_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Create a collection if missing, or reconcile an existing one without losing data.
+
+    Existing data is kept unless the primary key, vector or partition key field differs
+    from the desired definition. Missing scalar fields and scalar indexes are added. With
+    auto_index the vector index is created if missing, or rebuilt in place when its metric
+    differs, or its type or params differ from an index_type or index_params passed
+    explicitly; left at None, an existing index of any type is kept. Without auto_index
+    the vector index is never touched. Shard count and mmap settings in deployment apply
+    only when the collection is created or rebuilt.
+
+    Returns:
+        Dict with "action" ("created", "unchanged", "updated" or "rebuilt") and
+        the list of "changes" applied.
+    """
+    if not collection_name:
+        raise CollectionError("collection_name is required")
+
+    try:
+        client = get_client()
+        create_args = (collection_name, dimension, metric_type, consistency_level, auto_index,
+                       partition_key_field, num_partitions, scalar_indexes, deployment, sparse_field)
+        load_options = _load_options(deployment or get_deployment_config())
+
+        def create() -> List[str]:
+            create_collection(*create_args)
+            if auto_index and ((index_type and index_type.upper() != "AUTOINDEX") or index_params):
+                # New collections get AUTOINDEX; swap it while the collection is still empty
+                return _ensure_vector_index(client, collection_name, metric_type, load_options,
+                                            index_type, index_params)
+            return []
+
+        if not client.has_collection(collection_name=collection_name):
+            return {"action": "created", "changes": create()}
+
+        description = client.describe_collection(collection_name=collection_name)
+        existing = {field["name"]: field for field in description["fields"]}
+        desired = _schema_fields(dimension, auto_index, partition_key_field, sparse_field)
+
+        rebuild_reasons = _structural_changes(existing, desired)
+        if rebuild_reasons:
+            print(f"Rebuilding collection '{collection_name}': {'; '.join(rebuild_reasons)}")
+            return {"action": "rebuilt", "changes": rebuild_reasons + create()}
+
+        changes = []
+        for field in desired:
+            if field["field_name"] not in existing:
+                change = _add_scalar_field(client, collection_name, field, description.get("enable_dynamic_field", False))
+                if change:
+                    changes.append(change)
+        if auto_index:
+            changes += _ensure_vector_index(client, collection_name, metric_type, load_options,
+                                            index_type, index_params)
+        if scalar_indexes:
+            changes += [f"created scalar index on '{name}'"
+                        for name in create_scalar_indexes(collection_name, scalar_indexes)]
+
+        action = "updated" if changes else "unchanged"
+        print(f"Collection - {collection_name} - {action}{': ' + '; '.join(changes) if changes else ''}")
+        return {"action": action, "changes": changes}
+    except MilvusException as e:
+        raise CollectionError(f"Failed to ensure collection '{collection_name}': {e}")
+
 def drop_collection(collection_name: str | None) -> None:
     """Drop a collection."""
     if not collection_name:
@@ -62,32 +339,465 @@ def has_collection(collection_name: str) -> bool:
     client = get_client()
     return client.has_collection(collection_name=collection_name)
 
-def insert_data(collection_name: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Insert data into collection."""
+def make_chunk_id(source: str, position: Optional[int] = None, text: Optional[str] = None) -> int:
+    """Derive a stable, non-negative 64-bit primary key for a chunk.
+
+    The key hashes the source path with the chunk's position, its text, or both.
+    Hashing the text keeps ids stable when chunks are added earlier in the same file;
+    hashing only the position keeps an edited chunk on the same id, so it is upserted
+    in place. Either way, changes in one file never shift the ids of another.
+    """
+    if position is None and text is None:
+        raise CollectionError("make_chunk_id needs a position, a text, or both")
+    key = "\x1f".join([
+        source,
+        "" if position is None else str(position),
+        "" if text is None else hashlib.sha256(text.encode("utf-8")).hexdigest()
+    ])
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    # Milvus INT64 keys are signed; clear the sign bit to keep ids positive
+    return int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+def _estimate_row_bytes(row: Dict[str, Any]) -> int:
+    """Approximate the serialized size of a row (float32 vectors, UTF-8 text)."""
+    size = 0
+    for value in row.values():
+        if hasattr(value, "nbytes"):
+            size += value.nbytes
+        elif isinstance(value, str):
+            size += len(value.encode("utf-8"))
+        elif isinstance(value, (list, tuple)):
+            size += 4 * len(value)
+        else:
+            size += 8
+    return size
+
+def _split_batches(data: List[Dict[str, Any]], batch_size: int, max_batch_bytes: int) -> List[List[Dict[str, Any]]]:
+    """Split rows into batches bounded by row count and estimated bytes."""
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_bytes = 0
+    for row in data:
+        row_bytes = _estimate_row_bytes(row)
+        if current and (len(current) >= batch_size or current_bytes + row_bytes > max_batch_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(row)
+        current_bytes += row_bytes
+    if current:
+        batches.append(current)
+    return batches
+
+def _write_batches(operation: str, collection_name: str, data: List[Dict[str, Any]], batch_size: int,
+                   max_batch_bytes: int, max_workers: int, max_retries: int) -> Dict[str, Any]:
+    """Write rows in concurrent batches through the writer client pool."""
+    count_key = f"{operation}_count"
+
+    def write(index: int, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        start = time.time()
+        for attempt in range(max_retries + 1):
+            try:
+                client = get_writer_client()
+                # Retries always upsert: a batch whose response was lost may already be stored
+                write_fn = client.insert if operation == "insert" and attempt == 0 else client.upsert
+                res = write_fn(collection_name=collection_name, data=batch)
+                count = res.get("insert_count", res.get("upsert_count", len(batch)))
+                return {"batch": index, "rows": len(batch), "count": count, "ids": list(res.get("ids", [])),
+                        "attempts": attempt + 1, "seconds": time.time() - start}
+            except MilvusException as e:
+                if attempt == max_retries:
+                    raise CollectionError(f"Failed to {operation} batch {index} into '{collection_name}' "
+                                          f"after {attempt + 1} attempts: {e}")
+                time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+        raise CollectionError(f"Failed to {operation} batch {index} into '{collection_name}'")
+
+    start = time.time()
+    batches = _split_batches(data, batch_size, max_batch_bytes)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = list(executor.map(write, range(len(batches)), batches))
+
+    ids: List[Any] = []
+    for r in results:
+        ids.extend(r.pop("ids"))
+    return {
+        count_key: sum(r["count"] for r in results),
+        "ids": ids,
+        "batches": results,
+        "seconds": time.time() - start
+    }
+
+def insert_data(collection_name: str, data: List[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE,
+                max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES, max_workers: int = DEFAULT_WRITE_WORKERS,
+                max_retries: int = DEFAULT_WRITE_RETRIES) -> Dict[str, Any]:
+    """Insert data into collection in size-bounded batches, several in flight at once.
+
+    Failed batches are retried as upserts, so rows must carry their primary key.
+
+    Returns:
+        Dict with the total insert_count, the inserted ids, per-batch rows/attempts/seconds
+        under "batches", and the overall wall-clock "seconds".
+    """
+    return _write_batches("insert", collection_name, data, batch_size, max_batch_bytes, max_workers, max_retries)
+
+def upsert_data(collection_name: str, data: List[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE,
+                max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES, max_workers: int = DEFAULT_WRITE_WORKERS,
+                max_retries: int = DEFAULT_WRITE_RETRIES) -> Dict[str, Any]:
+    """Upsert data into collection in size-bounded concurrent batches (see insert_data)."""
+    return _write_batches("upsert", collection_name, data, batch_size, max_batch_bytes, max_workers, max_retries)
+
+def estimate_collection_memory(collection_name: str) -> int:
+    """Estimate the query node memory a loaded collection needs, in bytes.
+
+    Uses the row count and field types: exact sizes for vectors, a capped guess for
+    VARCHAR and dynamic fields, and a flat overhead for the index.
+    """
+    try:
+        client = get_client()
+        description = client.describe_collection(collection_name=collection_name)
+        rows = int(client.get_collection_stats(collection_name=collection_name).get("row_count", 0))
+    except MilvusException as e:
+        raise CollectionError(f"Failed to estimate memory of '{collection_name}': {e}")
+
+    row_bytes = DYNAMIC_FIELD_ESTIMATE_BYTES if description.get("enable_dynamic_field") else 0
+    for field in description["fields"]:
+        params = field.get("params", {})
+        if field["type"] in VECTOR_BYTES_PER_DIM:
+            row_bytes += int(params.get("dim", 0)) * VECTOR_BYTES_PER_DIM[field["type"]]
+        elif field["type"] == DataType.VARCHAR:
+            row_bytes += min(int(params.get("max_length", VARCHAR_ESTIMATE_BYTES)), VARCHAR_ESTIMATE_BYTES)
+        else:
+            row_bytes += 8
+    return int(rows * row_bytes * INDEX_OVERHEAD)
+
+class LoadedCollectionManager:
+    """Load collections on first use and release the least recently used over a memory budget.
+
+    Collections are loaded lazily by ensure_loaded() (called before every search) and
+    tracked with their estimated memory. When loading another collection would exceed
+    memory_budget_bytes, the least recently used ones are released first. A budget of
+    None only tracks usage. Collections are loaded with the replica count and resource
+    groups of deployment, and each replica counts against the budget.
+    """
+
+    def __init__(self, memory_budget_bytes: Optional[int] = None,
+                 deployment: Optional[CollectionDeploymentConfig] = None):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.deployment = deployment or get_deployment_config()
+        self._loaded: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(self._loaded.values())
+
+    def loaded_collections(self) -> Dict[str, int]:
+        """Tracked collections and their estimated bytes, least recently used first."""
+        with self._lock:
+            return dict(self._loaded)
+
+    def ensure_loaded(self, collection_name: str) -> None:
+        """Load a collection if it is not tracked yet and mark it most recently used."""
+        with self._lock:
+            if collection_name in self._loaded:
+                self._loaded.move_to_end(collection_name)
+                return
+
+            estimate = estimate_collection_memory(collection_name) * (self.deployment.replica_number or 1)
+            self._release_for(estimate)
+            load_collection(collection_name, self.deployment)
+            self._loaded[collection_name] = estimate
+            print(f"Loaded collection '{collection_name}' (~{estimate / 2**20:.1f} MB, "
+                  f"{self.used_bytes / 2**20:.1f} MB in use)")
+
+    def _release_for(self, incoming_bytes: int) -> None:
+        if self.memory_budget_bytes is None:
+            return
+        while self._loaded and self.used_bytes + incoming_bytes > self.memory_budget_bytes:
+            self.release(next(iter(self._loaded)))
+        if incoming_bytes > self.memory_budget_bytes:
+            print(f"WARNING: Collection needs ~{incoming_bytes / 2**20:.1f} MB, "
+                  f"over the {self.memory_budget_bytes / 2**20:.1f} MB load budget")
+
+    def release(self, collection_name: str) -> None:
+        """Release a collection from query node memory and stop tracking it."""
+        with self._lock:
+            size = self._loaded.pop(collection_name, 0)
+            try:
+                get_client().release_collection(collection_name=collection_name)
+            except MilvusException as e:
+                raise CollectionError(f"Failed to release collection '{collection_name}': {e}")
+            print(f"Released collection '{collection_name}' (~{size / 2**20:.1f} MB)")
+
+    def release_all(self) -> None:
+        with self._lock:
+            for collection_name in list(self._loaded):
+                self.release(collection_name)
+
+# Global collection manager - initialized lazily
+_collection_manager: Optional[LoadedCollectionManager] = None
+
+def get_collection_manager() -> LoadedCollectionManager:
+    """Get the shared collection manager, budgeted by MILVUS_LOAD_BUDGET_MB if set."""
+    global _collection_manager
+    if _collection_manager is None:
+        budget_mb = os.getenv("MILVUS_LOAD_BUDGET_MB")
+        _collection_manager = LoadedCollectionManager(int(float(budget_mb) * 2**20) if budget_mb else None)
+    return _collection_manager
+
+def write_bulk_files(collection_name: str, data: List[Dict[str, Any]], local_path: str = "./data/bulk",
+                     file_type: str = "parquet") -> List[List[str]]:
+    """Write rows to columnar files matching the collection schema with LocalBulkWriter.
+
+    Args:
+        file_type: "parquet" (one file per batch) or "numpy" (one .npy file per field).
+
+    Returns:
+        Batches of file paths in the layout expected by bulk import.
+    """
+    from pymilvus.bulk_writer import BulkFileType, LocalBulkWriter
+
     client = get_client()
-    return client.insert(collection_name=collection_name, data=data)
+    schema = CollectionSchema.construct_from_dict(client.describe_collection(collection_name=collection_name))
+    writer = LocalBulkWriter(schema=schema, local_path=local_path, file_type=BulkFileType[file_type.upper()])
+    for row in data:
+        writer.append_row(row)
+    writer.commit()
+    return writer.batch_files
+
+def _read_bulk_files(files: List[List[str]]) -> List[Dict[str, Any]]:
+    """Read rows back from parquet or numpy bulk files, unpacking dynamic fields."""
+    import numpy as np
+    import pyarrow.parquet as pq
+
+    rows: List[Dict[str, Any]] = []
+    for batch in files:
+        if len(batch) == 1 and batch[0].endswith(".parquet"):
+            batch_rows = pq.read_table(batch[0]).to_pylist()
+        else:
+            columns = {os.path.basename(path)[:-len(".npy")]: np.load(path, allow_pickle=True).tolist()
+                       for path in batch}
+            count = len(next(iter(columns.values())))
+            batch_rows = [{name: values[i] for name, values in columns.items()} for i in range(count)]
+        for row in batch_rows:
+            meta = row.pop("$meta", None)
+            if meta:
+                row.update(json.loads(meta))
+        rows.extend(batch_rows)
+    return rows
+
+def upload_bulk_files(files: List[List[str]], local_root: str,
+                      storage: Optional[BulkStorageConfig] = None) -> List[List[str]]:
+    """Copy local bulk files into the server's bucket for an import job.
+
+    Files keep their path relative to local_root under storage.remote_path.
+
+    Returns:
+        Batches of object keys, in the layout expected by bulk import.
+    """
+    from minio import Minio
+    from minio.error import S3Error
+    from urllib3.exceptions import HTTPError
+
+    storage = storage or get_bulk_storage_config()
+    if not storage.configured:
+        raise CollectionError("Cannot upload bulk files: set MILVUS_BULK_BUCKET and MILVUS_BULK_ENDPOINT")
+    minio = Minio(storage.endpoint, access_key=storage.access_key, secret_key=storage.secret_key,
+                  secure=storage.secure)
+    remote_files: List[List[str]] = []
+    try:
+        for batch in files:
+            keys = []
+            for path in batch:
+                relative = os.path.relpath(path, local_root).replace(os.sep, "/")
+                keys.append(f"{storage.remote_path.strip('/')}/{relative}")
+                minio.fput_object(storage.bucket, keys[-1], path)
+            remote_files.append(keys)
+    except (S3Error, HTTPError, OSError) as e:
+        raise CollectionError(f"Failed to upload bulk files to bucket '{storage.bucket}': {e}")
+    return remote_files
+
+class RestBulkImporter:
+    """Submit bulk import jobs through the Milvus REST API.
+
+    The server reads files from its own object storage, so submit object keys in the
+    Milvus bucket (see upload_bulk_files), not local paths.
+    """
+
+    def __init__(self, url: Optional[str] = None, token: Optional[str] = None, db_name: str = ""):
+        config = get_milvus_config()
+        self.url = url or config.uri
+        self.token = token if token is not None else config.token
+        self.db_name = db_name
+
+    def submit(self, collection_name: str, files: List[List[str]]) -> str:
+        from pymilvus.bulk_writer import bulk_import
+
+        res = bulk_import(url=self.url, collection_name=collection_name, db_name=self.db_name,
+                          files=files, token=self.token).json()
+        if res.get("code") != 0:
+            raise CollectionError(f"Failed to start bulk import into '{collection_name}': {res.get('message')}")
+        return str(res["data"]["jobId"])
+
+    def progress(self, job_id: str) -> Dict[str, Any]:
+        from pymilvus.bulk_writer import get_import_progress
+
+        res = get_import_progress(url=self.url, job_id=job_id, db_name=self.db_name, token=self.token).json()
+        if res.get("code") != 0:
+            raise CollectionError(f"Failed to get progress of import job {job_id}: {res.get('message')}")
+        data = res["data"]
+        return {"state": data.get("state"), "progress": data.get("progress", 0),
+                "imported_rows": data.get("importedRows", 0), "reason": data.get("reason", "")}
 
-def vectorize_documents(collection_name: str, docs: List[str]) -> Tuple[Dict[str, Any], int]:
-    """Vectorize documents and insert into collection."""
+class LocalBulkImporter:
+    """Stand-in importer that reads bulk files back and loads them with insert_data.
+
+    Used on Milvus Lite, which has no import service, and in tests. Jobs complete
+    synchronously inside submit().
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+
+    def submit(self, collection_name: str, files: List[List[str]]) -> str:
+        job_id = uuid.uuid4().hex
+        try:
+            res = insert_data(collection_name, _read_bulk_files(files))
+            self.jobs[job_id] = {"state": IMPORT_COMPLETED, "progress": 100,
+                                 "imported_rows": res["insert_count"], "reason": ""}
+        except CollectionError as e:
+            self.jobs[job_id] = {"state": IMPORT_FAILED, "progress": 0, "imported_rows": 0, "reason": str(e)}
+        return job_id
+
+    def progress(self, job_id: str) -> Dict[str, Any]:
+        return self.jobs[job_id]
+
+def wait_for_import(importer: Any, job_id: str, poll_interval: float = 2.0,
+                    timeout: float = 3600.0) -> Dict[str, Any]:
+    """Poll an import job until it completes, fails or times out."""
+    deadline = time.time() + timeout
+    while True:
+        progress = importer.progress(job_id)
+        print(f"Import job {job_id}: {progress['state']} {progress['progress']}%")
+        if progress["state"] == IMPORT_COMPLETED:
+            return progress
+        if progress["state"] == IMPORT_FAILED:
+            raise CollectionError(f"Import job {job_id} failed: {progress['reason']}")
+        if time.time() >= deadline:
+            raise CollectionError(f"Import job {job_id} did not finish within {timeout:.0f}s")
+        time.sleep(poll_interval)
+
+def bulk_load(collection_name: str, data: List[Dict[str, Any]], local_path: str = "./data/bulk",
+              file_type: str = "parquet", importer: Any = None, poll_interval: float = 2.0,
+              timeout: float = 3600.0, storage: Optional[BulkStorageConfig] = None) -> Dict[str, Any]:
+    """Load rows through columnar files and a bulk import job instead of row-wise inserts.
+
+    The files are written under local_path and, when bulk storage is configured
+    (MILVUS_BULK_*), uploaded to the server's bucket for a RestBulkImporter job.
+    Without it a server cannot read the files, so they are loaded with
+    LocalBulkImporter instead, as on Milvus Lite.
+
+    Args:
+        importer: Object with submit(collection_name, files) and progress(job_id).
+
+    Returns:
+        Dict with job_id, files, imported_rows and elapsed seconds.
+    """
+    storage = storage or get_bulk_storage_config()
+    remote = storage.configured and supports_feature("bulk_import")
+    if importer is None:
+        if remote:
+            importer = RestBulkImporter()
+        else:
+            if supports_feature("bulk_import"):
+                print("WARNING: MILVUS_BULK_BUCKET and MILVUS_BULK_ENDPOINT are not set, so the server cannot "
+                      "read the bulk files. Loading them with insert_data instead.")
+            importer = LocalBulkImporter()
+
+    start = time.time()
+    files = write_bulk_files(collection_name, data, local_path=local_path, file_type=file_type)
+    if remote and not isinstance(importer, LocalBulkImporter):
+        files = upload_bulk_files(files, local_path, storage)
+    job_id = importer.submit(collection_name, files)
+    progress = wait_for_import(importer, job_id, poll_interval=poll_interval, timeout=timeout)
+    print(f"Bulk loaded {progress['imported_rows']} rows into '{collection_name}' in {time.time() - start:.2f}s")
+    return {"job_id": job_id, "files": files, "imported_rows": progress["imported_rows"],
+            "seconds": time.time() - start}
+
+def vectorize_documents(collection_name: str, docs: List[str], subject: str = "history", id_start: int = 0,
+                        embed_batch_size: int = DEFAULT_EMBED_BATCH_SIZE, insert_workers: int = 2,
+                        max_pending_batches: int = 4) -> Tuple[Dict[str, Any], int]:
+    """Vectorize documents and insert into collection, overlapping embedding with inserts.
+
+    Embedded batches flow through a bounded queue to insert_workers threads. When
+    inserts fall behind, embedding blocks on the full queue, so at most
+    max_pending_batches batches of vectors are held in memory.
+
+    Args:
+        subject: Value stored in every row's subject field.
+        id_start: Primary key of the first document; documents get consecutive ids.
+
+    Returns:
+        Aggregated insert result (see insert_data, plus "embed_seconds") and the dimension.
+    """
     # Use default embedding model
     embedding_fn = model.DefaultEmbeddingFunction()
-    vectors = embedding_fn.encode_documents(docs)
-    
-    print("Dim:", embedding_fn.dim, vectors[0].shape)
     dimension = embedding_fn.dim
+    print("Dim:", dimension)
     
     # Create collection with correct dimensions
     create_collection(collection_name, dimension=dimension)
-    
-    # Prepare data
-    data = [
-        {"id": i, "vector": vectors[i], "text": docs[i], "subject": "history"}
-        for i in range(len(vectors))
-    ]
-    
-    print("Data has", len(data), "entities, each with fields:", data[0].keys())
-    print("Vector dim:", len(data[0]["vector"]))
-    
-    # Insert data
-    res = insert_data(collection_name, data)
-    return res, dimension
\ No newline at end of file
+
+    pending: queue.Queue = queue.Queue(maxsize=max(1, max_pending_batches))
+    results: List[Dict[str, Any]] = []
+    errors: List[Exception] = []
+
+    def insert_worker() -> None:
+        while True:
+            rows = pending.get()
+            if rows is None:
+                return
+            # Keep draining after a failure so the embedding loop never blocks on a full queue
+            if errors:
+                continue
+            try:
+                results.append(insert_data(collection_name, rows, max_workers=1))
+            except Exception as e:
+                # Any failure, e.g. a lost connection, must be recorded: a dead worker stops draining the queue
+                errors.append(e)
+
+    workers = [threading.Thread(target=insert_worker, daemon=True) for _ in range(max(1, insert_workers))]
+    for worker in workers:
+        worker.start()
+
+    start = time.time()
+    embed_seconds = 0.0
+    try:
+        for offset in range(0, len(docs), embed_batch_size):
+            if errors:
+                break
+            batch = docs[offset:offset + embed_batch_size]
+            embed_start = time.time()
+            vectors = embedding_fn.encode_documents(batch)
+            embed_seconds += time.time() - embed_start
+            pending.put([
+                {"id": id_start + offset + i, "vector": vectors[i], "text": batch[i], "subject": subject}
+                for i in range(len(vectors))
+            ])
+    finally:
+        for _ in workers:
+            pending.put(None)
+        for worker in workers:
+            worker.join()
+
+    if errors:
+        raise errors[0]
+
+    res = {
+        "insert_count": sum(r["insert_count"] for r in results),
+        "ids": [i for r in results for i in r["ids"]],
+        "batches": [b for r in results for b in r["batches"]],
+        "seconds": time.time() - start,
+        "embed_seconds": embed_seconds
+    }
+    print(f"Inserted {res['insert_count']} entities in {res['seconds']:.2f}s (embedding {embed_seconds:.2f}s)")
+    return res, dimension
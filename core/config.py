@@ -2,12 +2,66 @@
 
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 @dataclass
 class MilvusConfig:
     uri: str = "http://localhost:19530"
     token: str = "root:Milvus"
+    db_name: str = ""
+
+    @property
+    def is_lite(self) -> bool:
+        """True when the URI points at a local Milvus Lite database file."""
+        return is_lite_uri(self.uri)
+
+@dataclass
+class ClientRoleConfig:
+    role: str
+    pool_size: int = 1
+    timeout: Optional[float] = None
+    consistency_level: str = "Session"
+
+@dataclass
+class CollectionDeploymentConfig:
+    """Storage and serving options applied when a collection is created and loaded."""
+    shards_num: Optional[int] = None
+    mmap_vectors: Optional[bool] = None
+    mmap_scalars: Optional[bool] = None
+    replica_number: Optional[int] = None
+    resource_groups: Optional[List[str]] = None
+
+@dataclass
+class ReadConsistency:
+    """Consistency of a single read, overriding the client role default.
+
+    staleness_seconds bounds how old the data may be; guarantee_timestamp reads at
+    least up to a hybrid timestamp, such as one taken right after a write.
+    """
+    level: str = "Bounded"
+    staleness_seconds: Optional[float] = None
+    guarantee_timestamp: Optional[int] = None
+
+@dataclass
+class ChunkingConfig:
+    """Token limits of document chunks; 256 is the input limit of all-MiniLM-L6-v2."""
+    max_tokens: int = 256
+    overlap_tokens: int = 32
+    min_tokens: int = 4
+
+@dataclass
+class BulkStorageConfig:
+    """Object storage (MinIO or S3) the Milvus server reads bulk import files from."""
+    bucket: Optional[str] = None
+    endpoint: Optional[str] = None
+    access_key: Optional[str] = None
+    secret_key: Optional[str] = None
+    secure: bool = False
+    remote_path: str = "bulk"
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.bucket and self.endpoint)
 
 @dataclass
 class EmbeddingConfig:
@@ -15,10 +69,80 @@ class EmbeddingConfig:
     hf_model: Optional[str] = None
     ollama_model: Optional[str] = None
 
+def is_lite_uri(uri: str) -> bool:
+    """Milvus Lite is selected by a local file URI such as ``./milvus.db``."""
+    return uri.endswith(".db") and "://" not in uri
+
 def get_milvus_config() -> MilvusConfig:
+    # pymilvus validates MILVUS_URI as a server address on import, so Milvus Lite files use their own variable
     return MilvusConfig(
-        uri=os.getenv("MILVUS_URI", "http://localhost:19530"),
-        token=os.getenv("MILVUS_TOKEN", "root:Milvus")
+        uri=os.getenv("MILVUS_LITE_DB") or os.getenv("MILVUS_URI", "http://localhost:19530"),
+        token=os.getenv("MILVUS_TOKEN", "root:Milvus"),
+        db_name=os.getenv("MILVUS_DB_NAME", "")
+    )
+
+# Searches tolerate slightly stale reads so they never wait on ingestion;
+# writers keep Session consistency so sync diffs see their own upserts.
+CLIENT_ROLE_DEFAULTS = {
+    "reader": ClientRoleConfig(role="reader", pool_size=2, timeout=10.0, consistency_level="Bounded"),
+    "writer": ClientRoleConfig(role="writer", pool_size=1, timeout=120.0, consistency_level="Session"),
+}
+
+def get_client_role_config(role: str) -> ClientRoleConfig:
+    """Read MILVUS_<ROLE>_POOL_SIZE, _TIMEOUT and _CONSISTENCY overrides for a client role."""
+    defaults = CLIENT_ROLE_DEFAULTS[role]
+    prefix = f"MILVUS_{role.upper()}_"
+    timeout = os.getenv(prefix + "TIMEOUT")
+    return ClientRoleConfig(
+        role=role,
+        pool_size=int(os.getenv(prefix + "POOL_SIZE", defaults.pool_size)),
+        timeout=float(timeout) if timeout else defaults.timeout,
+        consistency_level=os.getenv(prefix + "CONSISTENCY", defaults.consistency_level)
+    )
+
+def _env_bool(name: str) -> Optional[bool]:
+    value = os.getenv(name)
+    return None if not value else value.lower() in ("1", "true", "yes", "on")
+
+def get_deployment_config() -> CollectionDeploymentConfig:
+    """Read MILVUS_SHARDS_NUM, _MMAP_VECTORS, _MMAP_SCALARS, _REPLICAS and _RESOURCE_GROUPS."""
+    shards = os.getenv("MILVUS_SHARDS_NUM")
+    replicas = os.getenv("MILVUS_REPLICAS")
+    groups = os.getenv("MILVUS_RESOURCE_GROUPS")
+    return CollectionDeploymentConfig(
+        shards_num=int(shards) if shards else None,
+        mmap_vectors=_env_bool("MILVUS_MMAP_VECTORS"),
+        mmap_scalars=_env_bool("MILVUS_MMAP_SCALARS"),
+        replica_number=int(replicas) if replicas else None,
+        resource_groups=[g.strip() for g in groups.split(",") if g.strip()] if groups else None
+    )
+
+def get_read_consistency(prefix: str, default_level: str = "Bounded") -> ReadConsistency:
+    """Read <PREFIX>CONSISTENCY and <PREFIX>STALENESS_SECONDS, e.g. RAG_CONSISTENCY."""
+    staleness = os.getenv(prefix + "STALENESS_SECONDS")
+    return ReadConsistency(
+        level=os.getenv(prefix + "CONSISTENCY", default_level),
+        staleness_seconds=float(staleness) if staleness else None
+    )
+
+def get_chunking_config() -> ChunkingConfig:
+    """Read CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS and CHUNK_MIN_TOKENS."""
+    defaults = ChunkingConfig()
+    return ChunkingConfig(
+        max_tokens=int(os.getenv("CHUNK_MAX_TOKENS", defaults.max_tokens)),
+        overlap_tokens=int(os.getenv("CHUNK_OVERLAP_TOKENS", defaults.overlap_tokens)),
+        min_tokens=int(os.getenv("CHUNK_MIN_TOKENS", defaults.min_tokens))
+    )
+
+def get_bulk_storage_config() -> BulkStorageConfig:
+    """Read MILVUS_BULK_BUCKET, _ENDPOINT, _ACCESS_KEY, _SECRET_KEY, _SECURE and _PATH."""
+    return BulkStorageConfig(
+        bucket=os.getenv("MILVUS_BULK_BUCKET"),
+        endpoint=os.getenv("MILVUS_BULK_ENDPOINT"),
+        access_key=os.getenv("MILVUS_BULK_ACCESS_KEY"),
+        secret_key=os.getenv("MILVUS_BULK_SECRET_KEY"),
+        secure=bool(_env_bool("MILVUS_BULK_SECURE")),
+        remote_path=os.getenv("MILVUS_BULK_PATH", "bulk")
     )
 
 def get_embedding_config() -> EmbeddingConfig:
@@ -26,4 +150,4 @@ def get_embedding_config() -> EmbeddingConfig:
         provider=os.getenv("EMBEDDING_PROVIDER", "huggingface"),
         hf_model=os.getenv("HF_EMBEDDING_MODEL"),
         ollama_model=os.getenv("OLLAMA_EMBEDDING_MODEL")
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,149 @@
+"""Binary on-disk store of embedded chunks: a float32 vector matrix plus columnar metadata."""
+
+import os
+import json
+import shutil
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+from .exceptions import EmbeddingError
+
+DEFAULT_EMBEDDINGS_PATH = "./data/embeddings"
+LEGACY_EMBEDDINGS_JSON = "./data/embeddings.json"
+STORE_FORMAT = 1
+
+VECTORS_FILE = "vectors.npy"
+META_FILE = "meta.npy"
+STRINGS_FILE = "strings.bin"
+INFO_FILE = "info.json"
+
+# One record per row. text and the row's other fields (as JSON) are UTF-8 slices of strings.bin
+META_DTYPE = np.dtype([
+    ("id", "<i8"),
+    ("checksum", "S32"),
+    ("text_offset", "<i8"),
+    ("text_length", "<i4"),
+    ("extra_offset", "<i8"),
+    ("extra_length", "<i4"),
+])
+
+# Fields with their own column; any others are kept in each row's extra JSON
+_COLUMN_FIELDS = ("id", "vector", "checksum", "text")
+
+def write_embeddings(rows: Sequence[Dict[str, Any]], path: str = DEFAULT_EMBEDDINGS_PATH) -> None:
+    """Write embedded rows to a store directory, replacing any previous store.
+
+    Each row needs id and vector, and usually has text and an MD5 checksum of the
+    text; other fields such as source are kept too. Vectors go to a float32 .npy
+    matrix and metadata to a structured .npy array. The store is built in a
+    temporary directory and swapped in, so readers never see a partial one.
+    """
+    dim = len(rows[0]["vector"]) if rows else 0
+    tmp_path = path.rstrip("/\\") + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    try:
+        vectors = np.lib.format.open_memmap(os.path.join(tmp_path, VECTORS_FILE), mode="w+", dtype=np.float32,
+                                            shape=(len(rows), dim))
+        meta = np.zeros(len(rows), dtype=META_DTYPE)
+        offset = 0
+        with open(os.path.join(tmp_path, STRINGS_FILE), "wb") as strings:
+            for i, row in enumerate(rows):
+                if len(row["vector"]) != dim:
+                    raise EmbeddingError(f"Row {row['id']} has a {len(row['vector'])}-d vector, expected {dim}")
+                vectors[i] = row["vector"]
+                text = (row.get("text") or "").encode("utf-8")
+                extra = {k: v for k, v in row.items() if k not in _COLUMN_FIELDS}
+                extra_bytes = json.dumps(extra, ensure_ascii=False).encode("utf-8") if extra else b""
+                meta[i] = (row["id"], (row.get("checksum") or "").encode("ascii"),
+                           offset, len(text), offset + len(text), len(extra_bytes))
+                strings.write(text)
+                strings.write(extra_bytes)
+                offset += len(text) + len(extra_bytes)
+        vectors.flush()
+        del vectors
+        np.save(os.path.join(tmp_path, META_FILE), meta)
+        with open(os.path.join(tmp_path, INFO_FILE), "w", encoding="utf-8") as f:
+            json.dump({"format": STORE_FORMAT, "rows": len(rows), "dim": dim}, f)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    # Keep the previous store until the new one is in place
+    old_path = path.rstrip("/\\") + ".old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    print(f"Saved {len(rows)} embeddings to {path}")
+
+class EmbeddingStore:
+    """Read-only view of an embeddings store, memory-mapped rather than loaded.
+
+    vectors is an (n, dim) float32 array backed by the file, so slicing it or
+    passing rows to Milvus does not copy the whole matrix into memory.
+    """
+
+    def __init__(self, path: str = DEFAULT_EMBEDDINGS_PATH):
+        self.path = path
+        try:
+            with open(os.path.join(path, INFO_FILE), encoding="utf-8") as f:
+                info = json.load(f)
+            self.vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+            self.meta = np.load(os.path.join(path, META_FILE), mmap_mode="r")
+            self._strings = np.memmap(os.path.join(path, STRINGS_FILE), dtype=np.uint8, mode="r") \
+                if os.path.getsize(os.path.join(path, STRINGS_FILE)) else np.zeros(0, dtype=np.uint8)
+        except (OSError, ValueError) as e:
+            raise EmbeddingError(f"Cannot read embeddings store at {path}: {e}")
+        if info.get("format") != STORE_FORMAT:
+            raise EmbeddingError(f"Unsupported embeddings store format {info.get('format')} at {path}")
+
+    def __len__(self) -> int:
+        return len(self.meta)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.meta["id"]
+
+    def checksums(self) -> Dict[int, str]:
+        """Checksum of each row by id."""
+        return dict(zip(self.meta["id"].tolist(), (c.decode("ascii") for c in self.meta["checksum"])))
+
+    def _slice(self, offset: int, length: int) -> str:
+        return self._strings[offset:offset + length].tobytes().decode("utf-8")
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Row as written, with its vector as a view into the memory-mapped matrix."""
+        record = self.meta[index]
+        row = {"id": int(record["id"]), "vector": self.vectors[index],
+               "text": self._slice(record["text_offset"], record["text_length"])}
+        if record["checksum"]:
+            row["checksum"] = record["checksum"].decode("ascii")
+        if record["extra_length"]:
+            row.update(json.loads(self._slice(record["extra_offset"], record["extra_length"])))
+        return row
+
+    def rows(self, indices: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Rows at the given indices, or all rows, one at a time."""
+        for index in range(len(self)) if indices is None else indices:
+            yield self.row(index)
+
+def has_embeddings(path: str = DEFAULT_EMBEDDINGS_PATH) -> bool:
+    """Whether a complete store exists at path."""
+    return os.path.exists(os.path.join(path, INFO_FILE))
+
+def convert_embeddings_json(json_path: str = LEGACY_EMBEDDINGS_JSON,
+                            path: str = DEFAULT_EMBEDDINGS_PATH) -> EmbeddingStore:
+    """One-time conversion of a legacy embeddings.json file into a store directory."""
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            rows: List[Dict[str, Any]] = json.load(f)
+    except (OSError, ValueError) as e:
+        raise EmbeddingError(f"Cannot read embeddings file {json_path}: {e}")
+    write_embeddings(rows, path)
+    return EmbeddingStore(path)
@@ -2,13 +2,16 @@
 
 import os
 import torch
-from typing import Optional, Union, List
+from typing import Dict, Optional, Union, List
 from sentence_transformers import SentenceTransformer
 import ollama
 from .config import get_embedding_config
 from .exceptions import EmbeddingError
 
 class EmbeddingProvider:
+    # Loaded SentenceTransformer models by name, so batched calls do not reload them
+    _hf_models: Dict[str, SentenceTransformer] = {}
+
     @staticmethod
     def embed_text(text: Union[str, List[str]], provider: str = 'huggingface', model: Optional[str] = None):
         """Unified embedding method supporting multiple providers."""
@@ -26,7 +29,9 @@ class EmbeddingProvider:
         if not _model:
             raise EmbeddingError("HF_EMBEDDING_MODEL environment variable not set")
         
-        st = SentenceTransformer(_model)
+        st = EmbeddingProvider._hf_models.get(_model)
+        if st is None:
+            st = EmbeddingProvider._hf_models[_model] = SentenceTransformer(_model)
         text_input = [text] if isinstance(text, str) else text
         embeddings = st.encode(text_input, batch_size=256, show_progress_bar=True)
         return embeddings[0].tolist() if isinstance(text, str) else embeddings.tolist()
@@ -14,4 +14,8 @@ class CollectionError(Exception):
 
 class EmbeddingError(Exception):
     """Raised when embedding operations fail."""
-    pass
\ No newline at end of file
+    pass
+
+class UnsupportedFeatureError(Exception):
+    """Raised when the connected Milvus deployment lacks a required feature."""
+    pass
@@ -0,0 +1,126 @@
+"""Streaming export of collection data."""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import numpy as np
+from pymilvus import DataType, MilvusException
+from .client import get_reader_client
+from .exceptions import CollectionError
+
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+
+# NumPy dtypes of dense vector fields; other fields are exported as lists.
+# NumPy has no bfloat16, so BFLOAT16 vectors are widened to float32, which is exact
+VECTOR_DTYPES = {DataType.FLOAT_VECTOR: np.float32, DataType.FLOAT16_VECTOR: np.float16,
+                 DataType.BFLOAT16_VECTOR: np.float32, DataType.INT8_VECTOR: np.int8}
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+def print_progress(exported: int, total: Optional[int]) -> None:
+    """Progress callback that prints exported rows, with a percentage when the total is known."""
+    if total:
+        print(f"Exported {exported}/{total} rows ({100 * exported / total:.0f}%)")
+    else:
+        print(f"Exported {exported} rows")
+
+# Column holding each row's dynamic fields when "*" is exported, as named by bulk import files
+DYNAMIC_FIELD = "$meta"
+
+def _decode_vector(value: Any, field_type: DataType) -> Any:
+    # FLOAT16, BFLOAT16 and INT8 vectors come back from query as raw bytes, sometimes wrapped in a list
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], bytes):
+        value = value[0]
+    if not isinstance(value, bytes):
+        return value
+    if field_type == DataType.BFLOAT16_VECTOR:
+        # bfloat16 is the upper half of a float32
+        return (np.frombuffer(value, dtype="<u2").astype(np.uint32) << 16).view(np.float32)
+    return np.frombuffer(value, dtype=VECTOR_DTYPES[field_type])
+
+def _to_columns(rows: List[Dict[str, Any]], fields: List[str], vector_fields: Dict[str, DataType],
+                dynamic: bool = False) -> Dict[str, Any]:
+    columns: Dict[str, Any] = {}
+    for name in fields:
+        if name in vector_fields:
+            field_type = vector_fields[name]
+            columns[name] = np.asarray([_decode_vector(row.get(name), field_type) for row in rows],
+                                       dtype=VECTOR_DTYPES[field_type])
+        else:
+            columns[name] = [row.get(name) for row in rows]
+    if dynamic:
+        known = set(fields)
+        columns[DYNAMIC_FIELD] = [{k: v for k, v in row.items() if k not in known} for row in rows]
+    return columns
+
+def iter_collection(collection_name: str, output_fields: Optional[List[str]] = None, filter: str = "",
+                    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE, progress: Optional[ProgressCallback] = None,
+                    client=None) -> Iterator[Dict[str, Any]]:
+    """Stream every matching row of a collection as column batches.
+
+    Reads with query_iterator, so there is no row limit and memory is bounded by
+    batch_size. Each batch maps field name to a list of values, or to a 2-D NumPy
+    array for dense vector fields.
+
+    Args:
+        output_fields: Fields to export (dynamic fields allowed). Defaults to all schema fields;
+                       ["*"] exports them all plus a "$meta" column of dynamic field dicts.
+        progress: Called as progress(exported_rows, total_rows) after each batch; total_rows
+                  is the collection row count, or None when a filter is set.
+        client: Client to read with. Defaults to the reader pool; pass the writer client
+                when the export must see that client's own recent writes.
+    """
+    client = client or get_reader_client()
+    try:
+        description = client.describe_collection(collection_name=collection_name)
+        schema_fields = {field["name"]: field for field in description["fields"]}
+        dynamic = output_fields is not None and "*" in output_fields
+        fields = list(schema_fields) if dynamic else list(output_fields or schema_fields)
+        vector_fields = {name: schema_fields[name]["type"] for name in fields
+                         if name in schema_fields and schema_fields[name]["type"] in VECTOR_DTYPES}
+        total = None
+        if not filter:
+            total = int(client.get_collection_stats(collection_name=collection_name).get("row_count", 0))
+
+        iterator = client.query_iterator(collection_name=collection_name, batch_size=batch_size,
+                                         filter=filter, output_fields=["*"] if dynamic else fields)
+    except MilvusException as e:
+        raise CollectionError(f"Failed to export collection '{collection_name}': {e}")
+
+    exported = 0
+    try:
+        while True:
+            try:
+                rows = iterator.next()
+            except MilvusException as e:
+                raise CollectionError(f"Failed to export collection '{collection_name}': {e}")
+            if not rows:
+                break
+            exported += len(rows)
+            if progress:
+                progress(exported, total)
+            yield _to_columns(rows, fields, vector_fields, dynamic)
+    finally:
+        iterator.close()
+
+def export_columns(collection_name: str, output_fields: Optional[List[str]] = None, filter: str = "",
+                   batch_size: int = DEFAULT_EXPORT_BATCH_SIZE, progress: Optional[ProgressCallback] = None,
+                   client=None) -> Dict[str, Any]:
+    """Export matching rows into a single column dict, vectors stacked into one array."""
+    batches = list(iter_collection(collection_name, output_fields, filter, batch_size, progress, client))
+    if not batches:
+        return {}
+    columns: Dict[str, Any] = {}
+    for name, first in batches[0].items():
+        if isinstance(first, np.ndarray):
+            columns[name] = np.concatenate([batch[name] for batch in batches])
+        else:
+            columns[name] = [value for batch in batches for value in batch[name]]
+    return columns
+
+def export_field_map(collection_name: str, value_field: str, key_field: str = "id", filter: str = "",
+                     batch_size: int = DEFAULT_EXPORT_BATCH_SIZE, progress: Optional[ProgressCallback] = None,
+                     client=None) -> Dict[Any, Any]:
+    """Map key_field to value_field for every matching row, e.g. id -> checksum for sync diffs."""
+    result: Dict[Any, Any] = {}
+    for batch in iter_collection(collection_name, [key_field, value_field], filter, batch_size, progress, client):
+        result.update(zip(batch[key_field], batch[value_field]))
+    return result
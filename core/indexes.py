@@ -0,0 +1,388 @@
+"""Index management for Milvus collections."""
+
+import os
+import re
+import json
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+from pymilvus import DataType, MilvusException
+from .client import get_client, is_milvus_lite, resolve_index_type
+from .exceptions import CollectionError
+
+# Default scalar index per field type: inverted for text and arrays, sorted for numbers, bitmap for booleans
+DEFAULT_SCALAR_INDEX = {
+    DataType.VARCHAR: "INVERTED",
+    DataType.ARRAY: "INVERTED",
+    DataType.BOOL: "BITMAP",
+    DataType.INT8: "STL_SORT",
+    DataType.INT16: "STL_SORT",
+    DataType.INT32: "STL_SORT",
+    DataType.INT64: "STL_SORT",
+    DataType.FLOAT: "STL_SORT",
+    DataType.DOUBLE: "STL_SORT",
+}
+
+# Milvus Lite only implements inverted scalar indexes
+LITE_SCALAR_INDEX_TYPES = {"INVERTED"}
+
+# Field names followed by a comparison, membership or pattern operator in a filter expression
+_FILTER_FIELD = re.compile(r"\b([A-Za-z_]\w*)\s*(?:==|!=|>=|<=|>|<|\bnot\s+in\b|\bin\b|\blike\b)", re.IGNORECASE)
+_FILTER_KEYWORDS = {"and", "or", "not", "in", "like"}
+
+# Vector index candidates in order of preference: best recall and latency first, smallest memory last
+VECTOR_INDEX_CANDIDATES = ["HNSW", "IVF_FLAT", "IVF_SQ8", "DISKANN", "IVF_PQ"]
+LITE_VECTOR_INDEX_CANDIDATES = ["IVF_FLAT"]
+
+# Exact search is fast enough below this many rows
+FLAT_MAX_ROWS = 10_000
+
+# Rough cost model used to rank candidates, not a benchmark:
+# nanoseconds per vector dimension compared, and SSD time per DiskANN query
+DISTANCE_NS_PER_DIM = 0.25
+DISKANN_IO_MS = 5.0
+
+HNSW_EF_CONSTRUCTION = 200
+HNSW_SEARCH_EF = 64
+IVF_SEARCH_NPROBE = 16
+DISKANN_SEARCH_LIST = 100
+
+DEFAULT_INDEX_AUDIT_PATH = "./data/index_decisions.jsonl"
+
+# Index build states reported by describe_index
+INDEX_FINISHED = "Finished"
+INDEX_FAILED = "Failed"
+DEFAULT_INDEX_TIMEOUT = 3600.0
+INDEX_POLL_SECONDS = 2.0
+
+def _fields_by_name(client, collection_name: str) -> Dict[str, Dict[str, Any]]:
+    description = client.describe_collection(collection_name=collection_name)
+    return {field["name"]: field for field in description["fields"]}
+
+def _indexed_fields(client, collection_name: str) -> Dict[str, str]:
+    """Map each indexed field to its index type."""
+    indexed = {}
+    for index_name in client.list_indexes(collection_name=collection_name):
+        info = client.describe_index(collection_name=collection_name, index_name=index_name)
+        indexed[info.get("field_name", index_name)] = info.get("index_type", "")
+    return indexed
+
+def default_scalar_index_type(datatype: DataType) -> Optional[str]:
+    """Pick the scalar index type for a field type, or None if it cannot be indexed directly."""
+    index_type = DEFAULT_SCALAR_INDEX.get(datatype)
+    if index_type and is_milvus_lite() and index_type not in LITE_SCALAR_INDEX_TYPES:
+        return "INVERTED"
+    return index_type
+
+def create_scalar_indexes(collection_name: str, fields: Dict[str, Optional[str]]) -> List[str]:
+    """Build scalar indexes on filter fields, skipping fields that are already indexed.
+
+    Args:
+        fields: Field name to index type ("INVERTED", "BITMAP", "STL_SORT", "TRIE"),
+            or None to pick the default for the field's type.
+
+    Returns:
+        Names of the fields that were indexed.
+    """
+    try:
+        client = get_client()
+        schema_fields = _fields_by_name(client, collection_name)
+        indexed = _indexed_fields(client, collection_name)
+
+        index_params = client.prepare_index_params()
+        created = []
+        for field_name, index_type in fields.items():
+            if field_name in indexed:
+                continue
+            if field_name not in schema_fields:
+                raise CollectionError(f"Cannot index '{field_name}': not a schema field of '{collection_name}'")
+            index_type = index_type or default_scalar_index_type(schema_fields[field_name]["type"])
+            if not index_type:
+                raise CollectionError(f"No scalar index type for field '{field_name}' in '{collection_name}'")
+            index_params.add_index(field_name=field_name, index_type=index_type, index_name=field_name)
+            created.append(field_name)
+
+        if created:
+            client.create_index(collection_name=collection_name, index_params=index_params)
+            print(f"Scalar indexes created on {collection_name}: {', '.join(created)}")
+        return created
+    except MilvusException as e:
+        raise CollectionError(f"Failed to create scalar indexes on '{collection_name}': {e}")
+
+def index_progress(collection_name: str, index_name: str) -> Dict[str, Any]:
+    """Report an index's build state with indexed, pending and total row counts."""
+    try:
+        info = get_client().describe_index(collection_name=collection_name, index_name=index_name)
+    except MilvusException as e:
+        raise CollectionError(f"Failed to describe index '{index_name}' of '{collection_name}': {e}")
+    return {
+        "index_name": index_name,
+        "state": info.get("state", ""),
+        "indexed_rows": int(info.get("indexed_rows", 0)),
+        "total_rows": int(info.get("total_rows", 0)),
+        "pending_index_rows": int(info.get("pending_index_rows", 0)),
+        "fail_reason": info.get("index_state_fail_reason", ""),
+    }
+
+def print_index_progress(progress: Dict[str, Any]) -> None:
+    """Progress callback that prints indexed rows out of total rows."""
+    total = progress["total_rows"]
+    percent = f" ({100 * progress['indexed_rows'] / total:.0f}%)" if total else ""
+    print(f"Index '{progress['index_name']}': {progress['indexed_rows']}/{total} rows{percent}, {progress['state']}")
+
+def wait_for_index(collection_name: str, index_name: str, timeout: float = DEFAULT_INDEX_TIMEOUT,
+                   poll_interval: float = INDEX_POLL_SECONDS,
+                   progress: Optional[Callable[[Dict[str, Any]], None]] = print_index_progress) -> Dict[str, Any]:
+    """Poll an index until every row is indexed, reporting progress when it changes.
+
+    Raises:
+        CollectionError: If the build fails or does not finish within timeout seconds.
+    """
+    deadline = time.time() + timeout
+    last = None
+    while True:
+        current = index_progress(collection_name, index_name)
+        snapshot = (current["state"], current["indexed_rows"], current["total_rows"])
+        if progress and snapshot != last:
+            progress(current)
+            last = snapshot
+        if current["state"] == INDEX_FAILED:
+            raise CollectionError(f"Index '{index_name}' of '{collection_name}' failed: {current['fail_reason']}")
+        if current["state"] == INDEX_FINISHED and current["pending_index_rows"] == 0:
+            return current
+        if time.time() >= deadline:
+            raise CollectionError(f"Index '{index_name}' of '{collection_name}' not ready after {timeout:.0f}s "
+                                  f"({current['indexed_rows']}/{current['total_rows']} rows indexed)")
+        time.sleep(poll_interval)
+
+def create_index_and_wait(collection_name: str, index_params, load: bool = True,
+                          timeout: float = DEFAULT_INDEX_TIMEOUT, poll_interval: float = INDEX_POLL_SECONDS,
+                          progress: Optional[Callable[[Dict[str, Any]], None]] = print_index_progress) -> List[Dict[str, Any]]:
+    """Start index builds, wait until all are complete, then load the collection.
+
+    Loading only after the build finishes keeps searches off partially built indexes,
+    whose segments would otherwise be searched by brute force.
+
+    Returns:
+        The final progress of each index.
+    """
+    from .collections import load_collection
+
+    try:
+        get_client().create_index(collection_name=collection_name, index_params=index_params, sync=False)
+    except MilvusException as e:
+        raise CollectionError(f"Failed to create index on '{collection_name}': {e}")
+    deadline = time.time() + timeout
+    finished = [wait_for_index(collection_name, param.index_name or param.field_name,
+                               max(deadline - time.time(), 0), poll_interval, progress)
+                for param in index_params]
+    if load:
+        load_collection(collection_name)
+    return finished
+
+def filter_fields(expr: str) -> List[str]:
+    """Extract the field names a filter expression compares, in order of appearance."""
+    names = []
+    for match in _FILTER_FIELD.finditer(expr):
+        name = match.group(1)
+        if name.lower() not in _FILTER_KEYWORDS and name not in names:
+            names.append(name)
+    return names
+
+def suggest_scalar_indexes(collection_name: str, filters: List[str]) -> List[Dict[str, Any]]:
+    """Report filter expressions that scan fields without a scalar index.
+
+    Primary keys are always indexed by Milvus. Fields stored in the dynamic field are
+    reported too, since they must become schema fields before they can be indexed.
+
+    Returns:
+        One entry per (filter, field) that would benefit, with a suggested index_type.
+    """
+    try:
+        client = get_client()
+        schema_fields = _fields_by_name(client, collection_name)
+        indexed = _indexed_fields(client, collection_name)
+    except MilvusException as e:
+        raise CollectionError(f"Failed to inspect indexes of '{collection_name}': {e}")
+
+    suggestions = []
+    for expr in filters:
+        for field_name in filter_fields(expr):
+            field = schema_fields.get(field_name)
+            if field is not None and (field.get("is_primary") or field_name in indexed):
+                continue
+            if field is None:
+                suggestions.append({"filter": expr, "field": field_name, "index_type": None,
+                                    "reason": "dynamic field; add it to the schema to index it"})
+            else:
+                suggestions.append({"filter": expr, "field": field_name,
+                                    "index_type": default_scalar_index_type(field["type"]),
+                                    "reason": "no scalar index"})
+    return suggestions
+
+def _ivf_nlist(row_count: int) -> int:
+    return int(min(max(4 * math.sqrt(row_count), 64), 65536))
+
+def _pq_m(dimension: int) -> int:
+    """Largest divisor of dimension up to dimension / 4 (about 2 bits per dimension at nbits=8)."""
+    for m in range(max(1, dimension // 4), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+def _index_profile(index_type: str, row_count: int, dimension: int) -> Dict[str, Any]:
+    """Build params, search params, estimated memory (bytes) and latency (ms) of one index type."""
+    raw = row_count * dimension * 4
+    scan_ms = row_count * dimension * DISTANCE_NS_PER_DIM / 1e6
+    if index_type == "FLAT":
+        return {"params": {}, "search_params": {}, "memory": raw, "latency_ms": scan_ms}
+    if index_type == "HNSW":
+        m = 16 if dimension <= 512 else 32
+        # A search visits about ef candidates and compares each with its M neighbours
+        return {"params": {"M": m, "efConstruction": HNSW_EF_CONSTRUCTION},
+                "search_params": {"ef": HNSW_SEARCH_EF},
+                "memory": raw + row_count * m * 2 * 8,
+                "latency_ms": HNSW_SEARCH_EF * m * dimension * DISTANCE_NS_PER_DIM / 1e6}
+    if index_type == "DISKANN":
+        # Only PQ codes stay in memory; full vectors and the graph live on local SSD
+        return {"params": {}, "search_params": {"search_list": DISKANN_SEARCH_LIST},
+                "memory": raw // 8, "latency_ms": DISKANN_IO_MS}
+
+    nlist = _ivf_nlist(row_count)
+    nprobe = min(IVF_SEARCH_NPROBE, nlist)
+    scanned = row_count * nprobe / nlist
+    centroid_ms = nlist * dimension * DISTANCE_NS_PER_DIM / 1e6
+    profile = {"params": {"nlist": nlist}, "search_params": {"nprobe": nprobe}}
+    if index_type == "IVF_FLAT":
+        return {**profile, "memory": raw, "latency_ms": centroid_ms + scanned * dimension * DISTANCE_NS_PER_DIM / 1e6}
+    if index_type == "IVF_SQ8":
+        return {**profile, "memory": raw // 4, "latency_ms": centroid_ms + scanned * dimension * DISTANCE_NS_PER_DIM / 1e6}
+    if index_type == "IVF_PQ":
+        m = _pq_m(dimension)
+        return {"params": {"nlist": nlist, "m": m, "nbits": 8}, "search_params": {"nprobe": nprobe},
+                "memory": row_count * m + nlist * dimension * 4,
+                "latency_ms": centroid_ms + scanned * m * DISTANCE_NS_PER_DIM / 1e6}
+    raise CollectionError(f"Unsupported vector index type: {index_type}")
+
+def choose_vector_index(row_count: int, dimension: int, memory_budget_bytes: Optional[int] = None,
+                        latency_target_ms: Optional[float] = None, metric_type: str = "COSINE") -> Dict[str, Any]:
+    """Choose a vector index type and its parameters for a collection.
+
+    Below FLAT_MAX_ROWS rows exact search wins. Otherwise the first candidate in
+    VECTOR_INDEX_CANDIDATES whose estimated memory fits the budget and whose estimated
+    latency meets the target is chosen. If none qualifies, the fastest index within the
+    budget is used, or the smallest one if nothing fits. Milvus Lite only builds FLAT
+    and IVF_FLAT.
+
+    Returns:
+        Decision with index_type, params, search_params, metric_type, the estimates,
+        the inputs and a human-readable reason.
+    """
+    inputs = {"row_count": row_count, "dimension": dimension, "memory_budget_bytes": memory_budget_bytes,
+              "latency_target_ms": latency_target_ms}
+
+    def decide(index_type: str, profile: Dict[str, Any], reason: str) -> Dict[str, Any]:
+        resolved = resolve_index_type(index_type)
+        if resolved != index_type:
+            profile = _index_profile(resolved, row_count, dimension)
+            reason += f"; {index_type} is not built by this deployment, using {resolved}"
+            index_type = resolved
+        return {"index_type": index_type, "params": profile["params"], "search_params": profile["search_params"],
+                "metric_type": metric_type, "estimated_memory_bytes": int(profile["memory"]),
+                "estimated_latency_ms": round(profile["latency_ms"], 3), "inputs": inputs, "reason": reason}
+
+    flat = _index_profile("FLAT", row_count, dimension)
+    if row_count <= FLAT_MAX_ROWS:
+        return decide("FLAT", flat, f"{row_count} rows <= {FLAT_MAX_ROWS}: exact search is fast enough")
+
+    candidates = LITE_VECTOR_INDEX_CANDIDATES if is_milvus_lite() else VECTOR_INDEX_CANDIDATES
+    profiles = {index_type: _index_profile(index_type, row_count, dimension) for index_type in candidates}
+    rejected = []
+    for index_type, profile in profiles.items():
+        if memory_budget_bytes is not None and profile["memory"] > memory_budget_bytes:
+            rejected.append(f"{index_type} needs ~{profile['memory'] / 2**20:.0f} MB")
+            continue
+        if latency_target_ms is not None and profile["latency_ms"] > latency_target_ms:
+            rejected.append(f"{index_type} ~{profile['latency_ms']:.1f} ms")
+            continue
+        reason = "first candidate within budget and latency target"
+        return decide(index_type, profile, reason + (f" (rejected: {'; '.join(rejected)})" if rejected else ""))
+
+    fitting = [name for name, profile in profiles.items()
+               if memory_budget_bytes is None or profile["memory"] <= memory_budget_bytes]
+    if fitting:
+        index_type = min(fitting, key=lambda name: profiles[name]["latency_ms"])
+        fallback = "using the fastest index within budget"
+    else:
+        index_type = min(profiles, key=lambda name: profiles[name]["memory"])
+        fallback = "using the smallest index"
+    return decide(index_type, profiles[index_type],
+                  f"no candidate meets all constraints ({'; '.join(rejected)}); {fallback}")
+
+def record_index_decision(collection_name: str, decision: Dict[str, Any],
+                          path: str = DEFAULT_INDEX_AUDIT_PATH) -> None:
+    """Append an index decision to a JSON lines audit log."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    entry = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "collection": collection_name, **decision}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+def build_vector_index(collection_name: str, field_name: str = "vector", metric_type: str = "COSINE",
+                       memory_budget_bytes: Optional[int] = None, latency_target_ms: Optional[float] = None,
+                       index_type: Optional[str] = None, audit_path: Optional[str] = DEFAULT_INDEX_AUDIT_PATH,
+                       timeout: float = DEFAULT_INDEX_TIMEOUT) -> Dict[str, Any]:
+    """Choose and build the vector index of a collection, replacing a different existing one.
+
+    The choice uses the collection's row count and vector dimension (see choose_vector_index);
+    index_type forces a type but still derives its parameters. The collection is loaded
+    once the build completes. The decision, with the "action" taken (created, replaced
+    or unchanged), is appended to audit_path.
+    """
+    try:
+        client = get_client()
+        field = _fields_by_name(client, collection_name).get(field_name)
+        if field is None:
+            raise CollectionError(f"Cannot index '{field_name}': not a schema field of '{collection_name}'")
+        dimension = int(field.get("params", {}).get("dim", 0))
+        row_count = int(client.get_collection_stats(collection_name=collection_name).get("row_count", 0))
+
+        decision = choose_vector_index(row_count, dimension, memory_budget_bytes, latency_target_ms, metric_type)
+        if index_type:
+            # Milvus Lite accepts any type but only builds some; build what it will actually use
+            resolved = resolve_index_type(index_type)
+            reason = "index type set explicitly"
+            if resolved != index_type.upper():
+                reason += f" ({index_type.upper()} is not built by this deployment, using {resolved})"
+            profile = _index_profile(resolved, row_count, dimension)
+            decision.update(index_type=resolved, params=profile["params"], search_params=profile["search_params"],
+                            estimated_memory_bytes=int(profile["memory"]),
+                            estimated_latency_ms=round(profile["latency_ms"], 3), reason=reason)
+
+        existing = client.list_indexes(collection_name=collection_name, field_name=field_name)
+        action = "created"
+        if existing:
+            current = client.describe_index(collection_name=collection_name, index_name=existing[0])
+            # describe_index flattens build params into the result; Milvus Lite omits them
+            current_params = {k: v for k, v in current.items() if k in decision["params"]}
+            if (current.get("index_type") == decision["index_type"] and current.get("metric_type") == metric_type
+                    and all(str(v) == str(decision["params"][k]) for k, v in current_params.items())):
+                action = "unchanged"
+            else:
+                client.release_collection(collection_name=collection_name)
+                client.drop_index(collection_name=collection_name, index_name=existing[0])
+                action = "replaced"
+
+        if action != "unchanged":
+            index_params = client.prepare_index_params()
+            index_params.add_index(field_name=field_name, index_type=decision["index_type"], index_name=field_name,
+                                   metric_type=metric_type, params=decision["params"])
+            create_index_and_wait(collection_name, index_params, timeout=timeout)
+        decision["action"] = action
+        print(f"Vector index on {collection_name}.{field_name}: {decision['index_type']} {decision['params']} "
+              f"({action}; {decision['reason']})")
+    except MilvusException as e:
+        raise CollectionError(f"Failed to build vector index on '{collection_name}': {e}")
+
+    if audit_path:
+        record_index_decision(collection_name, decision, audit_path)
+    return decision
@@ -0,0 +1,104 @@
+"""Post-ingest flush and compaction for Milvus collections."""
+
+import time
+from typing import Any, Dict
+from pymilvus import MilvusException
+from .client import get_writer_client, supports_feature
+from .exceptions import CollectionError
+
+# Compact when a collection has more segments than this, or when this share of stored rows is deleted
+DEFAULT_MAX_SEGMENTS = 16
+DEFAULT_MAX_DELETE_RATIO = 0.1
+DEFAULT_COMPACTION_TIMEOUT = 1800.0
+COMPACTION_POLL_SECONDS = 2.0
+
+# Compaction job state reported by Milvus once all of its plans are done
+COMPACTION_COMPLETED = "Completed"
+
+def segment_stats(collection_name: str) -> Dict[str, Any]:
+    """Count sealed segments and the share of stored rows that are deleted.
+
+    Segment row counts still include deleted rows until compaction rewrites them, so
+    the delete ratio compares them with a strongly consistent count(*). Milvus Lite has
+    no segment API; segments and delete_ratio are None there.
+    """
+    try:
+        client = get_writer_client()
+        res = client.query(collection_name=collection_name, filter="", output_fields=["count(*)"],
+                           consistency_level="Strong")
+        live_rows = int(res[0]["count(*)"]) if res else 0
+        if not supports_feature("compaction"):
+            return {"segments": None, "stored_rows": None, "live_rows": live_rows, "delete_ratio": None}
+        segments = client.list_persistent_segments(collection_name=collection_name)
+    except MilvusException as e:
+        raise CollectionError(f"Failed to read segments of '{collection_name}': {e}")
+    stored_rows = sum(segment.num_rows for segment in segments)
+    return {
+        "segments": len(segments),
+        "stored_rows": stored_rows,
+        "live_rows": live_rows,
+        "delete_ratio": max(0.0, 1 - live_rows / stored_rows) if stored_rows else 0.0,
+    }
+
+def wait_for_compaction(job_id: int, timeout: float = DEFAULT_COMPACTION_TIMEOUT,
+                        poll_interval: float = COMPACTION_POLL_SECONDS) -> None:
+    """Poll a compaction job until all its plans are done."""
+    deadline = time.time() + timeout
+    client = get_writer_client()
+    while True:
+        try:
+            state = client.get_compaction_state(job_id=job_id)
+        except MilvusException as e:
+            raise CollectionError(f"Failed to read state of compaction job {job_id}: {e}")
+        if state == COMPACTION_COMPLETED:
+            return
+        if time.time() >= deadline:
+            raise CollectionError(f"Compaction job {job_id} not completed after {timeout:.0f}s (state {state})")
+        time.sleep(poll_interval)
+
+def maintain_collection(collection_name: str, max_segments: int = DEFAULT_MAX_SEGMENTS,
+                        max_delete_ratio: float = DEFAULT_MAX_DELETE_RATIO, force: bool = False,
+                        timeout: float = DEFAULT_COMPACTION_TIMEOUT,
+                        poll_interval: float = COMPACTION_POLL_SECONDS) -> Dict[str, Any]:
+    """Flush a collection after ingestion and compact it when it is fragmented.
+
+    Compaction merges small segments and purges deleted rows, which both slow searches
+    down. It runs when the segment count exceeds max_segments, the delete ratio exceeds
+    max_delete_ratio, or force is set, and this call waits until it completes.
+
+    Returns:
+        Dict with "before" and "after" segment_stats, whether it "compacted", the
+        "reasons" and the elapsed "seconds".
+    """
+    start = time.time()
+    try:
+        get_writer_client().flush(collection_name=collection_name)
+    except MilvusException as e:
+        raise CollectionError(f"Failed to flush '{collection_name}': {e}")
+
+    before = segment_stats(collection_name)
+    reasons = []
+    if force:
+        reasons.append("forced")
+    if before["segments"] is not None and before["segments"] > max_segments:
+        reasons.append(f"{before['segments']} segments > {max_segments}")
+    if before["delete_ratio"] is not None and before["delete_ratio"] > max_delete_ratio:
+        reasons.append(f"{before['delete_ratio']:.0%} deleted > {max_delete_ratio:.0%}")
+
+    compacted = False
+    if reasons and not supports_feature("compaction"):
+        print(f"Skipping compaction of '{collection_name}': not supported on Milvus Lite")
+    elif reasons:
+        print(f"Compacting '{collection_name}': {'; '.join(reasons)}")
+        try:
+            job_id = get_writer_client().compact(collection_name=collection_name)
+        except MilvusException as e:
+            raise CollectionError(f"Failed to compact '{collection_name}': {e}")
+        wait_for_compaction(job_id, timeout, poll_interval)
+        compacted = True
+
+    after = segment_stats(collection_name) if compacted else before
+    print(f"Maintenance of '{collection_name}': segments {before['segments']} -> {after['segments']}, "
+          f"{after['live_rows']} rows ({time.time() - start:.1f}s)")
+    return {"before": before, "after": after, "compacted": compacted, "reasons": reasons,
+            "seconds": time.time() - start}
@@ -0,0 +1,135 @@
+"""File manifests for incremental document ingestion."""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass, field
+from glob import glob
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+from .exceptions import CollectionError
+
+DEFAULT_MANIFEST_DIR = "./data/manifests"
+
+@dataclass
+class ManifestDiff:
+    """Files under the manifest root, by what happened to them since the last run."""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def to_process(self) -> List[str]:
+        """Files that must be read, chunked and embedded."""
+        return self.added + self.changed
+
+    def __str__(self) -> str:
+        return (f"{len(self.added)} added, {len(self.changed)} changed, "
+                f"{len(self.removed)} removed, {len(self.unchanged)} unchanged")
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class IngestManifest:
+    """Size, mtime and content hash of every ingested file, mapped to its chunk ids.
+
+    Files are keyed by their path relative to root. A file whose size and mtime are
+    unchanged is not read at all; one whose stat changed is hashed, and only counts
+    as changed when its content did.
+    """
+
+    def __init__(self, collection_name: str, root: str, path: Optional[str] = None,
+                 params: Optional[Dict[str, Any]] = None):
+        self.collection_name = collection_name
+        self.root = root
+        self.params = params or {}
+        self.path = path or os.path.join(DEFAULT_MANIFEST_DIR, f"{collection_name}.json")
+        self.files: Dict[str, Dict[str, Any]] = {}
+        # Stat and hash of each file as seen by the last diff(), recorded by apply()
+        self._scanned: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, collection_name: str, root: str, path: Optional[str] = None,
+             params: Optional[Dict[str, Any]] = None) -> "IngestManifest":
+        """Load the saved manifest, or start an empty one if it is missing or was built differently.
+
+        params describe how files were turned into chunks, such as chunk size limits.
+        A manifest saved with other root or params is discarded, since its chunk ids
+        no longer match what the files would produce.
+        """
+        manifest = cls(collection_name, root, path, params)
+        try:
+            with open(manifest.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError) as e:
+            raise CollectionError(f"Cannot read ingest manifest {manifest.path}: {e}")
+        if (saved.get("collection_name") == collection_name and saved.get("root") == root
+                and saved.get("params", {}) == manifest.params):
+            manifest.files = saved.get("files", {})
+        return manifest
+
+    def diff(self, pattern: str = "**/*.md") -> ManifestDiff:
+        """Compare the files under root with the manifest."""
+        result = ManifestDiff()
+        self._scanned = {}
+        for file_path in sorted(glob(os.path.join(self.root, pattern), recursive=True)):
+            source = Path(os.path.relpath(file_path, self.root)).as_posix()
+            stat = os.stat(file_path)
+            scanned = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            entry = self.files.get(source)
+            if entry and entry["size"] == scanned["size"] and entry["mtime_ns"] == scanned["mtime_ns"]:
+                result.unchanged.append(source)
+                continue
+            scanned["sha256"] = _file_hash(file_path)
+            if entry is None:
+                result.added.append(source)
+            elif entry["sha256"] != scanned["sha256"]:
+                result.changed.append(source)
+            else:
+                # Touched but identical: remember the new stat so the next run skips hashing it
+                entry.update(scanned)
+                result.unchanged.append(source)
+                continue
+            self._scanned[source] = scanned
+        seen = set(result.added) | set(result.changed) | set(result.unchanged)
+        result.removed = sorted(source for source in self.files if source not in seen)
+        return result
+
+    def chunk_ids(self, sources: Iterable[str]) -> Set[int]:
+        """Chunk ids currently recorded for the given files."""
+        return {chunk_id for source in sources for chunk_id in self.files.get(source, {}).get("chunk_ids", [])}
+
+    def apply(self, file_chunk_ids: Dict[str, List[int]], removed: Iterable[str] = ()) -> Set[int]:
+        """Record the chunk ids of processed files and forget removed ones.
+
+        Files are recorded with the stat and hash seen by diff(), so a file edited
+        while it was being processed is picked up again on the next run.
+
+        Returns:
+            Ids recorded before for these files that they no longer produce; delete
+            them from the collection.
+        """
+        removed = list(removed)
+        previous = self.chunk_ids(list(file_chunk_ids) + removed)
+        current = {chunk_id for ids in file_chunk_ids.values() for chunk_id in ids}
+        for source, ids in file_chunk_ids.items():
+            self.files[source] = {**self._scanned[source], "chunk_ids": sorted(set(ids))}
+        for source in removed:
+            self.files.pop(source, None)
+        return previous - current
+
+    def save(self) -> None:
+        """Write the manifest atomically, so an interrupted run keeps the previous one."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"collection_name": self.collection_name, "root": self.root, "params": self.params,
+                       "files": self.files}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,89 @@
+"""Concurrent reading and chunking of document files, streamed to the embedding stage."""
+
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from .chunking import Chunk, TokenCounter, chunk_markdown, token_counter
+from .config import ChunkingConfig, get_chunking_config
+
+# Threads reading files, and processes parsing and chunking them
+DEFAULT_READ_WORKERS = 8
+DEFAULT_PARSE_WORKERS = 4
+
+# Files read or chunked ahead of the consumer; bounds memory regardless of corpus size
+DEFAULT_PREFETCH_FILES = 32
+
+# Token counter and limits of a parse process, set by _init_parser
+_parser: Optional[Tuple[TokenCounter, ChunkingConfig]] = None
+
+def _init_parser(provider: str, config: ChunkingConfig) -> None:
+    global _parser
+    _parser = (token_counter(provider), config)
+
+def _parse(text: str) -> List[Chunk]:
+    count_tokens, config = _parser
+    return chunk_markdown(text, count_tokens=count_tokens, config=config)
+
+def _read(path: str, errors: str) -> str:
+    with open(path, "r", encoding="utf-8", errors=errors) as f:
+        return f.read()
+
+def iter_file_chunks(root: str, sources: Iterable[str], provider: str = "huggingface",
+                     config: Optional[ChunkingConfig] = None, read_workers: int = DEFAULT_READ_WORKERS,
+                     parse_workers: Optional[int] = None, prefetch: int = DEFAULT_PREFETCH_FILES,
+                     errors: str = "strict") -> Iterator[Tuple[str, List[Chunk]]]:
+    """Read and chunk files concurrently, yielding (source, chunks) per file in order.
+
+    Threads read the files and hand their text to a pool of processes that parse and
+    chunk it with chunk_markdown, so reading and chunking overlap with whatever the
+    consumer does with the chunks, such as embedding them. At most prefetch files are
+    in flight at once.
+
+    Args:
+        root: Directory the sources are relative to.
+        provider: Embedding provider whose tokenizer measures chunks (see token_counter).
+            Each parse process loads its own.
+        parse_workers: Parse processes. 0 chunks in the reading threads instead, which
+            avoids process start-up for a handful of files. Defaults to
+            DEFAULT_PARSE_WORKERS, leaving one CPU for the consumer.
+        errors: How undecodable bytes are handled, as in open().
+
+    Parse processes are spawned, so they re-import the caller's main script: keep
+    work such as creating Milvus clients out of its module level.
+    """
+    sources = list(sources)
+    if not sources:
+        return
+    config = config or get_chunking_config()
+    if parse_workers is None:
+        parse_workers = min(DEFAULT_PARSE_WORKERS, (os.cpu_count() or 1) - 1)
+
+    parse_pool = None
+    if parse_workers > 0:
+        # Spawned, not forked: the caller may already hold gRPC channels and their threads
+        parse_pool = ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_init_parser, initargs=(provider, config))
+        parse = lambda text: parse_pool.submit(_parse, text).result()
+    else:
+        count_tokens = token_counter(provider)
+        parse = lambda text: chunk_markdown(text, count_tokens=count_tokens, config=config)
+
+    read_pool = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="doc-reader")
+    pending = deque()
+    try:
+        for source in sources:
+            if len(pending) >= prefetch:
+                done_source, future = pending.popleft()
+                yield done_source, future.result()
+            path = os.path.join(root, source)
+            pending.append((source, read_pool.submit(lambda p=path: parse(_read(p, errors)))))
+        while pending:
+            done_source, future = pending.popleft()
+            yield done_source, future.result()
+    finally:
+        # A consumer that stops early, or fails, leaves queued files unread
+        read_pool.shutdown(wait=True, cancel_futures=True)
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=True, cancel_futures=True)
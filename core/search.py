@@ -0,0 +1,294 @@
+"""Search helpers for Milvus collections."""
+
+import os
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from pymilvus import AnnSearchRequest, MilvusException, RRFRanker, mkts_from_unixtime
+from .client import get_reader_client
+from .collections import get_collection_manager
+from .config import ReadConsistency
+from .exceptions import CollectionError
+from .sparse import SPARSE_FIELD, encode_sparse_queries, load_bm25
+
+# Query vectors per search request; Milvus rejects requests above 16384
+DEFAULT_MAX_NQ = 1024
+
+# Reciprocal rank fusion constant; 60 is the value from the original RRF paper
+DEFAULT_RRF_K = 60
+
+# Search parameters written by core.tuning, keyed by collection name
+DEFAULT_SEARCH_PARAMS_PATH = "./data/search_params.json"
+_tuned_cache: Dict[str, Any] = {}
+
+# Seconds a collection's vector index type is trusted before describe_index is asked again
+INDEX_TYPE_CACHE_SECONDS = 60
+_index_types: Dict[str, Tuple[float, Optional[str]]] = {}
+
+# Levels a search can request per call; Session only helps the client that wrote
+CONSISTENCY_LEVELS = ("Strong", "Session", "Bounded", "Eventually")
+
+class QueryHits:
+    """Hits of one query: ids and distances as NumPy arrays, output fields as lists."""
+    __slots__ = ("ids", "distances", "fields")
+
+    def __init__(self, ids: np.ndarray, distances: np.ndarray, fields: Dict[str, List[Any]]):
+        self.ids = ids
+        self.distances = distances
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Hits in the {"id", "distance", "entity"} form returned by MilvusClient.search."""
+        return [{"id": self.ids[i].item(), "distance": float(self.distances[i]),
+                 "entity": {name: values[i] for name, values in self.fields.items()}}
+                for i in range(len(self.ids))]
+
+class SearchResults:
+    """Results of a batched search, stored as (queries, limit) arrays.
+
+    Rows shorter than limit are padded with id -1 and distance NaN; counts holds
+    the real number of hits per query, and results[i] returns them as QueryHits.
+    """
+    __slots__ = ("ids", "distances", "counts", "fields")
+
+    def __init__(self, num_queries: int, limit: int, output_fields: Sequence[str]):
+        self.ids = np.full((num_queries, limit), -1, dtype=np.int64)
+        self.distances = np.full((num_queries, limit), np.nan, dtype=np.float32)
+        self.counts = np.zeros(num_queries, dtype=np.int32)
+        self.fields = {name: np.full((num_queries, limit), None, dtype=object) for name in output_fields}
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __getitem__(self, query: int) -> QueryHits:
+        n = self.counts[query]
+        return QueryHits(self.ids[query, :n], self.distances[query, :n],
+                         {name: values[query, :n].tolist() for name, values in self.fields.items()})
+
+    def _fill(self, offset: int, results) -> None:
+        for q, hits in enumerate(results, start=offset):
+            self.counts[q] = len(hits)
+            for k, hit in enumerate(hits):
+                self.ids[q, k] = hit["id"]
+                self.distances[q, k] = hit["distance"]
+                entity = hit.get("entity", {})
+                for name, values in self.fields.items():
+                    values[q, k] = entity.get(name)
+
+def _search_params_path() -> str:
+    return os.getenv("MILVUS_SEARCH_PARAMS_PATH", DEFAULT_SEARCH_PARAMS_PATH)
+
+def load_tuned_search_params(collection_name: str, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return the tuned {"metric_type", "params"} of a collection, or None if it was never tuned.
+
+    The file is re-read only when it changes, so this is cheap to call before every search.
+    """
+    path = path or _search_params_path()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if _tuned_cache.get("key") != key:
+        with open(path, "r", encoding="utf-8") as f:
+            _tuned_cache.update(key=key, settings=json.load(f))
+    setting = _tuned_cache["settings"].get(collection_name)
+    if not setting:
+        return None
+    # A setting tuned for another index, e.g. ef after a rebuild to IVF_FLAT, does not apply
+    index_type = _vector_index_type(collection_name)
+    if setting.get("index_type") != index_type:
+        warned = _tuned_cache.setdefault("warned", set())
+        if (collection_name, index_type) not in warned:
+            warned.add((collection_name, index_type))
+            print(f"WARNING: Tuned search params of '{collection_name}' are for {setting.get('index_type')}, "
+                  f"the index is {index_type}; re-run core/utils/tune_search.py")
+        return None
+    return {"metric_type": setting["metric_type"], "params": dict(setting["params"])}
+
+def _vector_index_type(collection_name: str, field_name: str = "vector") -> Optional[str]:
+    """Index type on a collection's vector field, cached for INDEX_TYPE_CACHE_SECONDS."""
+    cached = _index_types.get(collection_name)
+    if cached and time.monotonic() - cached[0] < INDEX_TYPE_CACHE_SECONDS:
+        return cached[1]
+    client = get_reader_client()
+    try:
+        indexes = client.list_indexes(collection_name=collection_name, field_name=field_name)
+        index_type = (client.describe_index(collection_name=collection_name, index_name=indexes[0])
+                      .get("index_type", "").upper() if indexes else None)
+    except MilvusException:
+        index_type = None
+    _index_types[collection_name] = (time.monotonic(), index_type)
+    return index_type
+
+def save_tuned_search_params(collection_name: str, setting: Dict[str, Any], path: Optional[str] = None) -> None:
+    """Store a collection's tuned search setting, keeping the other collections' settings."""
+    path = path or _search_params_path()
+    settings: Dict[str, Any] = {}
+    if os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as f:
+            settings = json.load(f)
+    settings[collection_name] = setting
+    _index_types.pop(collection_name, None)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2)
+    os.replace(tmp_path, path)
+
+def consistency_options(consistency: Union[str, ReadConsistency, None]) -> Dict[str, Any]:
+    """Keyword arguments that apply a per-call consistency to a search.
+
+    None keeps the reader client default (Bounded unless MILVUS_READER_CONSISTENCY is
+    set). A staleness bound or guarantee timestamp is sent as a Customized level, so
+    the search only waits for writes older than that point.
+    """
+    if consistency is None:
+        return {}
+    if isinstance(consistency, str):
+        consistency = ReadConsistency(level=consistency)
+    if consistency.level not in CONSISTENCY_LEVELS:
+        raise CollectionError(f"Unknown consistency level '{consistency.level}'; expected one of {CONSISTENCY_LEVELS}")
+    if consistency.guarantee_timestamp is None and consistency.staleness_seconds is None:
+        return {"consistency_level": consistency.level}
+    if consistency.level in ("Strong", "Eventually"):
+        raise CollectionError(f"{consistency.level} consistency does not take a staleness bound or guarantee timestamp")
+    timestamp = consistency.guarantee_timestamp
+    if timestamp is None:
+        # Relies on client and server clocks agreeing to well within the bound
+        timestamp = mkts_from_unixtime(time.time() - consistency.staleness_seconds)
+    return {"consistency_level": "Customized", "guarantee_timestamp": timestamp}
+
+def build_filter(field: str, values: Union[str, int, Sequence[Union[str, int]], None]) -> str:
+    """Build an equality or membership filter on one field.
+
+    `field == v` and `field in [...]` are the forms Milvus can route by partition key,
+    so filters on the partition key field only touch the matching partitions.
+    """
+    if values is None:
+        return ""
+    if isinstance(values, (str, int)):
+        return f"{field} == {json.dumps(values)}"
+    values = list(values)
+    if len(values) == 1:
+        return f"{field} == {json.dumps(values[0])}"
+    return f"{field} in {json.dumps(values)}"
+
+def search_by_subject(collection_name: str, vector: List[float],
+                      subjects: Union[str, Sequence[str], None], limit: int = 10,
+                      output_fields: Optional[List[str]] = None, search_params: Optional[Dict[str, Any]] = None,
+                      subject_field: str = "subject", extra_filter: str = "",
+                      consistency: Union[str, ReadConsistency, None] = None) -> List[Dict[str, Any]]:
+    """Search one vector, restricted to the given subjects.
+
+    On collections created with partition_key_field=subject_field, the subject filter
+    is pushed down to partition pruning, so latency depends on the matching
+    subjects rather than the whole collection.
+    """
+    expr = build_filter(subject_field, subjects)
+    if extra_filter:
+        expr = f"({expr}) and ({extra_filter})" if expr else extra_filter
+
+    try:
+        get_collection_manager().ensure_loaded(collection_name)
+        client = get_reader_client()
+        results = client.search(
+            collection_name=collection_name,
+            data=[vector],
+            filter=expr,
+            limit=limit,
+            output_fields=output_fields,
+            search_params=search_params or load_tuned_search_params(collection_name) or {},
+            **consistency_options(consistency)
+        )
+        return list(results[0]) if results else []
+    except MilvusException as e:
+        raise CollectionError(f"Failed to search collection '{collection_name}': {e}")
+
+def search_batch(collection_name: str, vectors, limit: int = 10, output_fields: Optional[List[str]] = None,
+                 filter: str = "", search_params: Optional[Dict[str, Any]] = None,
+                 anns_field: Optional[str] = None, max_nq: int = DEFAULT_MAX_NQ,
+                 consistency: Union[str, ReadConsistency, None] = None) -> SearchResults:
+    """Search many query vectors with one request per max_nq vectors.
+
+    Args:
+        vectors: Query vectors as a 2-D array or a list of vectors.
+        search_params: Defaults to the setting saved by core.tuning, if the collection was tuned.
+        max_nq: Query vectors sent per request.
+        consistency: Level name or ReadConsistency; defaults to the reader client's level.
+
+    Returns:
+        SearchResults with ids and distances as (queries, limit) arrays.
+    """
+    queries = np.asarray(vectors, dtype=np.float32)
+    if queries.ndim == 1:
+        queries = queries[np.newaxis, :]
+    results = SearchResults(len(queries), limit, output_fields or [])
+
+    try:
+        get_collection_manager().ensure_loaded(collection_name)
+        client = get_reader_client()
+        options: Dict[str, Any] = {"anns_field": anns_field} if anns_field else {}
+        options.update(consistency_options(consistency))
+        for offset in range(0, len(queries), max_nq):
+            batch = client.search(
+                collection_name=collection_name,
+                data=list(queries[offset:offset + max_nq]),
+                filter=filter,
+                limit=limit,
+                output_fields=output_fields,
+                search_params=search_params or load_tuned_search_params(collection_name) or {},
+                **options
+            )
+            results._fill(offset, batch)
+        return results
+    except MilvusException as e:
+        raise CollectionError(f"Failed to search collection '{collection_name}': {e}")
+
+def search_hybrid(collection_name: str, vectors, texts: List[str], limit: int = 10,
+                  output_fields: Optional[List[str]] = None, filter: str = "", bm25=None,
+                  dense_params: Optional[Dict[str, Any]] = None, sparse_params: Optional[Dict[str, Any]] = None,
+                  candidate_limit: Optional[int] = None, rrf_k: int = DEFAULT_RRF_K,
+                  anns_field: str = "vector", sparse_field: str = SPARSE_FIELD,
+                  consistency: Union[str, ReadConsistency, None] = None) -> SearchResults:
+    """Search dense vectors and BM25 sparse vectors together, fused by reciprocal rank.
+
+    Dense embeddings miss exact terms such as API names; the BM25 side matches them, so
+    a smaller limit keeps the same recall. Requires a collection created with sparse_field.
+
+    Args:
+        vectors: Dense query vectors, one per text.
+        texts: Query texts, encoded with BM25 statistics saved by core.sparse.fit_bm25.
+        bm25: Fitted BM25 function; loaded from the default path if omitted.
+        dense_params: Defaults to the setting saved by core.tuning, if the collection was tuned.
+        candidate_limit: Hits fetched from each side before fusion (default 2 * limit).
+        consistency: Level name or ReadConsistency; defaults to the reader client's level.
+    """
+    queries = np.asarray(vectors, dtype=np.float32)
+    if queries.ndim == 1:
+        queries = queries[np.newaxis, :]
+    if len(queries) != len(texts):
+        raise CollectionError(f"search_hybrid got {len(queries)} vectors for {len(texts)} texts")
+    sparse_queries = encode_sparse_queries(bm25 or load_bm25(), texts)
+    candidates = candidate_limit or 2 * limit
+    results = SearchResults(len(queries), limit, output_fields or [])
+
+    try:
+        get_collection_manager().ensure_loaded(collection_name)
+        client = get_reader_client()
+        requests = [
+            AnnSearchRequest(data=list(queries), anns_field=anns_field, param=dense_params or load_tuned_search_params(collection_name) or {},
+                             limit=candidates, expr=filter or None),
+            AnnSearchRequest(data=sparse_queries, anns_field=sparse_field, param=sparse_params or {},
+                             limit=candidates, expr=filter or None),
+        ]
+        hits = client.hybrid_search(collection_name=collection_name, reqs=requests, ranker=RRFRanker(rrf_k),
+                                    limit=limit, output_fields=output_fields, **consistency_options(consistency))
+        results._fill(0, hits)
+        return results
+    except MilvusException as e:
+        raise CollectionError(f"Failed to search collection '{collection_name}': {e}")
@@ -0,0 +1,241 @@
+"""Collection snapshots on local disk: schema, index definitions and all rows."""
+
+import os
+import json
+import time
+import shutil
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pymilvus import CollectionSchema, DataType, MilvusException
+from .client import get_client, supports_feature
+from .collections import (RestBulkImporter, _index_build_params, get_collection_manager, has_collection,
+                          insert_data, load_collection, upload_bulk_files, wait_for_import, DEFAULT_BATCH_SIZE)
+from .config import get_bulk_storage_config
+from .exceptions import CollectionError
+from .export import DEFAULT_EXPORT_BATCH_SIZE, DYNAMIC_FIELD, ProgressCallback, iter_collection, print_progress
+from .indexes import create_index_and_wait, DEFAULT_INDEX_TIMEOUT
+
+DEFAULT_SNAPSHOT_DIR = "./data/snapshots"
+SNAPSHOT_MANIFEST = "manifest.json"
+
+# Rows per Parquet file; each exported batch becomes one row group
+DEFAULT_ROWS_PER_FILE = 100_000
+
+def _arrow_type(field: Dict[str, Any]):
+    """Parquet column type of a schema field, in the layout Milvus bulk import reads."""
+    import pyarrow as pa
+
+    scalar_types = {
+        DataType.BOOL: pa.bool_(), DataType.INT8: pa.int8(), DataType.INT16: pa.int16(),
+        DataType.INT32: pa.int32(), DataType.INT64: pa.int64(), DataType.FLOAT: pa.float32(),
+        DataType.DOUBLE: pa.float64(), DataType.VARCHAR: pa.string(), DataType.JSON: pa.string(),
+    }
+    datatype = DataType(field["type"])
+    if datatype in scalar_types:
+        return scalar_types[datatype]
+    if datatype == DataType.FLOAT_VECTOR:
+        return pa.list_(pa.float32())
+    if datatype == DataType.SPARSE_FLOAT_VECTOR:
+        return pa.struct([("indices", pa.list_(pa.uint32())), ("values", pa.list_(pa.float32()))])
+    if datatype == DataType.ARRAY:
+        return pa.list_(scalar_types[DataType(field["element_type"])])
+    raise CollectionError(f"Cannot snapshot field '{field['name']}': {datatype.name} is not supported")
+
+def _encode_column(field: Dict[str, Any], values) -> List[Any]:
+    datatype = DataType(field["type"])
+    if datatype == DataType.JSON:
+        return [None if v is None else json.dumps(v) for v in values]
+    if datatype == DataType.SPARSE_FLOAT_VECTOR:
+        return [{"indices": [int(i) for i in v], "values": [float(x) for x in v.values()]} for v in values]
+    if isinstance(values, np.ndarray):
+        return list(values)
+    return values
+
+def _decode_rows(rows: List[Dict[str, Any]], fields: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    json_fields = [f["name"] for f in fields if DataType(f["type"]) == DataType.JSON]
+    sparse_fields = [f["name"] for f in fields if DataType(f["type"]) == DataType.SPARSE_FLOAT_VECTOR]
+    for row in rows:
+        for name in json_fields:
+            if row.get(name) is not None:
+                row[name] = json.loads(row[name])
+        for name in sparse_fields:
+            row[name] = dict(zip(row[name]["indices"], row[name]["values"]))
+        meta = row.pop(DYNAMIC_FIELD, None)
+        if meta:
+            row.update(json.loads(meta))
+    return rows
+
+def _index_definitions(client, collection_name: str) -> List[Dict[str, Any]]:
+    definitions = []
+    for index_name in client.list_indexes(collection_name=collection_name):
+        info = client.describe_index(collection_name=collection_name, index_name=index_name)
+        definitions.append({
+            "index_name": info.get("index_name", index_name),
+            "field_name": info["field_name"],
+            "index_type": info.get("index_type", "AUTOINDEX"),
+            "metric_type": info.get("metric_type", ""),
+            "params": _index_build_params(info),
+        })
+    return definitions
+
+def snapshot_collection(collection_name: str, path: Optional[str] = None,
+                        batch_size: int = DEFAULT_EXPORT_BATCH_SIZE, rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+                        progress: Optional[ProgressCallback] = print_progress) -> Dict[str, Any]:
+    """Write a collection's schema, index definitions and every row, vectors included, to disk.
+
+    Rows are streamed with iter_collection into Parquet files that Milvus bulk import
+    reads directly, so memory stays bounded by batch_size. The snapshot is built in a
+    temporary directory and swapped in at the end, so an interrupted run never
+    replaces a good snapshot.
+
+    Args:
+        path: Snapshot directory. Defaults to ./data/snapshots/<collection_name>.
+
+    Returns:
+        The manifest written next to the files.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = path or os.path.join(DEFAULT_SNAPSHOT_DIR, collection_name)
+    tmp_path = path.rstrip("/\\") + ".tmp"
+    start = time.time()
+    try:
+        client = get_client()
+        description = client.describe_collection(collection_name=collection_name)
+        indexes = _index_definitions(client, collection_name)
+    except MilvusException as e:
+        raise CollectionError(f"Failed to describe collection '{collection_name}': {e}")
+    # Rows can only be queried from a loaded collection; this also reloads a released one
+    get_collection_manager().ensure_loaded(collection_name)
+
+    # Auto-generated primary keys cannot be imported, so they are regenerated on restore
+    fields = [f for f in description["fields"] if not (f.get("is_primary") and description.get("auto_id"))]
+    dynamic = bool(description.get("enable_dynamic_field"))
+    arrow_fields = [pa.field(f["name"], _arrow_type(f)) for f in fields]
+    if dynamic:
+        arrow_fields.append(pa.field(DYNAMIC_FIELD, pa.string()))
+    arrow_schema = pa.schema(arrow_fields)
+
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    files: List[str] = []
+    writer = None
+    rows_in_file = 0
+    total_rows = 0
+    try:
+        for batch in iter_collection(collection_name, ["*"] if dynamic else [f["name"] for f in fields],
+                                     batch_size=batch_size, progress=progress):
+            if writer is None or rows_in_file >= rows_per_file:
+                if writer is not None:
+                    writer.close()
+                files.append(f"part-{len(files):05d}.parquet")
+                writer = pq.ParquetWriter(os.path.join(tmp_path, files[-1]), arrow_schema)
+                rows_in_file = 0
+            columns = {f["name"]: _encode_column(f, batch[f["name"]]) for f in fields}
+            if dynamic:
+                columns[DYNAMIC_FIELD] = [json.dumps(meta) for meta in batch[DYNAMIC_FIELD]]
+            writer.write_table(pa.table(columns, schema=arrow_schema))
+            count = len(columns[fields[0]["name"]])
+            rows_in_file += count
+            total_rows += count
+    finally:
+        if writer is not None:
+            writer.close()
+
+    manifest = {
+        "collection_name": collection_name,
+        "schema": description,
+        "indexes": indexes,
+        "rows": total_rows,
+        "files": files,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    with open(os.path.join(tmp_path, SNAPSHOT_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    print(f"Snapshot of '{collection_name}': {total_rows} rows in {len(files)} file(s) at {path} "
+          f"({time.time() - start:.2f}s)")
+    return manifest
+
+def _insert_files(collection_name: str, path: str, manifest: Dict[str, Any], batch_size: int) -> int:
+    """Stream snapshot files into a collection with insert_data, one batch at a time."""
+    import pyarrow.parquet as pq
+
+    inserted = 0
+    for name in manifest["files"]:
+        for batch in pq.ParquetFile(os.path.join(path, name)).iter_batches(batch_size=batch_size):
+            rows = _decode_rows(batch.to_pylist(), manifest["schema"]["fields"])
+            inserted += insert_data(collection_name, rows, batch_size=batch_size)["insert_count"]
+    return inserted
+
+def restore_collection(path: str, collection_name: Optional[str] = None, drop_existing: bool = False,
+                       importer: Any = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                       poll_interval: float = 2.0, timeout: float = DEFAULT_INDEX_TIMEOUT) -> Dict[str, Any]:
+    """Recreate a collection from a snapshot without re-embedding anything.
+
+    The collection is created from the saved schema, filled by a bulk import job, then
+    indexed with the saved index definitions and loaded. Bulk import reads the files
+    from the server's object storage, so they are uploaded to the bucket configured by
+    MILVUS_BULK_* first (see upload_bulk_files). Without that storage, and on Milvus
+    Lite, which has no import service, the files are streamed in with insert_data.
+
+    Args:
+        collection_name: Restore under another name. Defaults to the snapshotted name.
+        importer: Object with submit(collection_name, files) and progress(job_id).
+
+    Returns:
+        Dict with collection_name, rows and elapsed seconds.
+    """
+    try:
+        with open(os.path.join(path, SNAPSHOT_MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise CollectionError(f"Cannot read snapshot at {path}: {e}")
+    collection_name = collection_name or manifest["collection_name"]
+    description = manifest["schema"]
+
+    start = time.time()
+    if has_collection(collection_name):
+        if not drop_existing:
+            raise CollectionError(f"Cannot restore into '{collection_name}': collection exists (pass drop_existing)")
+        get_client().drop_collection(collection_name=collection_name)
+
+    options: Dict[str, Any] = {}
+    if description.get("consistency_level_name"):
+        options["consistency_level"] = description["consistency_level_name"]
+    if any(field.get("is_partition_key") for field in description["fields"]):
+        options["num_partitions"] = description.get("num_partitions")
+    try:
+        get_client().create_collection(collection_name=collection_name,
+                                       schema=CollectionSchema.construct_from_dict(description), **options)
+    except MilvusException as e:
+        raise CollectionError(f"Failed to create collection '{collection_name}' from snapshot: {e}")
+
+    storage = get_bulk_storage_config()
+    if importer is None and not (supports_feature("bulk_import") and storage.configured):
+        if supports_feature("bulk_import"):
+            print("WARNING: MILVUS_BULK_BUCKET and MILVUS_BULK_ENDPOINT are not set, so the server cannot "
+                  "read the snapshot files. Inserting them instead.")
+        rows = _insert_files(collection_name, path, manifest, batch_size)
+    else:
+        importer = importer or RestBulkImporter()
+        files = [[os.path.join(path, name)] for name in manifest["files"]]
+        if storage.configured:
+            # Keys are <remote_path>/<snapshot directory>/<file>
+            files = upload_bulk_files(files, os.path.dirname(os.path.abspath(path)), storage)
+        job_id = importer.submit(collection_name, files)
+        rows = wait_for_import(importer, job_id, poll_interval=poll_interval)["imported_rows"]
+
+    # Indexing after the import builds each index once over sealed segments
+    client = get_client()
+    for definition in manifest["indexes"]:
+        index_params = client.prepare_index_params()
+        index_params.add_index(field_name=definition["field_name"], index_type=definition["index_type"],
+                               index_name=definition["index_name"], metric_type=definition["metric_type"],
+                               params=definition["params"])
+        create_index_and_wait(collection_name, index_params, load=False, timeout=timeout)
+    load_collection(collection_name)
+    print(f"Restored {rows} rows into '{collection_name}' from {path} in {time.time() - start:.2f}s")
+    return {"collection_name": collection_name, "rows": rows, "seconds": time.time() - start}
@@ -0,0 +1,54 @@
+"""Local BM25 sparse embeddings for hybrid search."""
+
+import os
+from typing import Any, Dict, List
+from .exceptions import EmbeddingError
+
+SPARSE_FIELD = "sparse_vector"
+DEFAULT_BM25_PATH = "./data/bm25_params.json"
+
+def _bm25_function(language: str):
+    from pymilvus.model.sparse import BM25EmbeddingFunction
+    from pymilvus.model.sparse.bm25.tokenizers import build_default_analyzer
+    return BM25EmbeddingFunction(build_default_analyzer(language=language))
+
+def fit_bm25(corpus: List[str], path: str = DEFAULT_BM25_PATH, language: str = "en"):
+    """Fit BM25 term statistics on the corpus and save them for query encoding."""
+    if not corpus:
+        raise EmbeddingError("Cannot fit BM25 on an empty corpus")
+    bm25 = _bm25_function(language)
+    bm25.fit(corpus)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    bm25.save(path)
+    return bm25
+
+def load_bm25(path: str = DEFAULT_BM25_PATH, language: str = "en"):
+    """Load BM25 statistics saved by fit_bm25."""
+    if not os.path.isfile(path):
+        raise EmbeddingError(f"BM25 parameters not found at {path}; load the collection with hybrid enabled first")
+    bm25 = _bm25_function(language)
+    bm25.load(path)
+    return bm25
+
+def _sparse_rows(matrix) -> List[Dict[int, float]]:
+    """Convert a scipy sparse matrix to one {dimension: weight} dict per row."""
+    matrix = matrix.tocsr()
+    rows = []
+    for i in range(matrix.shape[0]):
+        start, end = matrix.indptr[i], matrix.indptr[i + 1]
+        rows.append({int(k): float(v) for k, v in zip(matrix.indices[start:end], matrix.data[start:end])})
+    return rows
+
+def encode_sparse_documents(bm25, texts: List[str]) -> List[Dict[int, float]]:
+    return _sparse_rows(bm25.encode_documents(texts))
+
+def encode_sparse_queries(bm25, texts: List[str]) -> List[Dict[int, float]]:
+    return _sparse_rows(bm25.encode_queries(texts))
+
+def add_sparse_vectors(rows: List[Dict[str, Any]], bm25, text_field: str = "text",
+                       sparse_field: str = SPARSE_FIELD) -> List[Dict[str, Any]]:
+    """Add a BM25 sparse vector computed from text_field to each row, in place."""
+    vectors = encode_sparse_documents(bm25, [row[text_field] for row in rows])
+    for row, vector in zip(rows, vectors):
+        row[sparse_field] = vector
+    return rows
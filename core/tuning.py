@@ -0,0 +1,134 @@
+"""Recall-targeted tuning of search parameters."""
+
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pymilvus import MilvusException
+from .client import get_reader_client
+from .collections import get_collection_manager
+from .exceptions import CollectionError
+from .export import export_columns, iter_collection
+from .search import save_tuned_search_params, search_batch
+
+DEFAULT_TUNING_SAMPLE = 100
+DEFAULT_TARGET_RECALL = 0.95
+
+# Search parameter swept per index type, and its candidate values (smallest first)
+SWEEP_PARAMS = {
+    "HNSW": ("ef", [16, 32, 64, 128, 256, 512]),
+    "AUTOINDEX": ("ef", [16, 32, 64, 128, 256, 512]),
+    "IVF_FLAT": ("nprobe", [1, 2, 4, 8, 16, 32, 64, 128, 256]),
+    "IVF_SQ8": ("nprobe", [1, 2, 4, 8, 16, 32, 64, 128, 256]),
+    "IVF_PQ": ("nprobe", [1, 2, 4, 8, 16, 32, 64, 128, 256]),
+    "DISKANN": ("search_list", [16, 32, 64, 100, 150, 200, 300]),
+}
+
+def _similarity(queries: np.ndarray, vectors: np.ndarray, metric_type: str) -> np.ndarray:
+    """Scores where higher is closer, for COSINE, IP and L2."""
+    if metric_type == "COSINE":
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    scores = queries @ vectors.T
+    if metric_type == "L2":
+        scores = 2 * scores - (queries ** 2).sum(axis=1)[:, None] - (vectors ** 2).sum(axis=1)[None, :]
+    return scores
+
+def exact_top_k(collection_name: str, queries: np.ndarray, k: int, metric_type: str,
+                field_name: str = "vector", batch_size: int = 10_000) -> np.ndarray:
+    """Brute-force the ids of the k nearest rows for each query, streaming the collection.
+
+    Returns:
+        (queries, k) array of ids, closest first.
+    """
+    best_ids = np.empty((len(queries), 0), dtype=np.int64)
+    best_scores = np.empty((len(queries), 0), dtype=np.float32)
+    for batch in iter_collection(collection_name, ["id", field_name], batch_size=batch_size):
+        ids = np.concatenate([best_ids, np.broadcast_to(np.asarray(batch["id"], dtype=np.int64),
+                                                        (len(queries), len(batch["id"])))], axis=1)
+        scores = np.concatenate([best_scores, _similarity(queries, batch[field_name], metric_type)], axis=1)
+        keep = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        best_ids = np.take_along_axis(ids, keep, axis=1)
+        best_scores = np.take_along_axis(scores, keep, axis=1)
+    return best_ids
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """Mean fraction of the true top-k ids found in each result row (padding ids are -1)."""
+    k = truth.shape[1]
+    hits = [len(set(f[f >= 0].tolist()) & set(t.tolist())) for f, t in zip(found, truth)]
+    return float(np.mean(hits) / k) if hits else 0.0
+
+def sample_queries(collection_name: str, sample_size: int, field_name: str = "vector", seed: int = 0) -> np.ndarray:
+    """Pick stored vectors at random to use as queries."""
+    ids = export_columns(collection_name, ["id"]).get("id", [])
+    if not ids:
+        raise CollectionError(f"Cannot tune '{collection_name}': collection is empty")
+    chosen = np.random.default_rng(seed).choice(len(ids), size=min(sample_size, len(ids)), replace=False)
+    try:
+        rows = get_reader_client().get(collection_name=collection_name, ids=[ids[i] for i in chosen],
+                                       output_fields=[field_name])
+    except MilvusException as e:
+        raise CollectionError(f"Failed to sample queries from '{collection_name}': {e}")
+    return np.asarray([row[field_name] for row in rows], dtype=np.float32)
+
+def tune_search_params(collection_name: str, k: int = 10, target_recall: float = DEFAULT_TARGET_RECALL,
+                       sample_size: int = DEFAULT_TUNING_SAMPLE, query_vectors=None, field_name: str = "vector",
+                       values: Optional[List[int]] = None, path: Optional[str] = None, save: bool = True) -> Dict[str, Any]:
+    """Find the cheapest search parameter of the deployed index that meets target recall@k.
+
+    Ground truth is computed exactly with NumPy. Queries default to a random sample of
+    stored vectors; pass held-out query_vectors for a more realistic estimate. The
+    chosen setting is saved for the search helpers in core.search, which use it
+    whenever no search_params are passed.
+
+    Returns:
+        The setting (index_type, metric_type, params, recall, latency_ms, k, target_recall)
+        with the full "sweep" of measured values.
+    """
+    client = get_reader_client()
+    try:
+        indexes = client.list_indexes(collection_name=collection_name, field_name=field_name)
+        if not indexes:
+            raise CollectionError(f"Cannot tune '{collection_name}': no index on '{field_name}'")
+        index = client.describe_index(collection_name=collection_name, index_name=indexes[0])
+    except MilvusException as e:
+        raise CollectionError(f"Failed to inspect index of '{collection_name}': {e}")
+    index_type = index.get("index_type", "").upper()
+    metric_type = index.get("metric_type", "COSINE").upper()
+
+    get_collection_manager().ensure_loaded(collection_name)
+    queries = (np.asarray(query_vectors, dtype=np.float32) if query_vectors is not None
+               else sample_queries(collection_name, sample_size, field_name))
+    truth = exact_top_k(collection_name, queries, k, metric_type, field_name)
+
+    param_name, candidates = SWEEP_PARAMS.get(index_type, (None, [None]))
+    values = list(values or candidates)
+    if param_name == "ef":
+        values = sorted({max(value, k) for value in values})  # HNSW needs ef >= k
+    elif param_name == "nprobe" and "nlist" in index:
+        values = [value for value in values if value <= int(index["nlist"])] or [int(index["nlist"])]
+
+    sweep = []
+    for value in values:
+        params = {} if param_name is None else {param_name: value}
+        search_params = {"metric_type": metric_type, "params": params}
+        search_batch(collection_name, queries[:1], limit=k, search_params=search_params, anns_field=field_name)  # Warm-up
+        start = time.perf_counter()
+        res = search_batch(collection_name, queries, limit=k, search_params=search_params, anns_field=field_name)
+        latency_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        sweep.append({"params": params, "recall": recall_at_k(res.ids, truth), "latency_ms": round(latency_ms, 3)})
+        print(f"{index_type} {params or '(no parameters)'}: recall@{k}={sweep[-1]['recall']:.3f}, {latency_ms:.2f} ms/query")
+
+    # Cost grows with each swept parameter, so the smallest value meeting the target is the
+    # fastest; measured sub-millisecond latencies are too noisy to rank on their own
+    meeting = [entry for entry in sweep if entry["recall"] >= target_recall]
+    best = meeting[0] if meeting else max(sweep, key=lambda e: (e["recall"], -e["latency_ms"]))
+    if not meeting:
+        print(f"WARNING: No setting reached recall@{k} >= {target_recall}; using the highest recall")
+    setting = {"index_type": index_type, "metric_type": metric_type, "params": best["params"],
+               "recall": best["recall"], "latency_ms": best["latency_ms"], "k": k, "target_recall": target_recall,
+               "queries": len(queries), "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+    if save:
+        save_tuned_search_params(collection_name, setting, path)
+    print(f"Tuned {collection_name}: {index_type} {best['params']} "
+          f"(recall@{k}={best['recall']:.3f}, {best['latency_ms']:.2f} ms/query)")
+    return {**setting, "sweep": sweep}
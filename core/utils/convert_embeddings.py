@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+import argparse
+from dotenv import load_dotenv
+load_dotenv()
+
+from core.embedding_store import convert_embeddings_json, DEFAULT_EMBEDDINGS_PATH, LEGACY_EMBEDDINGS_JSON
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a legacy embeddings.json file to the binary embeddings store")
+    parser.add_argument("json_path", nargs="?", default=LEGACY_EMBEDDINGS_JSON)
+    parser.add_argument("--path", default=DEFAULT_EMBEDDINGS_PATH, help="Store directory")
+    args = parser.parse_args()
+    store = convert_embeddings_json(args.json_path, args.path)
+    print(f"{len(store)} rows of {store.dim}-d vectors; {args.json_path} can be deleted")
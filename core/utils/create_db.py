@@ -1,6 +1,13 @@
 #!/usr/bin/env python3
-import sys
-from core import create_database
+import argparse
+from core import create_database, reset_database
 if __name__ == "__main__":
-    name: str = sys.argv[1] if len(sys.argv) > 1 else None # type: ignore
-    create_database(name)
+    parser = argparse.ArgumentParser(description="Create or recreate a database")
+    parser.add_argument("name", nargs="?")
+    parser.add_argument("--truncate", action="store_true", help="Empty existing collections but keep their schemas and indexes")
+    parser.add_argument("--workers", type=int, default=8, help="Collections dropped or truncated at once")
+    args = parser.parse_args()
+    if args.truncate:
+        reset_database(args.name, args.workers)
+    else:
+        create_database(args.name, args.workers)
@@ -1,108 +1,28 @@
-import sys
-from pymilvus import MilvusClient, DataType
+import argparse
 from dotenv import load_dotenv
 load_dotenv()
 
-from core import get_client
-
-def create_index(_collection_name = "hello_world_collection"):
-    # Constants
-    COLLECTION_NAME: str = _collection_name
-    VECTOR_DIM: int = 5
-    MAX_TEXT_LENGTH: int = 65535
-    INDEX_NAME="vector"
-
-    # Optimized parameters for Docker Desktop
-    NLIST_PARAM: int = 64  # Reduced for smaller datasets
-    M_PARAM: int = 16      # HNSW connectivity
-    EF_CONSTRUCTION: int = 200  # Build quality
-    EF_SEARCH: int = 64    # Search quality vs speed
-
-    client: MilvusClient = get_client()
-
-    schema = MilvusClient.create_schema(
-        auto_id=False,
-        enable_dynamic_field=True,
-    )
-
-    schema.add_field(field_name="id", datatype=DataType.INT64, is_primary=True)
-    schema.add_field(field_name="vector", datatype=DataType.FLOAT_VECTOR, dim=VECTOR_DIM)
-    schema.add_field(field_name="text", datatype=DataType.VARCHAR, max_length=MAX_TEXT_LENGTH)
-    schema.add_field(field_name="metadata", datatype=DataType.JSON)
-
-    index_params = MilvusClient.prepare_index_params()
-
-    # Option 1: HNSW (Recommended for Docker Desktop)
-    index_params.add_index(
-        field_name="vector",
-        metric_type="COSINE",
-        index_type="HNSW",
-        index_name=INDEX_NAME,
-        params={
-            "M": M_PARAM,
-            "efConstruction": EF_CONSTRUCTION
-        }
+from core import build_vector_index
+
+def create_index(_collection_name = "hello_world_collection", memory_budget_mb=None, latency_target_ms=None, index_type=None,
+                 timeout=3600):
+    # Picks FLAT, IVF_FLAT, IVF_SQ8, IVF_PQ, HNSW or DISKANN from the collection's size, replacing a different index.
+    # The collection is only loaded once every row is indexed.
+    decision = build_vector_index(
+        _collection_name,
+        memory_budget_bytes=int(memory_budget_mb * 2**20) if memory_budget_mb else None,
+        latency_target_ms=latency_target_ms,
+        index_type=index_type,
+        timeout=timeout
     )
-
-    # Option 2: IVF_FLAT (Uncomment to use instead)
-    # index_params.add_index(
-    #     field_name="vector",
-    #     metric_type="COSINE",
-    #     index_type="IVF_FLAT",
-    #     index_name=INDEX_NAME,
-    #     params={"nlist": NLIST_PARAM}
-    # )
-
-    # Option 3: FLAT (For very small datasets < 10k vectors)
-    # index_params.add_index(
-    #     field_name="vector",
-    #     metric_type="COSINE",
-    #     index_type="FLAT",
-    #     index_name=INDEX_NAME
-    # )
-
-    # Check if index already exists
-    try:
-        indexes = client.list_indexes(collection_name=COLLECTION_NAME)
-        if INDEX_NAME in indexes:
-            print(f"Index '{INDEX_NAME}' already exists on collection: {COLLECTION_NAME}")
-            response = input("Do you want to remove the existing index and create a new one? (y/n): ").lower().strip()
-            if response not in ['y', 'yes']:
-                print("Index creation cancelled.")
-                return
-    except Exception:
-        pass
-
-    # Unload (release) collection before dropping index
-    try:
-        client.release_collection(collection_name=COLLECTION_NAME)
-        print(f"Unloaded (released) collection: {COLLECTION_NAME}")
-    except Exception:
-        pass  # Collection might not be loaded
-
-    # Drop existing index if it exists
-    try:
-        client.drop_index(collection_name=COLLECTION_NAME, index_name=INDEX_NAME)
-        print(f"Dropped existing index '{INDEX_NAME}' on collection: {COLLECTION_NAME}")
-    except Exception:
-        pass  # Index might not exist
-
-    try:
-        client.create_index(
-            collection_name=COLLECTION_NAME,
-            index_params=index_params,
-            sync=False
-        )
-        print(f"Index created for collection: {COLLECTION_NAME}")
-        
-        # Reload collection after creating index
-        client.load_collection(collection_name=COLLECTION_NAME)
-        print(f"Reloaded collection: {COLLECTION_NAME}")
-        
-    except Exception as e:
-        print(f"Error creating index: {e}")
-        exit(1)
+    print(f"Search params for {decision['index_type']}: {decision['search_params']}")
 
 if __name__ == "__main__":
-    name: str = sys.argv[1] if len(sys.argv) > 1 else None # type: ignore
-    create_index(name)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Choose and build the vector index of a collection")
+    parser.add_argument("collection", nargs="?", default="hello_world_collection")
+    parser.add_argument("--budget-mb", type=float, help="Memory budget for the index")
+    parser.add_argument("--latency-ms", type=float, help="Target search latency")
+    parser.add_argument("--index-type", help="Force an index type (parameters are still derived)")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds to wait for the index build")
+    args = parser.parse_args()
+    create_index(args.collection, args.budget_mb, args.latency_ms, args.index_type, args.timeout)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+import argparse
+from dotenv import load_dotenv
+load_dotenv()
+
+from core import snapshot_collection, restore_collection
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save a collection to local Parquet files or restore it")
+    commands = parser.add_subparsers(dest="command", required=True)
+    save = commands.add_parser("save", help="Snapshot a collection, vectors included")
+    save.add_argument("collection")
+    save.add_argument("--path", help="Snapshot directory (default ./data/snapshots/<collection>)")
+    restore = commands.add_parser("restore", help="Recreate a collection from a snapshot")
+    restore.add_argument("path")
+    restore.add_argument("--collection", help="Restore under another name")
+    restore.add_argument("--drop-existing", action="store_true", help="Replace an existing collection")
+    args = parser.parse_args()
+    if args.command == "save":
+        snapshot_collection(args.collection, args.path)
+    else:
+        restore_collection(args.path, args.collection, drop_existing=args.drop_existing)
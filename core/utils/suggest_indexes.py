@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+import sys
+from core import suggest_scalar_indexes
+if __name__ == "__main__":
+    collection: str = sys.argv[1] if len(sys.argv) > 1 else None # type: ignore
+    for suggestion in suggest_scalar_indexes(collection, sys.argv[2:]):
+        print(f"{suggestion['field']}: {suggestion['index_type'] or '-'} ({suggestion['reason']}) <- {suggestion['filter']}")
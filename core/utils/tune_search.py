@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+import argparse
+from dotenv import load_dotenv
+load_dotenv()
+
+from core import tune_search_params
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune search parameters of a collection for a target recall@k")
+    parser.add_argument("collection")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--recall", type=float, default=0.95, help="Target recall@k")
+    parser.add_argument("--sample", type=int, default=100, help="Stored vectors used as queries")
+    args = parser.parse_args()
+    tune_search_params(args.collection, k=args.k, target_recall=args.recall, sample_size=args.sample)
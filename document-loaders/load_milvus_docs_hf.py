@@ -1,20 +1,26 @@
-# We load all markdown files from the folder milvus_docs/en/faq. For each document, we just simply use "# "
-# to separate the content in the file, which can roughly separate the content of each main part of the markdown file.
+# We load all markdown files from the folder milvus_docs/en. Each file is chunked by its markdown structure
+# (headings and code blocks) into chunks of at most CHUNK_MAX_TOKENS tokens, see core/chunking.py.
+import sys
 import time
 import os
-from glob import glob
+from dataclasses import asdict
 from typing import List, Dict, Any
 from tqdm import tqdm
 
 from dotenv import load_dotenv
 load_dotenv()
 
-from core import get_client, has_collection, EmbeddingProvider
+from core import (get_writer_client, has_collection, insert_data, upsert_data, bulk_load, make_chunk_id, maintain_collection,
+                  IngestManifest, EmbeddingProvider, get_chunking_config, iter_file_chunks)
 
 
 collection_name: str = os.getenv("HF_COLLECTION_NAME") or "demo_collection"
-
-client = get_client()
+docs_dir = "./document-loaders/milvus_docs/en"
+# Chunks embedded per model call while later files are still being read
+embed_batch_size = 256
+chunking = get_chunking_config()
+# Changing the chunking settings invalidates the manifest, so the next run rebuilds
+chunk_params = {"chunker": "markdown", **asdict(chunking)}
 
 def check_collection_and_confirm():
     """Check if collection exists and get user confirmation"""
@@ -34,6 +40,7 @@ def check_collection_and_confirm():
     return True
 
 def create_collection(embedding_dim=1024):
+    client = get_writer_client()
     if client.has_collection(collection_name):
         client.drop_collection(collection_name)
         print(f"Collection '{collection_name}' dropped successfully.")
@@ -46,34 +53,89 @@ def create_collection(embedding_dim=1024):
     )
     print(f"Collection '{collection_name}' created successfully.")
     
-def process() -> None:
-    # Check collection and get user confirmation
-    if not check_collection_and_confirm():
-        return
+def process(use_bulk_load: bool = False, full: bool = False) -> None:
+    # With a manifest from an earlier run, only added or changed files are embedded
+    manifest = IngestManifest.load(collection_name, docs_dir, params=chunk_params)
+    incremental = not full and bool(manifest.files) and has_collection(collection_name)
+    if not incremental:
+        # Check collection and get user confirmation
+        if not check_collection_and_confirm():
+            return
+        manifest = IngestManifest(collection_name, docs_dir, params=chunk_params)
         
     start = time.time()
-    text_lines: List[str] = []
-    for file_path in tqdm(glob("./document-loaders/milvus_docs/en/**/*.md", recursive=True), desc="Reading files"):
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as file:
-            file_text = file.read()
+    changes = manifest.diff()
+    print(f"Docs: {changes}")
+    if incremental and not changes.to_process and not changes.removed:
+        print(f"Collection '{collection_name}' is up to date.")
+        return
+
+    # Chunks that a changed file still contains are already stored under the same id
+    stored_ids = manifest.chunk_ids(changes.changed)
+    # Only bulk import needs every row at once; otherwise each batch is written once embedded
+    bulk_rows: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    file_chunk_ids: Dict[str, List[int]] = {}
+    seen_ids = set()
+    written = 0
+
+    def embed_pending():
+        nonlocal written
+        vectors = EmbeddingProvider.embed_text([row["text"] for row in pending], provider='huggingface')
+        rows = [{**row, "vector": vector} for row, vector in zip(pending, vectors)]
+        pending.clear()
+        if incremental:
+            upsert_data(collection_name, rows)
+        else:
+            if not written and not bulk_rows:
+                create_collection(embedding_dim=len(rows[0]["vector"]))
+            if use_bulk_load:
+                bulk_rows.extend(rows)
+                return
+            insert_data(collection_name, rows)
+        written += len(rows)
 
-        text_lines += file_text.split("# ")
+    # Files are read and chunked in the background while earlier chunks are embedded.
+    # Chunk sizes are measured with the embedding model's own tokenizer
+    file_chunks = iter_file_chunks(docs_dir, changes.to_process, provider="huggingface", config=chunking,
+                                   errors="ignore")
+    for source, chunks in tqdm(file_chunks, total=len(changes.to_process), desc="Embedding files"):
+        file_chunk_ids[source] = []
+        for chunk in chunks:
+            # Stable id from file and content: re-runs only change the ids of edited chunks
+            chunk_id = make_chunk_id(source, text=chunk.text)
+            file_chunk_ids[source].append(chunk_id)
+            if chunk_id in seen_ids or chunk_id in stored_ids:
+                continue
+            seen_ids.add(chunk_id)
+            pending.append({"id": chunk_id, "text": chunk.text, "source": source, "heading": chunk.heading_path})
+        if len(pending) >= embed_batch_size:
+            embed_pending()
+    if pending:
+        embed_pending()
 
-    vectors = EmbeddingProvider.embed_text(text_lines, provider='huggingface')
-    if len(vectors) == 0:
+    if not written and not bulk_rows and not incremental:
         print("No vectors generated. Exiting.")
         return
-    create_collection(embedding_dim=len(vectors[0]))
-    data: List[Dict[str, Any]] = []
-    for i in range(len(vectors)):
-        data.append({"id": i, "vector": vectors[i], "text": text_lines[i]})
-    # print(data)
-    if len(data) == 0:
-        return 
-    client.insert(collection_name=collection_name, data=data)
+    if bulk_rows:
+        bulk_load(collection_name, bulk_rows)
+        written = len(bulk_rows)
+    stale_ids = manifest.apply(file_chunk_ids, changes.removed)
+    if incremental:
+        # Stale ids exclude every chunk the files still produce, so deleting after the upserts is safe
+        if stale_ids:
+            get_writer_client().delete(collection_name=collection_name, ids=list(stale_ids))
+            print(f"Deleted {len(stale_ids)} chunks of changed or removed files")
+        if written:
+            print(f"Upserted {written} new chunks")
+    if written or stale_ids:
+        # Seal the written segments and compact them if they are many and small or full of deletes
+        maintain_collection(collection_name)
+    # Recorded only once the collection holds the files' chunks
+    manifest.save()
     end = time.time()
     print(f"{device} time: {end - start:.2f} seconds")
 
 if __name__ == "__main__":
     device = EmbeddingProvider.get_device()
-    process()
\ No newline at end of file
+    process(use_bulk_load="--bulk" in sys.argv, full="--full" in sys.argv)
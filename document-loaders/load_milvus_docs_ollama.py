@@ -1,21 +1,27 @@
-# We load all markdown files from the folder milvus_docs/en/faq. For each document, we just simply use "# "
-# to separate the content in the file, which can roughly separate the content of each main part of the markdown file.
+# We load all markdown files from the folder milvus_docs/en. Each file is chunked by its markdown structure
+# (headings and code blocks) into chunks of at most CHUNK_MAX_TOKENS tokens, see core/chunking.py.
 import os
-import json
+import sys
 import hashlib
-from glob import glob
+from dataclasses import asdict
 from tqdm import tqdm
-from pathlib import Path
 
 from dotenv import load_dotenv
 load_dotenv()
 
-from core import get_client, has_collection, EmbeddingProvider
+from core import (get_writer_client, has_collection, insert_data, upsert_data, bulk_load, make_chunk_id, maintain_collection,
+                  IngestManifest, EmbeddingProvider, get_chunking_config, iter_file_chunks)
+from core import create_collection as create_schema_collection
+from core.embedding_store import (EmbeddingStore, write_embeddings, has_embeddings, convert_embeddings_json,
+                                  LEGACY_EMBEDDINGS_JSON)
+from core.sparse import SPARSE_FIELD, fit_bm25, load_bm25, add_sparse_vectors
 
 
 collection_name = os.getenv("OLLAMA_COLLECTION_NAME") or "milvus_ollama_collection"
-
-client = get_client()
+docs_dir = "./document-loaders/milvus_docs/en"
+chunking = get_chunking_config()
+# Changing the chunking settings invalidates the manifest, so the next run rebuilds
+chunk_params = {"chunker": "markdown", **asdict(chunking)}
 
 def check_collection_and_confirm():
     """Check if collection exists and get user confirmation"""
@@ -34,7 +40,13 @@ def check_collection_and_confirm():
             return False
     return True
 
-def create_collection(embedding_dim=1024):
+def create_collection(embedding_dim=1024, hybrid=False):
+    if hybrid:
+        # Schema with a BM25 sparse field next to the dense vector (drops any existing collection)
+        create_schema_collection(collection_name, dimension=embedding_dim, sparse_field=SPARSE_FIELD)
+        return
+
+    client = get_writer_client()
     if client.has_collection(collection_name):
         client.drop_collection(collection_name)
         print(f"Collection '{collection_name}' dropped successfully.")
@@ -48,45 +60,111 @@ def create_collection(embedding_dim=1024):
     print(f"Collection '{collection_name}' created successfully.")
 
 
-def process(insertCollection=True):
-    # Check collection and get user confirmation
-    if not check_collection_and_confirm():
-        return
-    
-    text_lines = []
+def _is_hybrid_collection():
+    """Whether the existing collection has a BM25 sparse vector field."""
+    fields = get_writer_client().describe_collection(collection_name=collection_name)["fields"]
+    return any(field["name"] == SPARSE_FIELD for field in fields)
+
+def save_embeddings(data, stale_ids=(), incremental=False):
+    """Write the ./data/embeddings store; incremental runs merge into the existing one."""
+    if incremental and not has_embeddings() and os.path.exists(LEGACY_EMBEDDINGS_JSON):
+        convert_embeddings_json()
+    if incremental and has_embeddings():
+        replaced = set(stale_ids) | {row["id"] for row in data}
+        store = EmbeddingStore()
+        kept = [i for i, chunk_id in enumerate(store.ids.tolist()) if chunk_id not in replaced]
+        data = list(store.rows(kept)) + data
+    write_embeddings(data)
 
-    for file_path in tqdm(glob("./document-loaders/milvus_docs/en/**/*.md", recursive=True), desc="Reading files"):
-        with open(file_path, "r", encoding="utf-8") as file:
-            file_text = file.read()
-        text_lines += file_text.split("# ")
+def process(insertCollection=True, use_bulk_load=False, hybrid=False, full=False):
+    # With a manifest from an earlier run, only added or changed files are embedded
+    manifest = IngestManifest.load(collection_name, docs_dir, params=chunk_params)
+    incremental = insertCollection and not full and bool(manifest.files) and has_collection(collection_name)
+    if not incremental:
+        # Check collection and get user confirmation
+        if not check_collection_and_confirm():
+            return
+        manifest = IngestManifest(collection_name, docs_dir, params=chunk_params)
+    elif hybrid != _is_hybrid_collection():
+        # Incremental rows must match the collection as loaded, whatever --hybrid says now
+        hybrid = not hybrid
+        print(f"Collection '{collection_name}' was loaded {'with' if hybrid else 'without'} --hybrid; "
+              f"using that for this incremental run (pass --full to reload)")
 
+    changes = manifest.diff()
+    print(f"Docs: {changes}")
+    if incremental and not changes.to_process and not changes.removed:
+        print(f"Collection '{collection_name}' is up to date.")
+        return
+
+    # Chunks that a changed file still contains are already stored under the same id
+    stored_ids = manifest.chunk_ids(changes.changed)
     data = []
-    for i, line in enumerate(tqdm(text_lines, desc="Creating embeddings")):
-        if not line.strip() or len(line.strip()) < 10:
-            continue
-            
-        try:
-            vector = EmbeddingProvider.embed_text(line, provider='ollama')
-            if vector:
-                checksum = hashlib.md5(line.encode('utf-8')).hexdigest()
-                data.append({"id": len(data), "vector": vector, "text": line, "checksum": checksum})
-        except Exception as e:
-            print(f"Failed to embed text chunk {i}: {e}")
-            continue
+    file_chunk_ids = {}
+    seen_ids = set()
+    failed_sources = set()
+    # Files are read and chunked in the background while earlier chunks are embedded.
+    # Ollama does not expose its tokenizer, so chunk sizes are estimated
+    file_chunks = iter_file_chunks(docs_dir, changes.to_process, provider="ollama", config=chunking)
+    for source, chunks in tqdm(file_chunks, total=len(changes.to_process), desc="Embedding files"):
+        file_chunk_ids[source] = []
+        for chunk in chunks:
+            line = chunk.text
+
+            # Stable id from file and content: re-runs only change the ids of edited chunks
+            chunk_id = make_chunk_id(source, text=line)
+            file_chunk_ids[source].append(chunk_id)
+            if chunk_id in seen_ids or chunk_id in stored_ids:
+                continue
+            seen_ids.add(chunk_id)
+
+            try:
+                vector = EmbeddingProvider.embed_text(line, provider='ollama')
+                if vector:
+                    checksum = hashlib.md5(line.encode('utf-8')).hexdigest()
+                    data.append({"id": chunk_id, "vector": vector, "text": line, "checksum": checksum,
+                                 "source": source, "heading": chunk.heading_path})
+            except Exception as e:
+                print(f"Failed to embed a chunk of {source}: {e}")
+                failed_sources.add(source)
+                continue
     
-    if len(data) == 0:
+    # Files with failed chunks stay unrecorded, so the next run retries them
+    stale_ids = manifest.apply({source: ids for source, ids in file_chunk_ids.items() if source not in failed_sources},
+                               changes.removed)
+    if not data and not stale_ids:
+        manifest.save()
         return
     
-    # Save to JSON file
-    Path("./data").mkdir(exist_ok=True)
-    with open("./data/embeddings.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    print(f"Saved {len(data)} embeddings to ./data/embeddings.json")
+    # Save to the binary embeddings store
+    save_embeddings(data, stale_ids, incremental)
         
-    if insertCollection:
+    if not insertCollection:
+        return
+    if incremental:
+        if stale_ids:
+            get_writer_client().delete(collection_name=collection_name, ids=list(stale_ids))
+            print(f"Deleted {len(stale_ids)} chunks of changed or removed files")
+        if data:
+            if hybrid:
+                # Encode with the BM25 statistics fitted by the last full load
+                add_sparse_vectors(data, load_bm25())
+            upsert_data(collection_name, data)
+            print(f"Upserted {len(data)} new chunks")
+    else:
         dimension = len(data[0]['vector'])
-        create_collection(dimension)
-        client.insert(collection_name=collection_name, data=data)
+        create_collection(dimension, hybrid=hybrid)
+        if hybrid:
+            # BM25 statistics are saved to ./data/bm25_params.json for query encoding
+            add_sparse_vectors(data, fit_bm25([row["text"] for row in data]))
+        if use_bulk_load:
+            bulk_load(collection_name, data)
+        else:
+            insert_data(collection_name, data)
+    # Seal the written segments and compact them if they are many and small or full of deletes
+    maintain_collection(collection_name)
+    # Recorded only once the collection holds the files' chunks
+    manifest.save()
 
 if __name__ == "__main__":
-    process()
\ No newline at end of file
+    process(use_bulk_load="--bulk" in sys.argv, hybrid="--hybrid" in sys.argv, full="--full" in sys.argv)
@@ -14,7 +14,7 @@ import numpy as np
 from dotenv import load_dotenv
 load_dotenv()
 
-from core import get_client, EmbeddingProvider, has_collection, create_collection
+from core import get_client, EmbeddingProvider, has_collection, create_collection, insert_data, export_columns, print_progress
 
 # Initialize Milvus client and global variables
 client = get_client()
@@ -36,8 +36,10 @@ async def load():
         print(f"Collection {collection_name} already exists. Loading existing data.")
         global data
         try:
-            all_data = client.query(collection_name, "", output_fields=["id", "vector", "text"], limit=10000)
-            data = list(all_data)
+            # Stream the whole collection; a single query would truncate at its row limit
+            columns = export_columns(collection_name, ["id", "vector", "text"], progress=print_progress)
+            data = [{"id": i, "vector": v, "text": t}
+                    for i, v, t in zip(columns.get("id", []), columns.get("vector", []), columns.get("text", []))]
         except Exception as e:
             print(f"Could not load existing data: {e}")
             data = []
@@ -115,10 +117,7 @@ async def load():
     )
         
     # Insert all embeddings into Milvus collection
-    client.insert(
-        collection_name=collection_name,
-        data=data
-    )
+    insert_data(collection_name, data)
 
     print(f"Loaded {len(data)} document chunks into Milvus")
 
@@ -1,71 +1,75 @@
-import json
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
-from core import get_client
+from core import get_writer_client, ensure_collection, upsert_data, export_field_map, print_progress, maintain_collection
+from core.embedding_store import EmbeddingStore, has_embeddings, convert_embeddings_json, LEGACY_EMBEDDINGS_JSON
+from core.sparse import SPARSE_FIELD, load_bm25, add_sparse_vectors
 
 collection_name = os.getenv("OLLAMA_COLLECTION_NAME") or "milvus_ollama_collection"
-client = get_client()
+client = get_writer_client()
 
 def sync_embeddings():
-    """Sync embeddings from JSON file - adds, updates, and removes vectors"""
-    with open("./data/embeddings.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    if not data:
+    """Sync embeddings from the ./data/embeddings store - adds, updates, and removes vectors"""
+    if not has_embeddings() and os.path.exists(LEGACY_EMBEDDINGS_JSON):
+        print(f"Converting {LEGACY_EMBEDDINGS_JSON} to the binary embeddings store (one time)")
+        convert_embeddings_json()
+    store = EmbeddingStore()
+
+    if not len(store):
         print("No data to sync")
         return
     
-    if not client.has_collection(collection_name):
-        dimension = len(data[0]['vector'])
-        client.create_collection(
-            collection_name=collection_name,
-            dimension=dimension,
-            metric_type="COSINE",
-            consistency_level="Session",
-        )
-        print(f"Created collection: {collection_name}")
+    # Keeps existing vectors unless the embedding dimension changed
+    result = ensure_collection(collection_name, dimension=store.dim)
+    hybrid = False
+    if result["action"] in ("created", "rebuilt"):
         existing_checksums = {}
     else:
-        # Get existing data
-        existing = client.query(
-            collection_name=collection_name,
-            filter="",
-            output_fields=["id", "checksum"],
-            limit=16384
-        )
-        existing_checksums = {item["id"]: item["checksum"] for item in existing}
+        # Collections loaded with --hybrid need a BM25 sparse vector in every row
+        fields = client.describe_collection(collection_name=collection_name)["fields"]
+        hybrid = any(field["name"] == SPARSE_FIELD for field in fields)
+        # Stream all existing checksums through the writer client so earlier syncs are visible
+        existing_checksums = export_field_map(collection_name, "checksum", client=client, progress=print_progress)
     
     # Prepare data for upsert
-    json_ids = {item["id"] for item in data}
+    store_ids = store.ids.tolist()
+    store_checksums = store.checksums()
     existing_ids = set(existing_checksums.keys())
     
     to_upsert = []
     new_count = 0
     updated_count = 0
     
-    for item in data:
-        item_id = item["id"]
+    for index, item_id in enumerate(store_ids):
         if item_id not in existing_checksums:
             new_count += 1
-            to_upsert.append(item)
-        elif existing_checksums[item_id] != item["checksum"]:
+            to_upsert.append(index)
+        elif existing_checksums[item_id] != store_checksums[item_id]:
             updated_count += 1
-            to_upsert.append(item)
+            to_upsert.append(index)
     
-    # Delete vectors not in JSON
-    to_delete = existing_ids - json_ids
+    # Delete vectors not in the store
+    to_delete = existing_ids - set(store_ids)
     if to_delete:
         client.delete(collection_name=collection_name, filter=f"id in {list(to_delete)}")
         print(f"Deleted {len(to_delete)} vectors")
     
     # Upsert new/changed vectors
     if to_upsert:
-        client.upsert(collection_name=collection_name, data=to_upsert)
+        # Vectors are views into the memory-mapped store, read only as batches are sent
+        rows = list(store.rows(to_upsert))
+        if hybrid:
+            # The store keeps dense vectors only; encode with the BM25 statistics of the last full load
+            add_sparse_vectors(rows, load_bm25())
+        upsert_data(collection_name, rows)
         print(f"Upserted {new_count} new, {updated_count} updated documents")
     else:
         print("No documents need updating")
 
+    if to_upsert or to_delete:
+        # Upserts and deletes leave tombstones; compact once they are a large share of the collection
+        maintain_collection(collection_name)
+
 if __name__ == "__main__":
     sync_embeddings()
\ No newline at end of file
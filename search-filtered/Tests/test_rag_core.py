@@ -24,9 +24,10 @@ def test_needs_retrieval():
     rag_core.classification_chain.invoke.return_value = "NO"
     assert rag_core.needs_retrieval("Hello", []) == False
 
-@patch('rag_core.get_client')
+@patch('rag_core.get_collection_manager')
+@patch('rag_core.get_reader_client')
 @patch('rag_core.EmbeddingProvider.embed_text')
-def test_rag_with_retrieval(mock_embed, mock_get_client):
+def test_rag_with_retrieval(mock_embed, mock_get_client, mock_get_manager):
     """Test RAG with document retrieval"""
     mock_llm = Mock()
     rag_core = RAGCore(mock_llm, "test_collection")
@@ -48,6 +49,8 @@ def test_rag_with_retrieval(mock_embed, mock_get_client):
     
     assert doc_count == 2
     assert "To create a collection in Milvus..." in response
+    assert mock_client.search.call_args.kwargs["consistency_level"] == "Bounded"
+    mock_get_manager.return_value.ensure_loaded.assert_called_once_with("test_collection")
 
 def test_direct_response():
     """Test direct response without retrieval"""
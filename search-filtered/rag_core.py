@@ -2,12 +2,20 @@ from typing import List, Dict, Tuple, Optional
 import time
 from langchain.prompts import PromptTemplate
 from langchain.schema.output_parser import StrOutputParser
-from core import EmbeddingProvider, get_client
+from core import (EmbeddingProvider, get_reader_client, search_hybrid, load_tuned_search_params,
+                  consistency_options, get_read_consistency, get_collection_manager)
+from core.sparse import load_bm25
 
 class RAGCore:
-    def __init__(self, llm, collection_name: str):
+    def __init__(self, llm, collection_name: str, hybrid: bool = False, consistency=None):
         self.llm = llm
         self.collection_name = collection_name
+        # Bounded reads never queue behind background ingestion; RAG_CONSISTENCY / RAG_STALENESS_SECONDS override
+        self.consistency = consistency or get_read_consistency("RAG_")
+        # Hybrid search needs a collection loaded with --hybrid; exact-term matches allow a smaller top-k
+        self.hybrid = hybrid
+        self.top_k = 2 if hybrid else 3
+        self.bm25 = None
         self.response_cache = {}
         self.classification_cache = {}
         self._setup_chains()
@@ -125,7 +133,7 @@ Answer:"""
     def _retrieve_documents(self, question: str) -> Tuple[str, int]:
         """Retrieve relevant documents from Milvus"""
         start_time = time.time()
-        client = get_client()
+        client = get_reader_client()
         
         # Time embedding generation
         embed_start = time.time()
@@ -134,13 +142,27 @@ Answer:"""
         
         # Time search
         search_start = time.time()
-        search_results = client.search(
-            collection_name=self.collection_name,
-            data=[embedding],
-            limit=3,  # Reduced from 5 for faster search
-            search_params={"metric_type": "COSINE", "params": {"ef": 32}},  # Reduced ef from 64
-            output_fields=["text"]
-        )
+        # Recall-tuned setting from core/utils/tune_search.py, else the untuned ef 32 (reduced from 64)
+        search_params = (load_tuned_search_params(self.collection_name)
+                         or {"metric_type": "COSINE", "params": {"ef": 32}})
+        if self.hybrid:
+            if self.bm25 is None:
+                self.bm25 = load_bm25()
+            hits = search_hybrid(self.collection_name, [embedding], [question], limit=self.top_k,
+                                 output_fields=["text"], bm25=self.bm25, dense_params=search_params,
+                                 consistency=self.consistency)[0]
+            search_results = [hits.to_dicts()]
+        else:
+            # Loads the collection if it was released and keeps it most recently used under the load budget
+            get_collection_manager().ensure_loaded(self.collection_name)
+            search_results = client.search(
+                collection_name=self.collection_name,
+                data=[embedding],
+                limit=self.top_k,  # Reduced from 5 for faster search
+                search_params=search_params,
+                output_fields=["text"],
+                **consistency_options(self.consistency)
+            )
         print(f"DEBUG - Search took {time.time() - search_start:.2f}s")
         
         if not search_results or not search_results[0]:
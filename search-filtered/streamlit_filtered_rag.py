@@ -5,7 +5,7 @@ import streamlit as st
 from dotenv import load_dotenv
 load_dotenv()
 
-from core import get_client
+from core import get_collection_manager
 from rag_core import RAGCore
 
 # Set page config FIRST to prevent flash
@@ -71,9 +71,11 @@ def get_rag_system():
         num_thread=8     # Use more CPU threads
     )
     
-    client = get_client()
-    client.load_collection(collection_name)
-    return RAGCore(llm, collection_name)
+    # Loads on first use; releases least recently used collections over MILVUS_LOAD_BUDGET_MB
+    get_collection_manager().ensure_loaded(collection_name)
+    # Dense + BM25 hybrid retrieval for collections loaded with --hybrid
+    hybrid = os.getenv("RAG_HYBRID_SEARCH", "").lower() in ("1", "true", "yes")
+    return RAGCore(llm, collection_name, hybrid=hybrid)
 
 def initialize_session_state():
     """Initialize session state"""
@@ -1,7 +1,7 @@
 from pymilvus import MilvusClient, DataType
 from dotenv import load_dotenv
 
-from core import get_client
+from core import get_client, create_index_and_wait
 
 load_dotenv()
 
@@ -46,11 +46,8 @@ index_params.add_index(
 )
 
 try:
-    client.create_index(
-        collection_name=COLLECTION_NAME,
-        index_params=index_params,
-        sync=False
-    )
+    # Waits for the build to finish, then loads the collection
+    create_index_and_wait(COLLECTION_NAME, index_params)
     print(f"Index created for collection: {COLLECTION_NAME}")
 except Exception as e:
     print(f"Error creating index: {e}")
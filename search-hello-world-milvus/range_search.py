@@ -1,10 +1,10 @@
 import os
 from typing import List
-from pymilvus import model, MilvusClient
+from pymilvus import model
 from termcolor import cprint
 from dotenv import load_dotenv
 
-from core import get_client
+from core import search_batch
 
 load_dotenv()
 
@@ -18,16 +18,15 @@ OUTPUT_FIELDS: List[str] = ["text", "subject"]
 embedding_fn = model.DefaultEmbeddingFunction()
 query_vectors = embedding_fn.encode_queries([QUERY])
 collection_name: str = os.getenv("MY_COLLECTION_NAME") or "hello_world_collection"
-client: MilvusClient = get_client()
 
 def search() -> None:
     """Perform range search on Milvus collection."""
     cprint('\nSearching...\n', 'green', attrs=['blink'])
     
     try:
-        res = client.search(
-            collection_name=collection_name,
-            data=query_vectors,
+        res = search_batch(
+            collection_name,
+            query_vectors,
             limit=SEARCH_LIMIT,
             anns_field="vector",
             search_params={
@@ -37,8 +36,9 @@ def search() -> None:
             output_fields=OUTPUT_FIELDS,
         )
         
-        response: str = ' '.join(r["entity"]["text"] for r in res[0])
-        print(f"Found ({len(res[0])}) results: {response}")
+        hits = res[0]
+        response: str = ' '.join(hits.fields["text"])
+        print(f"Found ({len(hits)}) results: {response}")
         
     except Exception as e:
         print(f"Search error: {e}")